@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the asynchronous Zabbix backend
+
+Runs host_get against a local stand-in Zabbix endpoint at increasing levels
+of concurrency and reports requests per second together with the number of
+TCP connections the stand-in accepted. The first row is the old behaviour:
+the blocking ZabbixAPI client, one call after another, with a new
+connection per call. The response cache and request coalescing are
+bypassed, so every call reaches the stand-in.
+
+Usage:
+    python scripts/benchmark_async.py [--requests N] [--latency MS]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from zabbix_standin import StandinZabbix
+
+
+def run_blocking(url: str, requests: int) -> float:
+    """Run host.get serially with the blocking client.
+
+    Args:
+        url: Stand-in endpoint URL
+        requests: Number of calls to make
+
+    Returns:
+        float: Elapsed seconds
+    """
+    from zabbix_utils import ZabbixAPI
+
+    client = ZabbixAPI(url=url)
+    client.login(token=os.environ["ZABBIX_TOKEN"])
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.host.get(output="extend")
+    return time.perf_counter() - started
+
+
+async def run_async(concurrency: int, requests: int) -> float:
+    """Run host_get with the given number of concurrent callers.
+
+    The in-flight cap is set to the same value so the client does not
+    become the bottleneck.
+
+    Args:
+        concurrency: Number of concurrent callers
+        requests: Total number of calls to make
+
+    Returns:
+        float: Elapsed seconds
+    """
+    import zabbix_mcp_server as server
+
+    server.MAX_CONCURRENCY = concurrency
+    await server.host_get(cache=False)  # login and warm up outside the timed section
+
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            # Every call must reach Zabbix: no cached results
+            await server.host_get(cache=False)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await server.close_zabbix_client()
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400, help="calls per run")
+    parser.add_argument("--latency", type=float, default=20.0,
+                        help="simulated Zabbix latency in milliseconds")
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 2, 4, 8, 16, 32, 64], help="concurrency levels")
+    args = parser.parse_args()
+
+    standin = StandinZabbix(latency=args.latency / 1000)
+    url = standin.start()
+    os.environ["ZABBIX_URL"] = url
+    os.environ["ZABBIX_TOKEN"] = "benchmark"
+    os.environ.pop("ZABBIX_USER", None)
+    os.environ.pop("ZABBIX_PASSWORD", None)
+    # Keep the background entity index from adding its own calls to the measurement
+    os.environ["ZABBIX_INDEX_REFRESH"] = "0"
+    # Identical concurrent calls would share one upstream request; measure each
+    # call reaching Zabbix (benchmark_coalescing.py measures the sharing)
+    os.environ["ZABBIX_COALESCE"] = "false"
+
+    import zabbix_mcp_server  # noqa: F401 - configures logging on import
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Stand-in Zabbix at {url}, latency {args.latency:.0f} ms, "
+          f"{args.requests} requests per run")
+    print()
+    print(f"{'mode':<22}{'seconds':>10}{'req/s':>12}{'speedup':>10}{'conns':>8}")
+
+    standin.connections = 0
+    baseline = args.requests / run_blocking(url, args.requests)
+    print(f"{'blocking, serial':<22}{args.requests / baseline:>10.2f}"
+          f"{baseline:>12.1f}{1.0:>9.1f}x{standin.connections:>8}")
+
+    for concurrency in args.concurrency:
+        standin.connections = 0
+        elapsed = asyncio.run(run_async(concurrency, args.requests))
+        rate = args.requests / elapsed
+        print(f"{f'async, {concurrency} in flight':<22}{elapsed:>10.2f}"
+              f"{rate:>12.1f}{rate / baseline:>9.1f}x{standin.connections:>8}")
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for coalescing identical concurrent Zabbix API reads
+
+Sends bursts of concurrent host_get calls, as many MCP sessions asking the
+same question at once would, to a local stand-in Zabbix endpoint and reports
+the time taken and the number of requests that reached the stand-in, with
+request coalescing off and on. Each burst is spread over a number of distinct
+queries; the response cache is bypassed so only coalescing can share work.
+
+Usage:
+    python scripts/benchmark_coalescing.py [--callers N] [--bursts N] [--latency MS]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Tuple
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from zabbix_standin import StandinZabbix
+
+
+async def run_bursts(coalesce: bool, callers: int, distinct: int, bursts: int) -> Tuple[float, int]:
+    """Run bursts of concurrent host_get calls.
+
+    Args:
+        coalesce: Whether identical in-flight calls share one request
+        callers: Concurrent calls per burst
+        distinct: Number of different queries the calls of a burst are spread over
+        bursts: Number of bursts
+
+    Returns:
+        Tuple[float, int]: Elapsed seconds and host.get requests sent to Zabbix
+    """
+    import zabbix_mcp_server as server
+    from coalescing import RequestCoalescer
+
+    server.request_coalescer = RequestCoalescer(enabled=coalesce)
+    await server.host_get(cache=False)  # login and warm up outside the timed section
+
+    warmup = server.request_coalescer.upstream["host.get"]
+    started = time.perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*(
+            server.host_get(hostids=[str(10000 + caller % distinct)], cache=False)
+            for caller in range(callers)))
+    elapsed = time.perf_counter() - started
+    upstream = server.request_coalescer.upstream["host.get"] - warmup
+
+    await server.close_zabbix_client()
+    return elapsed, upstream
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=50, help="concurrent calls per burst")
+    parser.add_argument("--bursts", type=int, default=10, help="bursts per run")
+    parser.add_argument("--latency", type=float, default=20.0,
+                        help="simulated Zabbix latency in milliseconds")
+    parser.add_argument("--distinct", type=int, nargs="+", default=[1, 5, 50],
+                        help="distinct queries per burst")
+    args = parser.parse_args()
+
+    standin = StandinZabbix(latency=args.latency / 1000)
+    url = standin.start()
+    os.environ["ZABBIX_URL"] = url
+    os.environ["ZABBIX_TOKEN"] = "benchmark"
+    os.environ.pop("ZABBIX_USER", None)
+    os.environ.pop("ZABBIX_PASSWORD", None)
+    # Keep the background entity index from adding its own calls to the measurement
+    os.environ["ZABBIX_INDEX_REFRESH"] = "0"
+
+    import zabbix_mcp_server  # noqa: F401 - configures logging on import
+    logging.getLogger().setLevel(logging.WARNING)
+
+    calls = args.callers * args.bursts
+    print(f"Stand-in Zabbix at {url}, latency {args.latency:.0f} ms, "
+          f"{args.bursts} bursts of {args.callers} concurrent calls")
+    print()
+    print(f"{'distinct':>8}  {'coalescing':<12}{'seconds':>10}{'upstream':>10}{'calls/req':>11}")
+
+    for distinct in args.distinct:
+        for coalesce in (False, True):
+            elapsed, upstream = asyncio.run(run_bursts(coalesce, args.callers, distinct, args.bursts))
+            print(f"{distinct:>8}  {'on' if coalesce else 'off':<12}{elapsed:>10.2f}"
+                  f"{upstream:>10}{calls / max(upstream, 1):>11.1f}")
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Payload benchmark for the columnar history and trend encoding
+
+Encodes synthetic history.get and trend.get results as rows (the default)
+and as per-item columns, and reports payload size, encode time on the server
+and decode time on the client for each.
+
+Usage:
+    python scripts/benchmark_columnar.py [--items N] [--values N]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Callable
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from columnar import to_columns
+from serialization import dumps
+
+START = 1700000000
+
+
+def history_rows(items: int, values: int) -> list:
+    """Build numeric history rows, newest first.
+
+    Args:
+        items: Number of items
+        values: Values per item
+
+    Returns:
+        list: history.get rows
+    """
+    rows = [{"itemid": str(100000 + item), "clock": str(START + index * 60),
+             "value": f"{50 + 30 * math.sin(index / 60 + item):.4f}",
+             "ns": str(index * 7919 % 1000000000)}
+            for index in range(values) for item in range(items)]
+    rows.reverse()
+    return rows
+
+
+def trend_rows(items: int, values: int) -> list:
+    """Build hourly trend rows.
+
+    Args:
+        items: Number of items
+        values: Hours per item
+
+    Returns:
+        list: trend.get rows
+    """
+    return [{"itemid": str(100000 + item), "clock": str(START + hour * 3600), "num": "60",
+             "value_min": f"{40 + 30 * math.sin(hour / 4 + item):.4f}",
+             "value_avg": f"{50 + 30 * math.sin(hour / 4 + item):.4f}",
+             "value_max": f"{60 + 30 * math.sin(hour / 4 + item):.4f}"}
+            for item in range(items) for hour in range(values)]
+
+
+def best_ms(function: Callable[[], Any], repeat: int) -> float:
+    """Return the best run time of function() in milliseconds.
+
+    Args:
+        function: Function to time
+        repeat: Number of timed runs
+
+    Returns:
+        float: Best time in milliseconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10, help="items per result")
+    parser.add_argument("--values", type=int, default=10000, help="values per item")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement")
+    args = parser.parse_args()
+
+    print(f"{args.items} items, {args.values} values per item")
+    print()
+    print(f"{'result':<14}{'layout':<10}{'bytes':>12}{'size':>8}{'encode ms':>11}{'decode ms':>11}")
+    for label, rows in (("history.get", history_rows(args.items, args.values)),
+                        ("trend.get", trend_rows(args.items, args.values))):
+        baseline = None
+        for layout, encode in (("rows", lambda: dumps(rows, pretty=False)),
+                               ("columnar", lambda: dumps(to_columns(rows), pretty=False))):
+            payload = encode()
+            size = len(payload.encode("utf-8"))
+            baseline = baseline or size
+            encode_ms = best_ms(encode, args.repeat)
+            decode_ms = best_ms(lambda: json.loads(payload), args.repeat)
+            print(f"{label:<14}{layout:<10}{size:>12}{size / baseline:>7.0%}"
+                  f"{encode_ms:>11.1f}{decode_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Downsampling benchmark for history_get and trend_get
+
+Serves a week of one-minute history and a year of hourly trends per item from
+a local stand-in Zabbix endpoint and compares the full payload with
+max_points downsampling (LTTB and min/avg/max buckets), reporting response
+time and size.
+
+Usage:
+    python scripts/benchmark_downsampling.py [--items N] [--max-points N]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import sys
+import math
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Dict
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from zabbix_standin import StandinZabbix
+
+START = 1700000000
+
+
+def history_rows(items: int, days: int) -> list:
+    """Build one-minute numeric history for each item.
+
+    Args:
+        items: Number of items
+        days: Length of the series in days
+
+    Returns:
+        list: history.get rows, newest first
+    """
+    rows = []
+    for minute in range(days * 1440):
+        for item in range(items):
+            value = 50 + 30 * math.sin(minute / 240 + item) + (minute * 7919 % 13)
+            rows.append({"itemid": str(100000 + item), "clock": str(START + minute * 60),
+                         "value": f"{value:.4f}", "ns": "0"})
+    rows.reverse()
+    return rows
+
+
+def trend_rows(items: int, days: int) -> list:
+    """Build hourly trends for each item.
+
+    Args:
+        items: Number of items
+        days: Length of the series in days
+
+    Returns:
+        list: trend.get rows
+    """
+    rows = []
+    for item in range(items):
+        for hour in range(days * 24):
+            value = 50 + 30 * math.sin(hour / 4 + item)
+            rows.append({"itemid": str(100000 + item), "clock": str(START + hour * 3600),
+                         "num": "60", "value_min": f"{value - 10:.4f}",
+                         "value_avg": f"{value:.4f}", "value_max": f"{value + 10:.4f}"})
+    return rows
+
+
+async def measure(tool: Any, kwargs: Dict[str, Any], runs: int) -> tuple:
+    """Call a tool repeatedly and return its mean latency and response size.
+
+    Args:
+        tool: Tool function to call
+        kwargs: Tool arguments
+        runs: Number of calls
+
+    Returns:
+        tuple: Mean latency in milliseconds and response size in bytes
+    """
+    total = 0.0
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await tool(cache=False, **kwargs)
+        total += time.perf_counter() - started
+    return total / runs * 1000, len(response.encode("utf-8"))
+
+
+async def run(items: int, max_points: int, runs: int) -> list:
+    """Measure full and downsampled history_get and trend_get calls.
+
+    Args:
+        items: Number of items per call
+        max_points: Points per item when downsampling
+        runs: Calls per measurement
+
+    Returns:
+        list: Rows of tool, mode, latency and size
+    """
+    import zabbix_mcp_server as server
+
+    itemids = [str(100000 + item) for item in range(items)]
+    await server.apiinfo_version()  # login outside the timed section
+    rows = []
+    for tool in (server.history_get, server.trend_get):
+        for mode, kwargs in (("full", {}),
+                             ("lttb", {"max_points": max_points}),
+                             ("minmax", {"max_points": max_points, "downsample": "minmax"})):
+            rows.append((tool.__name__, mode,
+                         *await measure(tool, dict(kwargs, itemids=itemids), runs)))
+    await server.close_zabbix_client()
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=4, help="items per call")
+    parser.add_argument("--max-points", type=int, default=500, help="points per item")
+    parser.add_argument("--runs", type=int, default=5, help="calls per measurement")
+    parser.add_argument("--latency", type=float, default=20.0,
+                        help="simulated Zabbix latency in milliseconds")
+    args = parser.parse_args()
+
+    history = history_rows(args.items, 7)
+    trends = trend_rows(args.items, 365)
+    standin = StandinZabbix(latency=args.latency / 1000, methods={
+        "history.get": lambda params: history,
+        "trend.get": lambda params: trends,
+    })
+    url = standin.start()
+    os.environ["ZABBIX_URL"] = url
+    os.environ["ZABBIX_TOKEN"] = "benchmark"
+    os.environ.pop("ZABBIX_USER", None)
+    os.environ.pop("ZABBIX_PASSWORD", None)
+    # Keep the background entity index from adding its own calls to the measurement
+    os.environ["ZABBIX_INDEX_REFRESH"] = "0"
+
+    import zabbix_mcp_server  # noqa: F401 - configures logging on import
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Stand-in Zabbix at {url}, latency {args.latency:.0f} ms, {args.items} items, "
+          f"{len(history)} history rows, {len(trends)} trend rows, "
+          f"max_points {args.max_points}")
+    print()
+    print(f"{'tool':<13}{'mode':<8}{'ms':>10}{'bytes':>12}{'size':>8}")
+
+    rows = asyncio.run(run(args.items, args.max_points, args.runs))
+    for index, (tool, mode, ms, size) in enumerate(rows):
+        full_size = rows[index - index % 3][3]
+        print(f"{tool:<13}{mode:<8}{ms:>10.1f}{size:>12}{size / full_size:>7.1%}")
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
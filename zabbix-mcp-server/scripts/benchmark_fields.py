@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Payload benchmark for default field projections
+
+Runs host_get and item_get against a local stand-in Zabbix endpoint serving a
+synthetic inventory, once with the curated default fields and once with
+fields=["full"] (the old output=extend behaviour), and reports response size
+and latency for each.
+
+Usage:
+    python scripts/benchmark_fields.py [--hosts N] [--items-per-host N]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, List
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from zabbix_standin import StandinZabbix, default_hosts, select_output
+
+
+def default_items(hosts: int, per_host: int) -> list:
+    """Build a synthetic item inventory.
+
+    Args:
+        hosts: Number of hosts
+        per_host: Items per host
+
+    Returns:
+        list: Item objects shaped like item.get output=extend
+    """
+    items = []
+    for i in range(hosts * per_host):
+        items.append({
+            "itemid": str(100000 + i), "type": "0", "snmp_oid": "",
+            "hostid": str(10000 + i // per_host),
+            "name": f"CPU utilization on core {i % per_host}",
+            "key_": f"system.cpu.util[{i % per_host},user]", "delay": "1m",
+            "history": "31d", "trends": "365d", "status": "0", "value_type": "0",
+            "trapper_hosts": "", "units": "%", "logtimefmt": "", "templateid": "0",
+            "valuemapid": "0", "params": "", "ipmi_sensor": "", "authtype": "0",
+            "username": "", "password": "", "publickey": "", "privatekey": "",
+            "flags": "0", "interfaceid": "1", "description": "", "inventory_link": "0",
+            "lifetime": "30d", "evaltype": "0", "jmx_endpoint": "", "master_itemid": "0",
+            "timeout": "", "url": "", "query_fields": [], "posts": "",
+            "status_codes": "200", "follow_redirects": "1", "post_type": "0",
+            "http_proxy": "", "headers": [], "retrieve_mode": "0", "request_method": "0",
+            "output_format": "0", "ssl_cert_file": "", "ssl_key_file": "",
+            "ssl_key_password": "", "verify_peer": "0", "verify_host": "0",
+            "allow_traps": "0", "uuid": "", "state": "0", "error": "",
+            "parameters": [], "lastclock": str(1700000000 + i), "lastns": "0",
+            "lastvalue": f"{(i * 7.31) % 100:.4f}", "prevvalue": f"{(i * 3.17) % 100:.4f}",
+        })
+    return items
+
+
+async def measure(tool: Any, fields: List[str], runs: int) -> tuple:
+    """Call a tool repeatedly and return its mean latency and response size.
+
+    Args:
+        tool: Tool function to call
+        fields: Fields argument, or None for the defaults
+        runs: Number of calls
+
+    Returns:
+        tuple: Mean latency in milliseconds and response size in bytes
+    """
+    total = 0.0
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await tool(cache=False, fields=fields)
+        total += time.perf_counter() - started
+    return total / runs * 1000, len(response.encode("utf-8"))
+
+
+async def run(runs: int) -> list:
+    """Measure host_get and item_get with default and full fields.
+
+    Args:
+        runs: Calls per measurement
+
+    Returns:
+        list: Rows of tool, mode, latency and size
+    """
+    import zabbix_mcp_server as server
+
+    await server.apiinfo_version()  # login outside the timed section
+    rows = []
+    for tool in (server.host_get, server.item_get):
+        for mode, fields in (("full", ["full"]), ("default", None)):
+            rows.append((tool.__name__, mode, *await measure(tool, fields, runs)))
+    await server.close_zabbix_client()
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=5000, help="hosts in the inventory")
+    parser.add_argument("--items-per-host", type=int, default=4, help="items per host")
+    parser.add_argument("--runs", type=int, default=5, help="calls per measurement")
+    parser.add_argument("--latency", type=float, default=20.0,
+                        help="simulated Zabbix latency in milliseconds")
+    args = parser.parse_args()
+
+    hosts = default_hosts(args.hosts)
+    items = default_items(args.hosts, args.items_per_host)
+    standin = StandinZabbix(latency=args.latency / 1000, methods={
+        "host.get": lambda params: select_output(hosts, params),
+        "item.get": lambda params: select_output(items, params),
+    })
+    url = standin.start()
+    os.environ["ZABBIX_URL"] = url
+    os.environ["ZABBIX_TOKEN"] = "benchmark"
+    os.environ.pop("ZABBIX_USER", None)
+    os.environ.pop("ZABBIX_PASSWORD", None)
+    # Keep the background entity index from adding its own calls to the measurement
+    os.environ["ZABBIX_INDEX_REFRESH"] = "0"
+
+    import zabbix_mcp_server  # noqa: F401 - configures logging on import
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Stand-in Zabbix at {url}, latency {args.latency:.0f} ms, "
+          f"{len(hosts)} hosts, {len(items)} items")
+    print()
+    print(f"{'tool':<12}{'fields':<10}{'ms':>10}{'bytes':>12}{'size':>8}{'speedup':>10}")
+
+    rows = asyncio.run(run(args.runs))
+    for index, (tool, mode, ms, size) in enumerate(rows):
+        full_ms, full_size = rows[index - index % 2][2:]
+        print(f"{tool:<12}{mode:<10}{ms:>10.1f}{size:>12}"
+              f"{size / full_size:>7.0%}{full_ms / ms:>9.1f}x")
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for MCP tool responses
+
+Serializes synthetic item.get and history.get results of the given size with
+each available serializer and reports encode time and payload size. The first
+row is the old behaviour: the standard library encoder with indent=2.
+
+Usage:
+    python scripts/benchmark_serialization.py [--rows N] [--repeat N]
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from serialization import SERIALIZERS
+
+
+def item_rows(count: int) -> List[Dict[str, Any]]:
+    """Build an item.get result with output=extend-like rows.
+
+    Args:
+        count: Number of items
+
+    Returns:
+        List[Dict[str, Any]]: Item rows
+    """
+    return [
+        {
+            "itemid": str(100000 + i),
+            "type": "0",
+            "hostid": str(10000 + i // 50),
+            "name": f"CPU utilization on core {i % 64}",
+            "key_": f"system.cpu.util[{i % 64},user]",
+            "delay": "1m",
+            "history": "31d",
+            "trends": "365d",
+            "status": "0",
+            "value_type": "0",
+            "units": "%",
+            "lastclock": str(1700000000 + i),
+            "lastns": "123456789",
+            "lastvalue": f"{(i * 7.31) % 100:.4f}",
+            "prevvalue": f"{(i * 3.17) % 100:.4f}",
+            "state": "0",
+            "error": "",
+            "description": "Share of time the CPU spent in user mode.",
+            "tags": [{"tag": "component", "value": "cpu"}],
+        }
+        for i in range(count)
+    ]
+
+
+def history_rows(count: int) -> List[Dict[str, Any]]:
+    """Build a history.get result for numeric values.
+
+    Args:
+        count: Number of values
+
+    Returns:
+        List[Dict[str, Any]]: History rows
+    """
+    return [
+        {
+            "itemid": str(100000 + i % 20),
+            "clock": str(1700000000 + i * 60),
+            "value": f"{(i * 7.31) % 100:.4f}",
+            "ns": str(i * 1000 % 1000000000),
+        }
+        for i in range(count)
+    ]
+
+
+def measure(serialize: Callable[[Any], str], data: Any, repeat: int) -> tuple:
+    """Time serialize(data) and return the best time and the output size.
+
+    Args:
+        serialize: Serializer to measure
+        data: Data to serialize
+        repeat: Number of timed runs
+
+    Returns:
+        tuple: Best time in milliseconds and size in bytes
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = serialize(data)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(output.encode("utf-8"))
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000, help="rows per result")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per serializer")
+    args = parser.parse_args()
+
+    modes = [("json, indent=2 (old)", lambda data: json.dumps(data, indent=2, default=str))]
+    for name, serializer in SERIALIZERS.items():
+        modes.append((f"{name}, compact", lambda data, s=serializer: s(data, False)))
+        modes.append((f"{name}, pretty", lambda data, s=serializer: s(data, True)))
+
+    for label, data in (("item.get", item_rows(args.rows)),
+                        ("history.get", history_rows(args.rows))):
+        print(f"{label}, {args.rows} rows")
+        print(f"{'serializer':<24}{'ms':>10}{'speedup':>10}{'bytes':>12}{'size':>8}")
+        results = [(name, *measure(serialize, data, args.repeat)) for name, serialize in modes]
+        baseline_ms, baseline_size = results[0][1:]
+        for name, ms, size in results:
+            print(f"{name:<24}{ms:>10.2f}{baseline_ms / ms:>9.1f}x"
+                  f"{size:>12}{size / baseline_size:>7.0%}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
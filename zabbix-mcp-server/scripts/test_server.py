@@ -12,6 +12,7 @@ License: MIT
 import os
 import sys
 import json
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional
@@ -98,11 +99,10 @@ def test_connection() -> bool:
     print("\n🔍 Testing Zabbix connection...")
     
     try:
-        from zabbix_mcp_server import get_zabbix_client
+        from zabbix_mcp_server import check_connection
         
         # Test getting client and API version
-        client = get_zabbix_client()
-        version_info = client.apiinfo.version()
+        version_info = asyncio.run(check_connection())
         
         print(f"✅ Connected to Zabbix API version: {version_info}")
         return True
@@ -128,12 +128,17 @@ def test_basic_operations() -> bool:
     print("\n🔍 Testing basic operations...")
     
     try:
-        from zabbix_mcp_server import get_zabbix_client
-        client = get_zabbix_client()
+        from zabbix_mcp_server import call_api, close_zabbix_client
+        
+        async def fetch(method: str) -> list:
+            try:
+                return await call_api(method, {"limit": 1})
+            finally:
+                await close_zabbix_client()
         
         # Test host groups (usually always present)
         print("  - Testing host group retrieval...")
-        groups = client.hostgroup.get(limit=1)
+        groups = asyncio.run(fetch("hostgroup.get"))
         if groups:
             print(f"    ✅ Retrieved {len(groups)} host group(s)")
         else:
@@ -141,7 +146,7 @@ def test_basic_operations() -> bool:
         
         # Test hosts
         print("  - Testing host retrieval...")
-        hosts = client.host.get(limit=1)
+        hosts = asyncio.run(fetch("host.get"))
         if hosts:
             print(f"    ✅ Retrieved {len(hosts)} host(s)")
         else:
@@ -149,7 +154,7 @@ def test_basic_operations() -> bool:
         
         # Test items
         print("  - Testing item retrieval...")
-        items = client.item.get(limit=1)
+        items = asyncio.run(fetch("item.get"))
         if items:
             print(f"    ✅ Retrieved {len(items)} item(s)")
         else:
@@ -198,6 +203,179 @@ def test_read_only_mode() -> bool:
         return False
 
 
+def test_streaming_without_progress_token() -> bool:
+    """Test that streamed history and events reach clients that send no progress token.
+    
+    Runs against a local stand-in Zabbix endpoint, so it needs no data in
+    the configured Zabbix. Rows are only sent as progress notifications when
+    the client asked for them; otherwise they must be in the tool result.
+    
+    Returns:
+        bool: True if all rows and events are returned in the tool result
+    """
+    print("\n🔍 Testing streaming without a progress token...")
+    
+    try:
+        from fastmcp import Client
+        import zabbix_mcp_server as server
+        from zabbix_standin import StandinZabbix
+        
+        start = 1700000000
+        values = [{"itemid": "1", "clock": str(start + i * 60), "ns": "0", "value": str(i)}
+                  for i in range(180)]
+        events = [{"eventid": str(i + 1), "clock": str(start + i * 600), "ns": "0"}
+                  for i in range(300)]
+        
+        def history_get(params: dict) -> list:
+            return [row for row in values
+                    if params["time_from"] <= int(row["clock"]) <= params["time_till"]]
+        
+        def event_get(params: dict) -> list:
+            return [event for event in events
+                    if params["time_from"] <= int(event["clock"]) <= params["time_till"]]
+        
+        standin = StandinZabbix(latency=0, methods={"history.get": history_get,
+                                                    "event.get": event_get})
+        saved = {name: os.environ.get(name) for name in ("ZABBIX_URL", "ZABBIX_TOKEN")}
+        os.environ.update(ZABBIX_URL=standin.start(), ZABBIX_TOKEN="standin")
+        refresh_interval = server.entity_index.refresh_interval
+        server.entity_index.refresh_interval = 0
+        
+        async def call() -> tuple:
+            try:
+                await server.close_zabbix_client()
+                # The MCP session's call_tool, like the chatbot's, sends no progress token
+                async with Client(server.mcp) as client:
+                    history = await client.session.call_tool("history_get", {
+                        "itemids": ["1"], "time_from": start, "time_till": start + 3 * 3600 - 1,
+                        "sortorder": "ASC", "stream": True, "cache": False})
+                    streamed = await client.session.call_tool("event_get", {
+                        "time_from": start, "time_till": start + 3 * 86400 - 1,
+                        "output": "extend", "stream": True, "cache": False})
+                return (json.loads(history.content[0].text),
+                        json.loads(streamed.content[0].text).get("result", []))
+            finally:
+                await server.close_zabbix_client()
+        
+        try:
+            rows, received = asyncio.run(call())
+        finally:
+            server.entity_index.refresh_interval = refresh_interval
+            standin.stop()
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        
+        if [row["value"] for row in rows] != [row["value"] for row in values]:
+            print(f"❌ Streamed history returned {len(rows)} of {len(values)} rows")
+            return False
+        
+        if [event["eventid"] for event in received] != [event["eventid"] for event in events]:
+            print(f"❌ Streamed events returned {len(received)} of {len(events)} events")
+            return False
+        
+        print(f"✅ Streamed history returned all {len(rows)} rows and all {len(received)} events")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Streaming test failed: {e}")
+        return False
+
+
+def test_series_store() -> bool:
+    """Test the covered intervals and merged rows of the local history store.
+    
+    The intervals decide which history is never fetched again, so gaps must
+    be exact at inclusive boundaries and rows fetched twice must be stored once.
+    
+    Returns:
+        bool: True if intervals, stored rows and instance separation are correct
+    """
+    print("\n🔍 Testing the local history store...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        from series_store import SeriesStore, merge_intervals, subtract_intervals
+        
+        interval_cases = [
+            (subtract_intervals(0, 49, [(10, 19), (30, 39)]), [(0, 9), (20, 29), (40, 49)]),
+            (subtract_intervals(10, 19, [(10, 19)]), []),
+            (subtract_intervals(19, 30, [(10, 19), (30, 39)]), [(20, 29)]),
+            (subtract_intervals(20, 29, [(10, 19), (30, 39)]), [(20, 29)]),
+            (subtract_intervals(0, 5, []), [(0, 5)]),
+            (merge_intervals([(10, 19)], (20, 29)), [(10, 29)]),
+            (merge_intervals([(10, 25)], (20, 29)), [(10, 29)]),
+            (merge_intervals([(10, 19)], (21, 29)), [(10, 19), (21, 29)]),
+            (merge_intervals([(10, 19), (30, 39)], (15, 34)), [(10, 39)]),
+        ]
+        for got, expected in interval_cases:
+            if got != expected:
+                print(f"❌ Interval arithmetic returned {got}, expected {expected}")
+                return False
+        
+        start = 1700000000
+        values = {start + i * 60: str(i) for i in range(120)}
+        calls = []
+        
+        async def call(method: str, params: dict, cache: bool = True) -> list:
+            calls.append((params["time_from"], params["time_till"]))
+            # Zabbix answers every request with its own copy of a boundary row
+            return [{"itemid": "1", "clock": str(clock), "ns": "0", "value": value}
+                    for clock, value in values.items()
+                    if params["time_from"] - 60 <= clock <= params["time_till"]]
+        
+        async def fill(store: SeriesStore) -> tuple:
+            first = await store.fetch(call, ["1"], 0, start, start + 3599)
+            second = await store.fetch(call, ["1"], 0, start + 1800, start + 7199)
+            calls.clear()
+            warm = await store.fetch(call, ["1"], 0, start, start + 7199)
+            return first, second, warm
+        
+        with tempfile.TemporaryDirectory() as directory:
+            store = SeriesStore(directory, settle=0)
+            store.bind("http://zabbix-a/api_jsonrpc.php", "Admin")
+            if not store.supports(["1"], 0):
+                print("❌ Bound store does not accept numeric history")
+                return False
+            first, second, warm = asyncio.run(fill(store))
+            
+            expected = [value for clock, value in values.items() if clock <= start + 7199]
+            if calls or [row["value"] for row in warm] != expected:
+                print(f"❌ Warm read made {len(calls)} calls and returned "
+                      f"{len(warm)} of {len(expected)} rows")
+                return False
+            
+            stored = np.load(store._path(store._key("1", 0)))
+            stamps = list(zip(stored["clock"].tolist(), stored["ns"].tolist()))
+            if stamps != sorted(set(stamps)):
+                print("❌ Stored series has duplicate or unordered timestamps")
+                return False
+            
+            other = SeriesStore(directory, settle=0)
+            other.bind("http://zabbix-a/api_jsonrpc.php", "Admin")
+            if other.supports(["1"], 0):
+                print("❌ Two processes use the same store directory")
+                return False
+            
+            store.close()
+            other.close()
+            store.bind("http://zabbix-b/api_jsonrpc.php", "Admin")
+            if not store.supports(["1"], 0) or store._covered("1", 0):
+                print("❌ History of one Zabbix instance is served for another")
+                return False
+            store.close()
+        
+        print(f"✅ Intervals correct, {len(stamps)} rows stored once, instances kept apart")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Series store test failed: {e}")
+        return False
+
+
 def show_summary(tests_passed: int, total_tests: int) -> None:
     """Show test summary.
     
@@ -251,6 +429,9 @@ def main() -> None:
         ("Zabbix Connection", test_connection),
         ("Basic Operations", test_basic_operations),
         ("Read-Only Mode", test_read_only_mode),
+        ("Local History Store", test_series_store),
+        # Last, as it points the server at a stand-in Zabbix while it runs
+        ("Streaming Without Progress Token", test_streaming_without_progress_token),
     ]
     
     tests_passed = 0
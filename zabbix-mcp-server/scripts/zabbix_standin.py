@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Stand-in Zabbix JSON-RPC endpoint for local benchmarks
+
+Serves just enough of api_jsonrpc.php for the MCP server to log in and run
+tools against synthetic data, with a configurable per-request latency that
+imitates a real Zabbix frontend. No Zabbix installation is required.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+
+class StandinError(Exception):
+    """Raised by a method handler to answer with a JSON-RPC error.
+
+    Args:
+        message: Error message, e.g. "Invalid params."
+        data: Error details, e.g. "Session terminated, re-login, please."
+        code: JSON-RPC error code
+    """
+
+    def __init__(self, message: str, data: str = "", code: int = -32602):
+        super().__init__(message)
+        self.error = {"code": code, "message": message, "data": data}
+
+
+def default_hosts(count: int) -> list:
+    """Build a synthetic host inventory.
+
+    Args:
+        count: Number of hosts to generate
+
+    Returns:
+        list: Host objects shaped like host.get output=extend
+    """
+    return [
+        {
+            "hostid": str(10000 + i),
+            "proxyid": "0",
+            "host": f"host-{i:05d}",
+            "status": "0",
+            "ipmi_authtype": "-1",
+            "ipmi_privilege": "2",
+            "ipmi_username": "",
+            "ipmi_password": "",
+            "maintenanceid": "0",
+            "maintenance_status": "0",
+            "maintenance_type": "0",
+            "maintenance_from": "0",
+            "name": f"Host {i:05d}",
+            "flags": "0",
+            "templateid": "0",
+            "description": "",
+            "tls_connect": "1",
+            "tls_accept": "1",
+            "tls_issuer": "",
+            "tls_subject": "",
+            "custom_interfaces": "0",
+            "uuid": "",
+            "vendor_name": "",
+            "vendor_version": "",
+            "proxy_groupid": "0",
+            "monitored_by": "0",
+            "inventory_mode": "-1",
+            "active_available": "1",
+            "assigned_proxyid": "0",
+        }
+        for i in range(count)
+    ]
+
+
+def select_output(rows: list, params: Any) -> list:
+    """Apply the output parameter of a get request to a result.
+
+    Args:
+        rows: Objects with all fields
+        params: Request params
+
+    Returns:
+        list: Objects limited to the requested fields
+    """
+    output = (params or {}).get("output", "extend")
+    if not isinstance(output, list):
+        return rows
+    return [{field: row[field] for field in output if field in row} for row in rows]
+
+
+class StandinZabbix:
+    """Threaded HTTP server answering a subset of the Zabbix API.
+
+    Args:
+        latency: Seconds to sleep before answering each request
+        version: Version string returned by apiinfo.version
+        methods: Extra or overriding handlers, keyed by method name. Each
+            handler receives the request params and returns the result, or
+            raises StandinError to answer with an error.
+    """
+
+    def __init__(self, latency: float = 0.02, version: str = "7.0.0",
+                 methods: Optional[Dict[str, Callable[[Any], Any]]] = None):
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.methods: Dict[str, Callable[[Any], Any]] = {
+            "apiinfo.version": lambda params: version,
+            "user.login": lambda params: "standin-session",
+            "user.logout": lambda params: True,
+            "user.checkAuthentication": lambda params: {"userid": "1"},
+            "host.get": lambda params: select_output(default_hosts(100), params),
+        }
+        self.methods.update(methods or {})
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        """URL of the running endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api_jsonrpc.php"
+
+    def start(self) -> str:
+        """Start serving in a background thread.
+
+        Returns:
+            str: URL of the endpoint
+        """
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with standin._lock:
+                    standin.connections += 1
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                with standin._lock:
+                    standin.requests += 1
+
+                if standin.latency:
+                    time.sleep(standin.latency)
+
+                reply = {"jsonrpc": "2.0", "id": request.get("id")}
+                handler = standin.methods.get(request["method"])
+                try:
+                    if handler is None:
+                        raise StandinError("Method not found.", request["method"], -32601)
+                    reply["result"] = handler(request.get("params"))
+                except StandinError as e:
+                    reply["error"] = e.error
+
+                body = json.dumps(reply).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,167 @@
+"""
+Per-item statistics over numeric history
+
+Aggregates history window by window as it is fetched, so a long range never
+has to be held as history rows. Count, min, max, avg, stddev and rate are
+kept as running values per item; percentiles keep the item's values as a
+float64 array (8 bytes per value instead of a decoded JSON row).
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Aggregates besides percentiles, which are written as p50, p95, p99.9, ...
+AGGREGATES = ("count", "min", "max", "avg", "sum", "stddev", "rate", "first", "last")
+
+# Aggregates returned when none are requested
+DEFAULT_AGGREGATES = ["count", "min", "avg", "max"]
+
+PERCENTILE = re.compile(r"^p(\d{1,2}(\.\d+)?|100)$")
+
+
+def parse_aggregates(aggregates: Optional[List[str]]) -> List[str]:
+    """Validate the requested aggregates.
+
+    Args:
+        aggregates: Aggregate names, e.g. ["avg", "p95", "rate"]
+
+    Returns:
+        List[str]: Normalized aggregate names
+
+    Raises:
+        ValueError: If an aggregate is not supported
+    """
+    names = [name.strip().lower() for name in aggregates or DEFAULT_AGGREGATES]
+    for name in names:
+        if name not in AGGREGATES and not PERCENTILE.match(name):
+            raise ValueError(f"Unsupported aggregate '{name}', use one of "
+                             f"{', '.join(AGGREGATES)} or a percentile such as p95")
+    return names
+
+
+class ItemStats:
+    """Running statistics of one item's values."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.first = None
+        self.last = None
+        self.values: List[np.ndarray] = []
+
+
+class HistoryAggregator:
+    """Accumulate statistics per item from chunks of history rows.
+
+    Chunks must arrive in ascending clock order, as stream_history() yields
+    them, for first, last and rate to be correct.
+
+    Args:
+        aggregates: Aggregates from parse_aggregates()
+    """
+
+    def __init__(self, aggregates: List[str]):
+        self.aggregates = aggregates
+        self.keep_values = any(PERCENTILE.match(name) for name in aggregates)
+        self.items: Dict[str, ItemStats] = {}
+
+    def add(self, rows: List[Dict[str, Any]]) -> None:
+        """Add a chunk of history rows.
+
+        Args:
+            rows: history.get rows of numeric items, ascending by clock
+
+        Raises:
+            ValueError: If the values are not numeric
+        """
+        if not rows:
+            return
+        itemids = np.array([row["itemid"] for row in rows], dtype=np.int64)
+        clocks = np.array([row["clock"] for row in rows], dtype=np.int64)
+        try:
+            values = np.array([row["value"] for row in rows], dtype=np.float64)
+        except ValueError as e:
+            raise ValueError("history_aggregate only applies to numeric history") from e
+
+        order = np.lexsort((clocks, itemids))
+        itemids, clocks, values = itemids[order], clocks[order], values[order]
+        starts = np.flatnonzero(np.diff(itemids, prepend=itemids[0] - 1))
+        ends = np.append(starts[1:], len(itemids)) - 1
+        counts = ends - starts + 1
+        sums = np.add.reduceat(values, starts)
+        means = sums / counts
+        m2s = np.add.reduceat((values - np.repeat(means, counts)) ** 2, starts)
+        lows = np.minimum.reduceat(values, starts)
+        highs = np.maximum.reduceat(values, starts)
+
+        for index, start in enumerate(starts.tolist()):
+            end = int(ends[index])
+            stats = self.items.setdefault(str(itemids[start]), ItemStats())
+            count = int(counts[index])
+            # Merge the chunk into the running mean and sum of squares (Chan et al.)
+            total = stats.count + count
+            delta = means[index] - stats.mean
+            stats.mean += delta * count / total
+            stats.m2 += m2s[index] + delta * delta * stats.count * count / total
+            stats.count = total
+            stats.min = min(stats.min, lows[index])
+            stats.max = max(stats.max, highs[index])
+            if stats.first is None:
+                stats.first = (int(clocks[start]), float(values[start]))
+            stats.last = (int(clocks[end]), float(values[end]))
+            if self.keep_values:
+                stats.values.append(values[start:end + 1])
+
+    def result(self, itemids: List[str]) -> List[Dict[str, Any]]:
+        """Return one row of the requested aggregates per item.
+
+        Args:
+            itemids: Items to report, including those without values
+
+        Returns:
+            List[Dict[str, Any]]: Aggregates per item; None where an item has
+                no values (or too few for rate)
+        """
+        rows = []
+        for itemid in itemids:
+            stats = self.items.get(str(itemid), ItemStats())
+            values = np.concatenate(stats.values) if stats.values else None
+            row: Dict[str, Any] = {"itemid": str(itemid)}
+            for name in self.aggregates:
+                row[name] = self._aggregate(name, stats, values)
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _aggregate(name: str, stats: ItemStats, values: Optional[np.ndarray]) -> Any:
+        if name == "count":
+            return stats.count
+        if not stats.count:
+            return None
+        if name == "min":
+            return float(stats.min)
+        if name == "max":
+            return float(stats.max)
+        if name == "avg":
+            return float(stats.mean)
+        if name == "sum":
+            return float(stats.mean * stats.count)
+        if name == "stddev":
+            return float(np.sqrt(stats.m2 / stats.count))
+        if name == "first":
+            return stats.first[1]
+        if name == "last":
+            return stats.last[1]
+        if name == "rate":
+            # Average change per second between the first and last value
+            elapsed = stats.last[0] - stats.first[0]
+            return (stats.last[1] - stats.first[1]) / elapsed if elapsed else None
+        return float(np.percentile(values, float(name[1:])))
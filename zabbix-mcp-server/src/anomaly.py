@@ -0,0 +1,211 @@
+"""
+Vectorized anomaly scoring across many item series
+
+Scores how far each item's recent behaviour is from its baseline, for all
+items at once: values are kept as one flat array with a parallel array of
+series indexes, and per-series statistics are computed with bincount and a
+single sort instead of a Python loop per item.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Supported scoring methods
+SCAN_METHODS = ("zscore", "mad")
+
+# Scales the median absolute deviation to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+# Items per history.get or trend.get request of a scan
+SCAN_BATCH = int(os.getenv("ZABBIX_SCAN_BATCH", "500"))
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def flatten(rows: List[Dict[str, Any]], index: Dict[str, int],
+            field: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn history or trend rows into series indexes and values.
+
+    Args:
+        rows: Rows with an itemid and the value field
+        index: Series index per item ID; rows of other items are skipped
+        field: Name of the value field, e.g. "value" or "value_avg"
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Series index and value of each row
+    """
+    rows = [row for row in rows if row["itemid"] in index]
+    series = np.array([index[row["itemid"]] for row in rows], dtype=np.int64)
+    values = np.array([row[field] for row in rows], dtype=np.float64)
+    return series, values
+
+
+async def fetch_series(call: ApiCall, items: List[Dict[str, Any]], method: str,
+                       params: Dict[str, Any], field: str,
+                       cache: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Read one window for many items in concurrent batches, as flat arrays.
+
+    Items are grouped by value type for history.get, and each batch is
+    converted to arrays as soon as it arrives, so the row objects of only a
+    few batches are alive at a time.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        items: Items with itemid and value_type; their position is the series index
+        method: "history.get" or "trend.get"
+        params: Window parameters, e.g. time_from and time_till
+        field: Value field of the rows
+        cache: Use cached results when available
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Series index and value of each row
+    """
+    index = {item["itemid"]: position for position, item in enumerate(items)}
+    by_type: Dict[int, List[str]] = {}
+    for item in items:
+        by_type.setdefault(int(item["value_type"]), []).append(item["itemid"])
+
+    async def fetch(itemids: List[str], value_type: int) -> Tuple[np.ndarray, np.ndarray]:
+        request = dict(params, itemids=itemids)
+        if method == "history.get":
+            request["history"] = value_type
+        return flatten(await call(method, request, cache=cache), index, field)
+
+    parts = await asyncio.gather(*(
+        fetch(itemids[start:start + SCAN_BATCH], value_type)
+        for value_type, itemids in by_type.items()
+        for start in range(0, len(itemids), SCAN_BATCH)))
+    if not parts:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return (np.concatenate([series for series, _ in parts]),
+            np.concatenate([values for _, values in parts]))
+
+
+def group_mean(series: np.ndarray, values: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the mean and standard deviation of every series.
+
+    Args:
+        series: Series index of each value
+        values: Values
+        count: Number of series
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Mean and standard deviation per
+            series, NaN for series without values
+    """
+    sizes = np.bincount(series, minlength=count).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(series, weights=values, minlength=count) / sizes
+        deviation = values - mean[series]
+        std = np.sqrt(np.bincount(series, weights=deviation * deviation, minlength=count) / sizes)
+    return mean, std
+
+
+def group_median(series: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Return the median of every series with one sort.
+
+    Args:
+        series: Series index of each value
+        values: Values
+        count: Number of series
+
+    Returns:
+        np.ndarray: Median per series, NaN for series without values
+    """
+    order = np.lexsort((values, series))
+    ordered = values[order]
+    sizes = np.bincount(series, minlength=count)
+    starts = np.cumsum(sizes) - sizes
+    median = np.full(count, np.nan)
+    present = sizes > 0
+    low = starts[present] + (sizes[present] - 1) // 2
+    high = starts[present] + sizes[present] // 2
+    median[present] = (ordered[low] + ordered[high]) / 2
+    return median
+
+
+def score_series(base_series: np.ndarray, base_values: np.ndarray,
+                 recent_series: np.ndarray, recent_values: np.ndarray,
+                 count: int, method: str = "zscore",
+                 min_baseline: int = 3) -> Dict[str, np.ndarray]:
+    """Score each series' recent level against its baseline.
+
+    zscore compares the recent mean with the baseline mean in baseline
+    standard deviations; mad compares the recent median with the baseline
+    median in scaled median absolute deviations, which is robust to spikes
+    in the baseline.
+
+    Args:
+        base_series: Series index of each baseline value
+        base_values: Baseline values
+        recent_series: Series index of each recent value
+        recent_values: Recent values
+        count: Number of series
+        method: "zscore" or "mad"
+        min_baseline: Baseline values a series needs to be scored
+
+    Returns:
+        Dict[str, np.ndarray]: score, recent level, baseline level and
+            spread per series; score is NaN where a series cannot be scored
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in SCAN_METHODS:
+        raise ValueError(f"Unknown scan method '{method}', use one of {SCAN_METHODS}")
+
+    if method == "zscore":
+        baseline, spread = group_mean(base_series, base_values, count)
+        recent, _ = group_mean(recent_series, recent_values, count)
+    else:
+        baseline = group_median(base_series, base_values, count)
+        deviation = np.abs(base_values - baseline[base_series])
+        spread = MAD_SCALE * group_median(base_series, deviation, count)
+        recent = group_median(recent_series, recent_values, count)
+
+    enough = np.bincount(base_series, minlength=count) >= min_baseline
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = (recent - baseline) / spread
+    # A flat baseline makes any change infinitely unusual; no change scores 0
+    flat = spread == 0
+    score[flat] = np.where(recent[flat] == baseline[flat], 0.0, np.inf)
+    score[~enough | np.isnan(recent)] = np.nan
+    return {"score": score, "recent": recent, "baseline": baseline, "spread": spread}
+
+
+def top_offenders(score: np.ndarray, limit: int, min_score: float = 0.0) -> np.ndarray:
+    """Return the series with the largest absolute scores.
+
+    Args:
+        score: Score per series, NaN for unscored series
+        limit: Maximum number of series
+        min_score: Minimum absolute score
+
+    Returns:
+        np.ndarray: Series indexes, largest absolute score first
+    """
+    magnitude = np.nan_to_num(np.abs(score), nan=-1.0, posinf=np.finfo(np.float64).max)
+    candidates = np.flatnonzero(magnitude >= max(min_score, 0.0))
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(-magnitude[candidates], limit - 1)[:limit]]
+    return candidates[np.argsort(-magnitude[candidates], kind="stable")]
+
+
+def rounded(value: float, digits: int) -> Optional[float]:
+    """Round a statistic for output, giving None for NaN and infinity.
+
+    Args:
+        value: Statistic
+        digits: Decimal places
+
+    Returns:
+        Optional[float]: Rounded value, or None if it is not finite
+    """
+    value = float(value)
+    return round(value, digits) if np.isfinite(value) else None
@@ -0,0 +1,91 @@
+"""
+Single-flight coalescing of identical concurrent Zabbix API reads
+
+When many MCP sessions ask the same question at the same moment (an alert
+storm hitting problem.get, for example), only the first call goes to Zabbix;
+identical calls that arrive while it is in flight wait for and share its
+result.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+# Whether identical in-flight reads share one upstream request
+COALESCE_ENABLED = os.getenv("ZABBIX_COALESCE", "true").lower() in ("true", "1", "yes")
+
+
+class RequestCoalescer:
+    """Share one in-flight upstream request between identical calls.
+
+    The upstream request runs as its own task, so a caller that is cancelled
+    (for example when its MCP session disconnects) does not cancel the
+    request for the callers sharing it.
+
+    Args:
+        enabled: Whether calls are coalesced at all
+    """
+
+    def __init__(self, enabled: bool = COALESCE_ENABLED):
+        self.enabled = enabled
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self.calls: Dict[str, int] = {}
+        self.upstream: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    async def run(self, method: str, key: str,
+                  fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch(), or join an identical request already in flight.
+
+        Args:
+            method: Zabbix API method name, used for the counters
+            key: Identity of the request; equal keys share one request
+            fetch: Coroutine function sending the upstream request
+
+        Returns:
+            Any: Result of the shared request. It is shared between callers
+                and must not be modified.
+        """
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+        task = self.in_flight.get(key) if self.enabled else None
+        if task is not None:
+            self.coalesced[method] = self.coalesced.get(method, 0) + 1
+        else:
+            self.upstream[method] = self.upstream.get(method, 0) + 1
+            task = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda done: self._finish(key, done))
+            if self.enabled:
+                self.in_flight[key] = task
+
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return per-method call, upstream request and coalescing counters.
+
+        Returns:
+            Dict[str, Any]: Coalescing statistics
+        """
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self.in_flight),
+            "coalesced": sum(self.coalesced.values()),
+            "methods": {
+                method: {
+                    "calls": self.calls[method],
+                    "upstream": self.upstream.get(method, 0),
+                    "coalesced": self.coalesced.get(method, 0),
+                }
+                for method in sorted(self.calls)
+            },
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        # Mark a failure as retrieved even if every waiting caller was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,194 @@
+"""
+Pooled keep-alive HTTP transport for the Zabbix JSON-RPC client
+
+All MCP tools share one aiohttp session whose connector keeps connections to
+api_jsonrpc.php open between calls, so a burst of tool calls reuses a small
+set of TCP/TLS connections instead of handshaking for each request.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import aiohttp
+
+# Total number of pooled connections
+POOL_SIZE = int(os.getenv("ZABBIX_POOL_SIZE", "32"))
+
+# Maximum number of connections to a single host (0 = no per-host cap)
+POOL_PER_HOST = int(os.getenv("ZABBIX_POOL_PER_HOST", "16"))
+
+# Seconds an idle connection is kept open for reuse
+KEEPALIVE_TIMEOUT = float(os.getenv("ZABBIX_KEEPALIVE_TIMEOUT", "30"))
+
+# Whole-request and connect timeouts in seconds
+HTTP_TIMEOUT = float(os.getenv("ZABBIX_HTTP_TIMEOUT", "30"))
+CONNECT_TIMEOUT = float(os.getenv("ZABBIX_CONNECT_TIMEOUT", "10"))
+
+
+class PoolStats:
+    """Utilization and wait-time counters for the shared connection pool.
+
+    Connection events are collected through aiohttp request tracing; waits for
+    a free API slot are reported by the caller with record_slot_wait().
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.requests = 0
+        self.failed_requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connection_waits = 0
+        self.connection_wait_total = 0.0
+        self.connection_wait_max = 0.0
+        self.slot_waits = 0
+        self.slot_wait_total = 0.0
+        self.slot_wait_max = 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build an aiohttp trace config that feeds these counters.
+
+        Returns:
+            aiohttp.TraceConfig: Trace config for the shared session
+        """
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_queued_end.append(self._on_queued_end)
+        trace.on_connection_create_end.append(self._on_create_end)
+        trace.on_connection_reuseconn.append(self._on_reuse)
+        return trace
+
+    def record_slot_wait(self, seconds: float) -> None:
+        """Record time a call spent waiting for a free API slot.
+
+        Args:
+            seconds: Time spent waiting
+        """
+        self.slot_waits += 1
+        self.slot_wait_total += seconds
+        self.slot_wait_max = max(self.slot_wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current pool configuration and counters.
+
+        Returns:
+            Dict[str, Any]: Pool statistics with wait times in milliseconds
+        """
+        connections = self.connections_created + self.connections_reused
+        # Every call goes to the same Zabbix frontend, so the per-host cap
+        # is the effective pool size when it is the smaller of the two
+        capacity = min(POOL_SIZE, POOL_PER_HOST) if POOL_PER_HOST else POOL_SIZE
+        return {
+            "pool_size": POOL_SIZE,
+            "per_host_limit": POOL_PER_HOST,
+            "keepalive_timeout": KEEPALIVE_TIMEOUT,
+            "http_timeout": HTTP_TIMEOUT,
+            "connect_timeout": CONNECT_TIMEOUT,
+            "in_flight": self.in_flight,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "utilization": round(self.in_use / capacity, 3) if capacity else None,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 3) if connections else None,
+            "connection_waits": self.connection_waits,
+            "connection_wait_avg_ms": _average_ms(self.connection_wait_total, self.connection_waits),
+            "connection_wait_max_ms": round(self.connection_wait_max * 1000, 3),
+            "slot_waits": self.slot_waits,
+            "slot_wait_avg_ms": _average_ms(self.slot_wait_total, self.slot_waits),
+            "slot_wait_max_ms": round(self.slot_wait_max * 1000, 3),
+        }
+
+    async def _on_request_start(self, session: aiohttp.ClientSession,
+                                ctx: SimpleNamespace, params: Any) -> None:
+        self.requests += 1
+        self.in_flight += 1
+
+    async def _on_request_end(self, session: aiohttp.ClientSession,
+                              ctx: SimpleNamespace, params: Any) -> None:
+        self._release(ctx)
+
+    async def _on_request_exception(self, session: aiohttp.ClientSession,
+                                    ctx: SimpleNamespace, params: Any) -> None:
+        self._release(ctx)
+        self.failed_requests += 1
+
+    async def _on_queued_start(self, session: aiohttp.ClientSession,
+                               ctx: SimpleNamespace, params: Any) -> None:
+        ctx.queued_at = time.perf_counter()
+
+    async def _on_queued_end(self, session: aiohttp.ClientSession,
+                             ctx: SimpleNamespace, params: Any) -> None:
+        waited = time.perf_counter() - ctx.queued_at
+        self.connection_waits += 1
+        self.connection_wait_total += waited
+        self.connection_wait_max = max(self.connection_wait_max, waited)
+
+    async def _on_create_end(self, session: aiohttp.ClientSession,
+                             ctx: SimpleNamespace, params: Any) -> None:
+        self.connections_created += 1
+        self._acquire(ctx)
+
+    async def _on_reuse(self, session: aiohttp.ClientSession,
+                        ctx: SimpleNamespace, params: Any) -> None:
+        self.connections_reused += 1
+        self._acquire(ctx)
+
+    def _acquire(self, ctx: SimpleNamespace) -> None:
+        ctx.holds_connection = True
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _release(self, ctx: SimpleNamespace) -> None:
+        self.in_flight -= 1
+        if getattr(ctx, "holds_connection", False):
+            ctx.holds_connection = False
+            self.in_use -= 1
+
+
+def _average_ms(total: float, count: int) -> float:
+    return round(total / count * 1000, 3) if count else 0.0
+
+
+def create_session(stats: PoolStats) -> aiohttp.ClientSession:
+    """Create the pooled HTTP session shared by all Zabbix API calls.
+
+    Must be called from the event loop the session will be used in.
+
+    Args:
+        stats: Counters to feed from request tracing
+
+    Returns:
+        aiohttp.ClientSession: Session with a keep-alive connection pool
+    """
+    connector = aiohttp.TCPConnector(
+        limit=POOL_SIZE,
+        limit_per_host=POOL_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=request_timeout(),
+        trace_configs=[stats.trace_config()],
+    )
+
+
+def request_timeout() -> aiohttp.ClientTimeout:
+    """Return the timeout applied to every Zabbix API request.
+
+    Returns:
+        aiohttp.ClientTimeout: Whole-request and connect timeouts
+    """
+    return aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=CONNECT_TIMEOUT)
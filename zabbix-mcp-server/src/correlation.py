@@ -0,0 +1,179 @@
+"""
+Cross-item correlation over a common time grid
+
+Reads the history of a reference item and a set of candidates, averages every
+series into the same fixed-width time bins, and computes the Pearson
+correlation of the reference with all candidates at once, optionally for a
+range of lags. Empty bins are left out pairwise rather than filled in.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from anomaly import SCAN_BATCH
+from routing import fetch_routed
+
+# Bins of the grid when no step is given
+GRID_POINTS = 1000
+
+# Shortest bin width in seconds when no step is given
+MIN_STEP = 60
+
+# Bins a pair of series must share to be correlated
+MIN_OVERLAP = 10
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def grid_step(time_from: int, time_till: int, step: Optional[int] = None) -> Tuple[int, int]:
+    """Choose the bin width and number of bins for a range.
+
+    Args:
+        time_from: Start of the range (Unix timestamp)
+        time_till: End of the range (Unix timestamp)
+        step: Bin width in seconds; by default the range is split into at
+            most GRID_POINTS bins of at least MIN_STEP seconds
+
+    Returns:
+        Tuple[int, int]: Bin width in seconds and number of bins
+    """
+    span = time_till - time_from + 1
+    if not step:
+        step = max(MIN_STEP, -(-span // GRID_POINTS))
+    return step, -(-span // step)
+
+
+def bin_means(series: np.ndarray, clocks: np.ndarray, values: np.ndarray,
+              count: int, time_from: int, step: int, bins: int) -> np.ndarray:
+    """Average values into fixed-width time bins, one row per series.
+
+    Args:
+        series: Series index of each value
+        clocks: Time of each value (Unix timestamp)
+        values: Values
+        count: Number of series
+        time_from: Start of the first bin
+        step: Bin width in seconds
+        bins: Number of bins
+
+    Returns:
+        np.ndarray: count x bins matrix of bin means, NaN for empty bins
+    """
+    slot = (clocks - time_from) // step
+    inside = (slot >= 0) & (slot < bins)
+    flat = series[inside] * bins + slot[inside]
+    sizes = np.bincount(flat, minlength=count * bins)
+    sums = np.bincount(flat, weights=values[inside], minlength=count * bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums / sizes).reshape(count, bins)
+
+
+def masked_pearson(reference: np.ndarray, candidates: np.ndarray,
+                   min_overlap: int = MIN_OVERLAP) -> Tuple[np.ndarray, np.ndarray]:
+    """Correlate one series with many, using only bins where both have values.
+
+    Args:
+        reference: Reference series, length bins
+        candidates: Candidate series, one row each
+        min_overlap: Shared bins needed for a coefficient
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Pearson coefficient per candidate (NaN
+            where too few bins are shared or a series is constant) and the
+            number of shared bins
+    """
+    mask = ~np.isnan(candidates) & ~np.isnan(reference)
+    overlap = mask.sum(axis=1)
+    ref = np.where(mask, reference, 0.0)
+    cand = np.where(mask, candidates, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ref = np.where(mask, ref - (ref.sum(axis=1) / overlap)[:, None], 0.0)
+        cand = np.where(mask, cand - (cand.sum(axis=1) / overlap)[:, None], 0.0)
+        corr = (ref * cand).sum(axis=1) / np.sqrt((ref * ref).sum(axis=1) * (cand * cand).sum(axis=1))
+    corr[overlap < min_overlap] = np.nan
+    return corr, overlap
+
+
+def lagged_correlations(reference: np.ndarray, candidates: np.ndarray,
+                        max_lag: int = 0) -> Dict[str, np.ndarray]:
+    """Find the lag of strongest correlation of every candidate.
+
+    A positive lag means the candidate moves that many bins after the
+    reference.
+
+    Args:
+        reference: Reference series, length bins
+        candidates: Candidate series, one row each
+        max_lag: Largest lag to try in each direction, in bins
+
+    Returns:
+        Dict[str, np.ndarray]: correlation, lag and overlap per candidate,
+            at the lag with the largest absolute correlation
+    """
+    bins = len(reference)
+    count = len(candidates)
+    best = {"correlation": np.full(count, np.nan),
+            "lag": np.zeros(count, dtype=np.int64),
+            "overlap": np.zeros(count, dtype=np.int64)}
+    for lag in range(-max_lag, max_lag + 1):
+        if abs(lag) >= bins:
+            continue
+        if lag >= 0:
+            corr, overlap = masked_pearson(reference[:bins - lag], candidates[:, lag:])
+        else:
+            corr, overlap = masked_pearson(reference[-lag:], candidates[:, :bins + lag])
+        better = np.abs(corr) > np.nan_to_num(np.abs(best["correlation"]), nan=-1.0)
+        best["correlation"][better] = corr[better]
+        best["lag"][better] = lag
+        best["overlap"][better] = overlap[better]
+    return best
+
+
+async def fetch_grid(call: ApiCall, items: List[Dict[str, Any]], time_from: int,
+                     time_till: int, step: int, bins: int,
+                     cache: bool = True) -> np.ndarray:
+    """Read items in concurrent batches and average them into time bins.
+
+    Batches are routed like history_get with source=auto, so bins of an
+    hour or more are read from trends. Each batch is reduced to arrays as
+    soon as it arrives.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        items: Items with itemid and value_type; their position is the row
+        time_from: Start of the grid (Unix timestamp)
+        time_till: End of the grid (Unix timestamp)
+        step: Bin width in seconds
+        bins: Number of bins
+        cache: Use cached results when available
+
+    Returns:
+        np.ndarray: len(items) x bins matrix of bin means, NaN for empty bins
+    """
+    index = {item["itemid"]: position for position, item in enumerate(items)}
+    by_type: Dict[int, List[str]] = {}
+    for item in items:
+        by_type.setdefault(int(item["value_type"]), []).append(item["itemid"])
+
+    async def fetch(itemids: List[str], value_type: int) -> Tuple[List[int], np.ndarray]:
+        routed = await fetch_routed(call, itemids, time_from, time_till, bins, value_type, cache)
+        batch = {itemid: row for row, itemid in enumerate(itemids)}
+        rows = [row for row in routed["result"] if row["itemid"] in batch]
+        series = np.array([batch[row["itemid"]] for row in rows], dtype=np.int64)
+        clocks = np.array([row["clock"] for row in rows], dtype=np.int64)
+        values = np.array([row["value"] for row in rows], dtype=np.float64)
+        means = bin_means(series, clocks, values, len(itemids), time_from, step, bins)
+        return [index[itemid] for itemid in itemids], means
+
+    grid = np.full((len(items), bins), np.nan)
+    for positions, means in await asyncio.gather(*(
+            fetch(itemids[start:start + SCAN_BATCH], value_type)
+            for value_type, itemids in by_type.items()
+            for start in range(0, len(itemids), SCAN_BATCH))):
+        grid[positions] = means
+    return grid
@@ -0,0 +1,192 @@
+"""
+Server-side downsampling of history and trend series
+
+Reduces each item's series to at most max_points points before it is sent to
+the client, either by Largest-Triangle-Three-Buckets (LTTB), which keeps a
+subset of the original samples that preserves the visual shape, or by
+min/avg/max buckets over equal time intervals, which keeps the extremes.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Supported downsampling methods
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Select the points of a series to keep with LTTB.
+
+    The first and last points are always kept. The remaining points are split
+    into max_points - 2 buckets of equal size, and from each bucket the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket is kept.
+
+    Args:
+        x: Sample times, ascending
+        y: Sample values
+        max_points: Number of points to keep
+
+    Returns:
+        np.ndarray: Indices of the kept points, ascending
+    """
+    size = len(x)
+    if max_points >= size:
+        return np.arange(size)
+    if max_points < 3:
+        return np.array([0, size - 1][:max_points], dtype=np.int64)
+
+    edges = np.linspace(1, size - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # Averages of every bucket, plus the last point as the final "next bucket"
+    avg_x = np.append(np.add.reduceat(x[1:size - 1], edges[:-1] - 1) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:size - 1], edges[:-1] - 1) / counts, y[-1])
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[previous] - avg_x[bucket + 1]) * (by - y[previous])
+                      - (x[previous] - bx) * (avg_y[bucket + 1] - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def bucket_bounds(clocks: np.ndarray, max_points: int) -> np.ndarray:
+    """Split a sorted series into at most max_points equal time intervals.
+
+    Args:
+        clocks: Sample times, ascending
+        max_points: Maximum number of intervals
+
+    Returns:
+        np.ndarray: Start index of each non-empty interval
+    """
+    span = int(clocks[-1] - clocks[0]) + 1
+    bucket = (clocks - clocks[0]) * max_points // span
+    return np.flatnonzero(np.diff(bucket, prepend=-1))
+
+
+def _series(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    by_item: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_item.setdefault(row["itemid"], []).append(row)
+    for series in by_item.values():
+        series.sort(key=lambda row: int(row["clock"]))
+    return by_item
+
+
+def downsample_history(rows: List[Dict[str, Any]], max_points: int,
+                       method: str = "lttb") -> List[Dict[str, Any]]:
+    """Downsample numeric history.get rows to at most max_points per item.
+
+    Args:
+        rows: history.get rows of numeric items
+        max_points: Maximum number of points per item
+        method: "lttb" keeps original samples; "minmax" returns one row per
+            time interval with clock, num, value_min, value_avg and value_max
+
+    Returns:
+        List[Dict[str, Any]]: Downsampled rows, ordered by item and clock
+
+    Raises:
+        ValueError: If the method is unknown or the values are not numeric
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}', use one of {DOWNSAMPLE_METHODS}")
+
+    result: List[Dict[str, Any]] = []
+    for itemid, series in _series(rows).items():
+        clocks = np.array([row["clock"] for row in series], dtype=np.int64)
+        try:
+            values = np.array([row["value"] for row in series], dtype=np.float64)
+        except ValueError as e:
+            raise ValueError("max_points only applies to numeric history") from e
+
+        if method == "lttb":
+            if len(series) <= max_points:
+                result.extend(series)
+                continue
+            x = clocks + np.array([row.get("ns", 0) for row in series], dtype=np.float64) / 1e9
+            result.extend(series[index] for index in lttb_indices(x, values, max_points))
+            continue
+
+        starts = bucket_bounds(clocks, max_points)
+        counts = np.diff(np.append(starts, len(series)))
+        result.extend(_bucket_rows(itemid, clocks[starts], counts,
+                                   np.minimum.reduceat(values, starts),
+                                   np.add.reduceat(values, starts) / counts,
+                                   np.maximum.reduceat(values, starts)))
+    return result
+
+
+def downsample_trends(rows: List[Dict[str, Any]], max_points: int,
+                      method: str = "lttb") -> List[Dict[str, Any]]:
+    """Downsample trend.get rows to at most max_points per item.
+
+    Args:
+        rows: trend.get rows
+        max_points: Maximum number of points per item
+        method: "lttb" keeps original hourly rows, chosen by value_avg;
+            "minmax" merges hours into intervals, keeping the lowest
+            value_min, the highest value_max and the num-weighted value_avg
+
+    Returns:
+        List[Dict[str, Any]]: Downsampled rows, ordered by item and clock
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}', use one of {DOWNSAMPLE_METHODS}")
+
+    result: List[Dict[str, Any]] = []
+    for itemid, series in _series(rows).items():
+        if len(series) <= max_points:
+            result.extend(series)
+            continue
+        clocks = np.array([row["clock"] for row in series], dtype=np.int64)
+        avg = np.array([row["value_avg"] for row in series], dtype=np.float64)
+
+        if method == "lttb":
+            indices = lttb_indices(clocks.astype(np.float64), avg, max_points)
+            result.extend(series[index] for index in indices)
+            continue
+
+        num = np.array([row["num"] for row in series], dtype=np.float64)
+        low = np.array([row["value_min"] for row in series], dtype=np.float64)
+        high = np.array([row["value_max"] for row in series], dtype=np.float64)
+        starts = bucket_bounds(clocks, max_points)
+        counts = np.diff(np.append(starts, len(series)))
+        total = np.add.reduceat(num, starts)
+        # Weight each hour's average by its number of values
+        mean = np.where(total > 0,
+                        np.add.reduceat(avg * num, starts) / np.maximum(total, 1),
+                        np.add.reduceat(avg, starts) / counts)
+        result.extend(_bucket_rows(itemid, clocks[starts], total.astype(np.int64),
+                                   np.minimum.reduceat(low, starts), mean,
+                                   np.maximum.reduceat(high, starts)))
+    return result
+
+
+def _bucket_rows(itemid: str, clocks: np.ndarray, counts: np.ndarray, low: np.ndarray,
+                 mean: np.ndarray, high: np.ndarray) -> List[Dict[str, Any]]:
+    return [
+        {
+            "itemid": itemid,
+            "clock": str(clock),
+            "num": str(count),
+            "value_min": f"{value_min:.4f}",
+            "value_avg": f"{value_avg:.4f}",
+            "value_max": f"{value_max:.4f}",
+        }
+        for clock, count, value_min, value_avg, value_max
+        in zip(clocks.tolist(), counts.tolist(), low.tolist(), mean.tolist(), high.tolist())
+    ]
@@ -0,0 +1,129 @@
+"""
+Host, trigger and tag enrichment for problems and events
+
+Problems and events only carry the ID of the trigger that raised them. To
+answer "which host has this problem" in one call, the problem and event tools
+can attach the host names, trigger description and priority. Events get hosts
+and tags straight from event.get (selectHosts/selectTags); problem.get has no
+selectHosts, so problems are joined against a local trigger ID index that
+only asks Zabbix about triggers it has not seen recently.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+# Seconds a trigger's description, priority and hosts are reused
+ENRICH_TTL = float(os.getenv("ZABBIX_ENRICH_TTL", "300"))
+
+# Write methods after which cached trigger details may be wrong
+STALE_AFTER = ("trigger.", "host.", "template.")
+
+# Fields added to enriched problems and events
+HOST_FIELDS = ["hostid", "name"]
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+class TriggerIndex:
+    """Trigger ID to description, priority and hosts, with a time-to-live.
+
+    Args:
+        ttl: Seconds an entry is reused before it is read again
+    """
+
+    def __init__(self, ttl: float = ENRICH_TTL):
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.expires: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def lookup(self, call: ApiCall, triggerids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the details of triggers, reading unknown ones with one trigger.get.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+            triggerids: Trigger IDs
+
+        Returns:
+            Dict[str, Dict[str, Any]]: description, priority and hosts per
+                trigger ID; unknown triggers are left out
+        """
+        now = time.monotonic()
+        wanted = list(dict.fromkeys(triggerids))
+        missing = [triggerid for triggerid in wanted if self.expires.get(triggerid, 0) <= now]
+        self.hits += len(wanted) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            if len(self.entries) > 4 * len(missing):
+                self._prune(now)
+            triggers = await call("trigger.get", {
+                "triggerids": missing,
+                "output": ["triggerid", "description", "priority"],
+                "selectHosts": HOST_FIELDS,
+                "expandDescription": True
+            })
+            for trigger in triggers:
+                self.entries[trigger["triggerid"]] = {
+                    "description": trigger["description"],
+                    "priority": trigger["priority"],
+                    "hosts": [{field: host.get(field) for field in HOST_FIELDS}
+                              for host in trigger.get("hosts", [])],
+                }
+                self.expires[trigger["triggerid"]] = now + self.ttl
+        return {triggerid: self.entries[triggerid] for triggerid in wanted
+                if triggerid in self.entries}
+
+    def invalidate_write(self, method: str) -> None:
+        """Forget all triggers after a write that can change their details.
+
+        Args:
+            method: Zabbix API method that was called
+        """
+        if method.startswith(STALE_AFTER) and not method.endswith(".get"):
+            self.entries.clear()
+            self.expires.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return index size and hit/miss counters.
+
+        Returns:
+            Dict[str, Any]: Index statistics
+        """
+        return {"triggers": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+    def _prune(self, now: float) -> None:
+        for triggerid in [t for t, expires in self.expires.items() if expires <= now]:
+            del self.expires[triggerid]
+            self.entries.pop(triggerid, None)
+
+
+async def enrich_problems(call: ApiCall, index: TriggerIndex,
+                          problems: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add hosts and trigger description and priority to problems.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        index: Trigger index to look the problems' triggers up in
+        problems: problem.get rows with objectid; they may be shared with
+            the cache and are not modified
+
+    Returns:
+        List[Dict[str, Any]]: Copies of the problems with hosts and trigger
+            added
+    """
+    triggers = await index.lookup(call, [problem["objectid"] for problem in problems
+                                         if "objectid" in problem])
+    enriched = []
+    for problem in problems:
+        trigger = triggers.get(problem.get("objectid"))
+        extra: Dict[str, Any] = {"hosts": trigger["hosts"] if trigger else []}
+        if trigger:
+            extra["trigger"] = {"description": trigger["description"],
+                                "priority": trigger["priority"]}
+        enriched.append(dict(problem, **extra))
+    return enriched
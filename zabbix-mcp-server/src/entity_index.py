@@ -0,0 +1,233 @@
+"""
+In-memory index of entity names for name-to-ID resolution
+
+Keeps the names of hosts, host groups and templates and the item keys of every
+host in dictionaries, so tools can accept "web01" or "web01:system.cpu.load"
+wherever they take IDs and resolve them without a lookup call. Hosts, groups
+and templates (IDs and names only) are reloaded on every refresh; item keys
+are refreshed for a slice of the hosts per refresh, and immediately for new
+hosts, so each background refresh costs a bounded number of rows. Names not
+in the index yet are looked up in Zabbix directly and added.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background refreshes (0 = no index, names are looked up on use)
+INDEX_REFRESH = float(os.getenv("ZABBIX_INDEX_REFRESH", "300"))
+
+# Hosts whose item keys are refreshed per background refresh
+INDEX_ITEM_HOSTS = int(os.getenv("ZABBIX_INDEX_ITEM_HOSTS", "500"))
+
+# Get method, ID field and name fields per entity kind
+KINDS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "host": ("host.get", "hostid", ("host", "name")),
+    "group": ("hostgroup.get", "groupid", ("name",)),
+    "template": ("template.get", "templateid", ("host", "name")),
+}
+
+# Separates the host name from the item key in an item reference
+ITEM_SEPARATOR = ":"
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+class EntityIndex:
+    """Name to ID maps of hosts, groups, templates and item keys.
+
+    Args:
+        refresh_interval: Seconds between background refreshes
+        item_hosts: Hosts whose item keys are refreshed per refresh
+    """
+
+    def __init__(self, refresh_interval: float = INDEX_REFRESH,
+                 item_hosts: int = INDEX_ITEM_HOSTS):
+        self.refresh_interval = refresh_interval
+        self.item_hosts = item_hosts
+        self.names: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        self.items: Dict[str, Dict[str, str]] = {}
+        self.item_position = 0
+        self.loaded = False
+        self.refreshes = 0
+        self.last_refresh_seconds = 0.0
+        self.last_refresh_rows = 0
+        self.total_refresh_seconds = 0.0
+        self.lookups = 0
+        self.misses = 0
+
+    async def run(self, call: ApiCall) -> None:
+        """Refresh the index until cancelled.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+        """
+        while True:
+            try:
+                await self.refresh(call)
+            except Exception as e:
+                logger.warning(f"Entity index refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def refresh(self, call: ApiCall) -> None:
+        """Reload host, group and template names and a slice of the item keys.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            call(method, {"output": [id_field, *fields]}, cache=False)
+            for method, id_field, fields in KINDS.values()))
+
+        rows = 0
+        for (kind, (_, id_field, fields)), entities in zip(KINDS.items(), results):
+            names: Dict[str, str] = {}
+            for entity in entities:
+                for field in fields:
+                    names[entity[field]] = entity[id_field]
+            self.names[kind] = names
+            rows += len(entities)
+
+        hostids = sorted({entity["hostid"] for entity in results[0]}, key=int)
+        current = set(hostids)
+        self.items = {hostid: keys for hostid, keys in self.items.items() if hostid in current}
+        new = [hostid for hostid in hostids if hostid not in self.items]
+        if self.loaded:
+            start = self.item_position % len(hostids) if hostids else 0
+            due = (hostids[start:] + hostids[:start])[:self.item_hosts]
+            self.item_position = start + len(due)
+        else:
+            due = []
+        rows += await self._load_items(call, list(dict.fromkeys(new + due)))
+
+        elapsed = time.perf_counter() - started
+        self.loaded = True
+        self.refreshes += 1
+        self.last_refresh_seconds = elapsed
+        self.last_refresh_rows = rows
+        self.total_refresh_seconds += elapsed
+
+    async def resolve(self, call: ApiCall, kind: str, values: List[str]) -> List[str]:
+        """Replace names among IDs with the IDs they refer to.
+
+        Values made of digits are taken as IDs. Hosts and templates match by
+        technical or visible name; items are given as "host:key", with the
+        host's name or ID.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+            kind: "host", "group", "template" or "item"
+            values: IDs and names
+
+        Returns:
+            List[str]: IDs, in the order of the values
+
+        Raises:
+            ValueError: If a name matches nothing in Zabbix
+        """
+        values = [str(value) for value in values]
+        names = [value for value in values if not value.isdigit()]
+        self.lookups += len(names)
+        found = self._lookup_items(names) if kind == "item" else {
+            name: self.names[kind][name] for name in names if name in self.names[kind]}
+
+        missing = [name for name in names if name not in found]
+        if missing:
+            self.misses += len(missing)
+            if kind == "item":
+                found.update(await self._fetch_items(call, missing))
+            else:
+                found.update(await self._fetch_names(call, kind, missing))
+        unknown = [name for name in names if name not in found]
+        if unknown:
+            raise ValueError(f"Unknown {kind} name(s): {', '.join(unknown)}")
+        return [found.get(value, value) for value in values]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return index size and refresh cost.
+
+        Returns:
+            Dict[str, Any]: Entries per kind, approximate memory use, and the
+                duration and rows of the refreshes
+        """
+        items = sum(len(keys) for keys in self.items.values())
+        return {
+            "hosts": len(set(self.names["host"].values())),
+            "groups": len(self.names["group"]),
+            "templates": len(set(self.names["template"].values())),
+            "item_keys": items,
+            "approx_bytes": self._approx_bytes(),
+            "refreshes": self.refreshes,
+            "refresh_interval": self.refresh_interval,
+            "last_refresh_seconds": round(self.last_refresh_seconds, 3),
+            "last_refresh_rows": self.last_refresh_rows,
+            "total_refresh_seconds": round(self.total_refresh_seconds, 3),
+            "lookups": self.lookups,
+            "misses": self.misses,
+        }
+
+    def _lookup_items(self, references: List[str]) -> Dict[str, str]:
+        found = {}
+        for reference in references:
+            host, _, key = reference.partition(ITEM_SEPARATOR)
+            hostid = host if host.isdigit() else self.names["host"].get(host, "")
+            itemid = self.items.get(hostid, {}).get(key)
+            if itemid:
+                found[reference] = itemid
+        return found
+
+    async def _load_items(self, call: ApiCall, hostids: List[str]) -> int:
+        if not hostids:
+            return 0
+        batches = [hostids[start:start + self.item_hosts]
+                   for start in range(0, len(hostids), self.item_hosts)]
+        results = await asyncio.gather(*(
+            call("item.get", {"hostids": batch, "output": ["itemid", "hostid", "key_"]}, cache=False)
+            for batch in batches))
+        rows = 0
+        for batch, items in zip(batches, results):
+            keys: Dict[str, Dict[str, str]] = {hostid: {} for hostid in batch}
+            for item in items:
+                keys.setdefault(item["hostid"], {})[item["key_"]] = item["itemid"]
+            self.items.update(keys)
+            rows += len(items)
+        return rows
+
+    async def _fetch_names(self, call: ApiCall, kind: str, names: List[str]) -> Dict[str, str]:
+        method, id_field, fields = KINDS[kind]
+        results = await asyncio.gather(*(
+            call(method, {"output": [id_field, *fields], "filter": {field: names}})
+            for field in fields))
+        found = {}
+        for entities in results:
+            for entity in entities:
+                for field in fields:
+                    self.names[kind][entity[field]] = entity[id_field]
+                    if entity[field] in names:
+                        found[entity[field]] = entity[id_field]
+        return found
+
+    async def _fetch_items(self, call: ApiCall, references: List[str]) -> Dict[str, str]:
+        split = [reference.partition(ITEM_SEPARATOR) for reference in references]
+        hosts = [host for host, separator, key in split if separator and key]
+        hostids = await self.resolve(call, "host", list(dict.fromkeys(hosts))) if hosts else []
+        await self._load_items(call, list(dict.fromkeys(hostids)))
+        return self._lookup_items(references)
+
+    def _approx_bytes(self) -> int:
+        size = sum(sys.getsizeof(names) for names in self.names.values()) + sys.getsizeof(self.items)
+        for names in self.names.values():
+            size += sum(sys.getsizeof(name) + sys.getsizeof(entity) for name, entity in names.items())
+        for keys in self.items.values():
+            size += sys.getsizeof(keys)
+            size += sum(sys.getsizeof(key) + sys.getsizeof(itemid) for key, itemid in keys.items())
+        return size
@@ -0,0 +1,158 @@
+"""
+Time-sliced, concurrent fetching of long event ranges
+
+An event.get over weeks of a busy instance can run into the HTTP timeout and
+returns one huge payload. Slicing splits the range into consecutive time
+slices, fetches a bounded number of them concurrently and yields each slice's
+events in clock order as soon as every earlier slice is done. A slice that
+fails is retried as two halves, which are cheaper for Zabbix to answer; a
+slice that still fails is reported instead of failing the whole range.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from history_stream import split_windows
+
+logger = logging.getLogger(__name__)
+
+# Seconds of events fetched per slice
+EVENT_SLICE = int(os.getenv("ZABBIX_EVENT_SLICE", "86400"))
+
+# Slices fetched concurrently
+EVENT_CONCURRENCY = int(os.getenv("ZABBIX_EVENT_CONCURRENCY", "4"))
+
+# Times a failed slice is retried, halving it each time
+EVENT_RETRIES = int(os.getenv("ZABBIX_EVENT_RETRIES", "2"))
+
+# Seconds waited before the first retry; doubled for each further one
+RETRY_DELAY = 0.5
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def event_key(event: Dict[str, Any]) -> Tuple[int, int, int]:
+    """Return the ordering key of an event.
+
+    Args:
+        event: event.get row
+
+    Returns:
+        Tuple[int, int, int]: Clock, nanoseconds and event ID
+    """
+    return int(event.get("clock", 0)), int(event.get("ns", 0)), int(event["eventid"])
+
+
+class Slice:
+    """Events of one time slice, and the parts of it that could not be read.
+
+    Args:
+        time_from: Start of the slice (Unix timestamp)
+        time_till: End of the slice (Unix timestamp)
+    """
+
+    def __init__(self, time_from: int, time_till: int):
+        self.time_from = time_from
+        self.time_till = time_till
+        self.events: List[Dict[str, Any]] = []
+        self.failed: List[Dict[str, Any]] = []
+        self.retries = 0
+
+
+async def fetch_slice(call: ApiCall, params: Dict[str, Any], window: Tuple[int, int],
+                      retries: int = EVENT_RETRIES, cache: bool = True) -> Slice:
+    """Fetch the events of one slice, retrying failures on halves of it.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        params: event.get parameters without time_from/time_till
+        window: (time_from, time_till) of the slice
+        retries: Times a failed part is split and retried
+        cache: Use cached results when available
+
+    Returns:
+        Slice: Events ordered by clock, with the parts that failed after
+            all retries
+    """
+    result = Slice(*window)
+
+    async def fetch(start: int, end: int, attempt: int) -> None:
+        try:
+            rows = await call("event.get", dict(params, time_from=start, time_till=end), cache=cache)
+            result.events.extend(rows)
+        except Exception as e:
+            if attempt >= retries:
+                logger.warning(f"Event slice {start}-{end} failed: {e}")
+                result.failed.append({"time_from": start, "time_till": end, "error": str(e)})
+                return
+            result.retries += 1
+            await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+            middle = start + (end - start) // 2
+            await fetch(start, middle, attempt + 1)
+            if middle < end:
+                await fetch(middle + 1, end, attempt + 1)
+
+    await fetch(window[0], window[1], 0)
+    result.events.sort(key=event_key)
+    return result
+
+
+async def stream_events(call: ApiCall, params: Dict[str, Any],
+                        windows: List[Tuple[int, int]],
+                        concurrency: int = EVENT_CONCURRENCY,
+                        retries: int = EVENT_RETRIES,
+                        cache: bool = True) -> AsyncIterator[Slice]:
+    """Fetch events slice by slice and yield the slices in order.
+
+    At most `concurrency` slices are fetched or buffered at a time.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        params: event.get parameters without time_from/time_till
+        windows: Slices from slice_range(), oldest first
+        concurrency: Maximum number of slices fetched at once
+        retries: Times a failed part of a slice is split and retried
+        cache: Use cached results when available
+
+    Yields:
+        Slice: The next slice, with its events ordered by clock
+    """
+    def fetch(window: Tuple[int, int]) -> asyncio.Task:
+        return asyncio.ensure_future(fetch_slice(call, params, window, retries, cache))
+
+    pending = iter(windows)
+    in_flight: deque = deque()
+    try:
+        for window in pending:
+            in_flight.append(fetch(window))
+            if len(in_flight) >= max(concurrency, 1):
+                break
+
+        while in_flight:
+            result = await in_flight.popleft()
+            next_window = next(pending, None)
+            if next_window is not None:
+                in_flight.append(fetch(next_window))
+            yield result
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+def slice_range(time_from: int, time_till: int) -> List[Tuple[int, int]]:
+    """Split an event range into slices of EVENT_SLICE seconds.
+
+    Args:
+        time_from: Start of the range (Unix timestamp)
+        time_till: End of the range (Unix timestamp)
+
+    Returns:
+        List[Tuple[int, int]]: (time_from, time_till) of each slice, oldest first
+    """
+    return split_windows(time_from, time_till, EVENT_SLICE)
@@ -0,0 +1,93 @@
+"""
+Curated default output fields for the Zabbix get tools
+
+output="extend" returns every column of every object, while most questions
+need a handful of them. The get tools request the fields listed here unless
+the caller names its own fields or opts into the full objects.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+from typing import Dict, List, Optional, Union
+
+# "lean" requests the curated fields by default; "full" restores output=extend
+DEFAULT_OUTPUT = os.getenv("ZABBIX_DEFAULT_OUTPUT", "lean").lower()
+
+# Output values that request every field
+FULL_OUTPUT = ("extend", "full")
+
+# Primary key of the objects returned by each get method
+ID_FIELDS: Dict[str, str] = {
+    "host.get": "hostid",
+    "hostgroup.get": "groupid",
+    "item.get": "itemid",
+    "trigger.get": "triggerid",
+    "template.get": "templateid",
+    "problem.get": "eventid",
+    "event.get": "eventid",
+    "maintenance.get": "maintenanceid",
+    "graph.get": "graphid",
+    "discoveryrule.get": "itemid",
+    "itemprototype.get": "itemid",
+}
+
+# Fields returned by default. Methods without an entry return all fields.
+DEFAULT_FIELDS: Dict[str, List[str]] = {
+    "host.get": ["hostid", "host", "name", "status", "maintenance_status"],
+    "hostgroup.get": ["groupid", "name"],
+    "item.get": ["itemid", "hostid", "name", "key_", "value_type", "units",
+                 "lastvalue", "lastclock", "state", "status"],
+    "trigger.get": ["triggerid", "description", "priority", "value", "status",
+                    "state", "lastchange"],
+    "template.get": ["templateid", "host", "name"],
+    "problem.get": ["eventid", "objectid", "name", "severity", "clock",
+                    "acknowledged", "suppressed", "r_eventid"],
+    "event.get": ["eventid", "source", "object", "objectid", "name", "severity",
+                  "clock", "value", "acknowledged", "r_eventid"],
+    "maintenance.get": ["maintenanceid", "name", "maintenance_type",
+                        "active_since", "active_till"],
+    "graph.get": ["graphid", "name", "graphtype"],
+    "discoveryrule.get": ["itemid", "hostid", "name", "key_", "status", "state"],
+    "itemprototype.get": ["itemid", "hostid", "name", "key_", "value_type",
+                          "units", "status"],
+}
+
+
+def resolve_output(method: str, output: Optional[str] = None,
+                   fields: Optional[List[str]] = None) -> Union[str, List[str]]:
+    """Work out the output parameter for a get request.
+
+    Explicit fields win over output; with neither, the method's curated
+    default fields are used. The primary key is always included so results
+    can be followed up with ID-based calls.
+
+    Args:
+        method: Zabbix API method name
+        output: "extend"/"full" for all fields, another Zabbix output value,
+            or a comma-separated field list
+        fields: Fields to return; ["full"] returns all fields
+
+    Returns:
+        Union[str, List[str]]: Value for the output parameter
+    """
+    if not fields and output:
+        if output.lower() in FULL_OUTPUT:
+            return "extend"
+        if "," not in output:
+            return output
+        fields = output.split(",")
+
+    if fields:
+        fields = [field.strip() for field in fields if field.strip()]
+        if any(field.lower() in FULL_OUTPUT for field in fields):
+            return "extend"
+        id_field = ID_FIELDS.get(method)
+        if id_field and id_field not in fields:
+            fields.insert(0, id_field)
+        return fields
+
+    if DEFAULT_OUTPUT in FULL_OUTPUT or method not in DEFAULT_FIELDS:
+        return "extend"
+    return list(DEFAULT_FIELDS[method])
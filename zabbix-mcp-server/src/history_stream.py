@@ -0,0 +1,153 @@
+"""
+Windowed, concurrent fetching of long history ranges
+
+A history.get over a long range makes Zabbix build, and the server hold, the
+whole series before the first row can be returned. Streaming splits the range
+into fixed-length time windows, fetches a bounded number of them concurrently
+and yields each window's rows in order as soon as every earlier window is
+done, so memory and time to first row depend on the window length rather than
+the range length.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# Seconds of history fetched per window
+STREAM_WINDOW = int(os.getenv("ZABBIX_HISTORY_WINDOW", "3600"))
+
+# Windows fetched concurrently
+STREAM_CONCURRENCY = int(os.getenv("ZABBIX_HISTORY_CONCURRENCY", "4"))
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def split_windows(time_from: int, time_till: int, window: int = STREAM_WINDOW,
+                  descending: bool = False) -> List[Tuple[int, int]]:
+    """Split a time range into consecutive, non-overlapping windows.
+
+    history.get treats time_from and time_till as inclusive, so each window
+    ends one second before the next one starts.
+
+    Args:
+        time_from: Start of the range (Unix timestamp)
+        time_till: End of the range (Unix timestamp)
+        window: Length of each window in seconds
+        descending: Return the newest window first
+
+    Returns:
+        List[Tuple[int, int]]: (time_from, time_till) of each window
+    """
+    windows = []
+    start = time_from
+    while start <= time_till:
+        end = min(start + window - 1, time_till)
+        windows.append((start, end))
+        start = end + 1
+    if descending:
+        windows.reverse()
+    return windows
+
+
+def row_key(row: Dict[str, Any]) -> Tuple[int, int, int]:
+    """Return the ordering and identity key of a history row.
+
+    Args:
+        row: history.get row
+
+    Returns:
+        Tuple[int, int, int]: Clock, nanoseconds and item ID
+    """
+    return int(row["clock"]), int(row.get("ns", 0)), int(row["itemid"])
+
+
+async def stream_history(call: ApiCall, params: Dict[str, Any],
+                         windows: List[Tuple[int, int]],
+                         concurrency: int = STREAM_CONCURRENCY,
+                         descending: bool = False,
+                         cache: bool = True) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Fetch history window by window and yield each window's rows in order.
+
+    At most `concurrency` windows are fetched or buffered at a time. Rows are
+    sorted by clock within each window, and rows already yielded (the same
+    item, clock and nanoseconds) are dropped.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        params: history.get parameters without time_from/time_till
+        windows: Windows from split_windows(), in the order to yield them
+        concurrency: Maximum number of windows fetched at once
+        descending: Sort rows newest first
+        cache: Use cached results when available
+
+    Yields:
+        List[Dict[str, Any]]: Rows of the next window, possibly empty
+    """
+    def fetch(window: Tuple[int, int]) -> asyncio.Task:
+        window_params = dict(params, time_from=window[0], time_till=window[1])
+        return asyncio.ensure_future(call("history.get", window_params, cache=cache))
+
+    pending = iter(windows)
+    in_flight: deque = deque()
+    boundary: Set[Tuple[int, int, int]] = set()
+    try:
+        for window in pending:
+            in_flight.append(fetch(window))
+            if len(in_flight) >= max(concurrency, 1):
+                break
+
+        while in_flight:
+            rows = await in_flight.popleft()
+            next_window = next(pending, None)
+            if next_window is not None:
+                in_flight.append(fetch(next_window))
+
+            keyed = sorted(((row_key(row), row) for row in rows),
+                           key=lambda pair: pair[0], reverse=descending)
+            seen = set(boundary)
+            chunk = []
+            for key, row in keyed:
+                if key not in seen:
+                    seen.add(key)
+                    chunk.append(row)
+            if keyed:
+                # Rows at the window edge are the only ones a neighbour can repeat
+                edge = keyed[-1][0][0]
+                boundary = {key for key, _ in keyed if key[0] == edge}
+            yield chunk
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def collect_history(call: ApiCall, params: Dict[str, Any],
+                          windows: List[Tuple[int, int]],
+                          limit: Optional[int] = None,
+                          descending: bool = False,
+                          cache: bool = True) -> List[Dict[str, Any]]:
+    """Fetch history window by window and return all rows in order.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        params: history.get parameters without time_from/time_till
+        windows: Windows from split_windows()
+        limit: Maximum number of rows
+        descending: Sort rows newest first
+        cache: Use cached results when available
+
+    Returns:
+        List[Dict[str, Any]]: History rows
+    """
+    result: List[Dict[str, Any]] = []
+    async with aclosing(stream_history(call, params, windows, descending=descending,
+                                       cache=cache)) as chunks:
+        async for chunk in chunks:
+            result.extend(chunk)
+            if limit and len(result) >= limit:
+                return result[:limit]
+    return result
@@ -0,0 +1,215 @@
+"""
+Keyset pagination with opaque cursors for the Zabbix get tools
+
+Pages are ordered by the object's primary ID and each page starts after the
+last ID of the previous one, so walking a large result never needs an offset
+and never holds more than one page of full objects.
+
+event.get supports this natively through eventid_from. host.get, item.get and
+trigger.get have no ID range filter, so the matching IDs are read once on the
+first page (output limited to the ID, sorted by Zabbix) and kept in memory as
+a snapshot whose key travels in the cursor; each page fetches its objects by
+ID from the snapshot. Only a cursor whose snapshot has been evicted reads the
+IDs again.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import json
+import time
+import base64
+import bisect
+import hashlib
+import secrets
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from field_sets import ID_FIELDS
+from response_cache import cache_key
+
+# Methods whose get call accepts a lower bound on the primary ID
+ID_FROM_PARAMS = {"event.get": "eventid_from"}
+
+# Params that shape the output rather than select objects
+OUTPUT_PARAMS = ("output", "limit", "sortfield", "sortorder")
+
+# Number of ID snapshots kept for paginated queries
+PAGE_SNAPSHOTS = int(os.getenv("ZABBIX_PAGE_SNAPSHOTS", "64"))
+
+# Seconds an ID snapshot is kept after its last page was read
+PAGE_SNAPSHOT_TTL = float(os.getenv("ZABBIX_PAGE_SNAPSHOT_TTL", "1800"))
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def query_fingerprint(method: str, params: Dict[str, Any]) -> str:
+    """Identify the set of objects a query selects.
+
+    Args:
+        method: Zabbix API method name
+        params: Parameters of the query
+
+    Returns:
+        str: Short digest that is equal for queries selecting the same objects
+    """
+    query = {key: value for key, value in params.items() if key not in OUTPUT_PARAMS}
+    return hashlib.sha1(cache_key(method, query).encode("utf-8")).hexdigest()[:16]
+
+
+class IdSnapshots:
+    """Sorted ID lists of paginated queries, kept while their pages are read.
+
+    Snapshots are evicted least recently used first, and once they have not
+    been used for ttl seconds.
+
+    Args:
+        max_entries: Number of snapshots kept
+        ttl: Seconds a snapshot is kept after its last use
+    """
+
+    def __init__(self, max_entries: int = PAGE_SNAPSHOTS, ttl: float = PAGE_SNAPSHOT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, List[int]]]" = OrderedDict()
+
+    def add(self, ids: List[int]) -> str:
+        """Keep an ID list and return its key."""
+        key = secrets.token_hex(8)
+        self.entries[key] = (time.monotonic(), ids)
+        while len(self.entries) > max(self.max_entries, 0):
+            self.entries.popitem(last=False)
+        return key
+
+    def get(self, key: Optional[str]) -> Optional[List[int]]:
+        """Return the ID list kept under key, or None if it was evicted."""
+        entry = self.entries.get(key) if key else None
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries[key] = (time.monotonic(), entry[1])
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def discard(self, key: Optional[str]) -> None:
+        """Drop the ID list kept under key."""
+        self.entries.pop(key, None)
+
+
+# ID snapshots shared by all paginated queries
+id_snapshots = IdSnapshots()
+
+
+def encode_cursor(method: str, params: Dict[str, Any], after: int, page_size: int,
+                  snapshot: Optional[str] = None) -> str:
+    """Build the cursor for the page following the given ID.
+
+    Args:
+        method: Zabbix API method name
+        params: Parameters of the query
+        after: Last ID of the current page
+        page_size: Objects per page
+        snapshot: Key of the query's ID snapshot, if it has one
+
+    Returns:
+        str: Opaque cursor token
+    """
+    state = {"m": method, "q": query_fingerprint(method, params), "a": after, "n": page_size}
+    if snapshot:
+        state["s"] = snapshot
+    return base64.urlsafe_b64encode(json.dumps(state).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, method: str, params: Dict[str, Any]) -> Tuple[int, int, Optional[str]]:
+    """Read a cursor and check it belongs to the query.
+
+    Args:
+        cursor: Cursor from a previous page
+        method: Zabbix API method name
+        params: Parameters of the query
+
+    Returns:
+        Tuple[int, int, Optional[str]]: Last ID of the previous page, the page
+            size and the key of the query's ID snapshot
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another query
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        after, page_size = int(state["a"]), int(state["n"])
+        snapshot = state.get("s")
+        issued_for = (state["m"], state["q"])
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if issued_for != (method, query_fingerprint(method, params)):
+        raise ValueError("Pagination cursor was issued for a different query")
+    return after, page_size, snapshot if isinstance(snapshot, str) else None
+
+
+async def fetch_page(call: ApiCall, method: str, params: Dict[str, Any],
+                     page_size: Optional[int] = None, cursor: Optional[str] = None,
+                     cache: bool = True) -> Dict[str, Any]:
+    """Fetch one page of a get query in primary ID order.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        method: Zabbix API method name
+        params: Parameters of the query; limit is ignored
+        page_size: Objects per page; defaults to the size the cursor was issued with
+        cursor: Cursor from the previous page, or None for the first page
+        cache: Use cached results when available
+
+    Returns:
+        Dict[str, Any]: The page under "result" and the cursor for the next
+            page under "next_cursor" (None on the last page)
+
+    Raises:
+        ValueError: If no page size is given or the cursor is invalid
+    """
+    after = snapshot = None
+    if cursor:
+        after, cursor_page_size, snapshot = decode_cursor(cursor, method, params)
+        page_size = page_size or cursor_page_size
+    if not page_size or page_size < 1:
+        raise ValueError("page_size must be a positive number")
+
+    id_field = ID_FIELDS[method]
+    query = {key: value for key, value in params.items() if key != "limit"}
+    query.update(sortfield=id_field, sortorder="ASC")
+
+    if method in ID_FROM_PARAMS:
+        if after is not None:
+            query[ID_FROM_PARAMS[method]] = str(after + 1)
+        rows = await call(method, dict(query, limit=page_size + 1), cache=cache)
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        last_id = rows[-1][id_field] if rows else None
+    else:
+        ids = id_snapshots.get(snapshot)
+        if ids is None:
+            rows = await call(method, dict(query, output=[id_field]), cache=cache)
+            ids = [int(row[id_field]) for row in rows]
+            snapshot = id_snapshots.add(ids)
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(ids, after)
+        page_ids = [str(objectid) for objectid in ids[start:start + page_size]]
+        more = start + page_size < len(ids)
+        if not more:
+            id_snapshots.discard(snapshot)
+            snapshot = None
+        last_id = page_ids[-1] if page_ids else None
+        rows = []
+        if page_ids:
+            query[id_field + "s"] = page_ids
+            rows = await call(method, query, cache=cache)
+
+    next_cursor = None
+    if more and last_id is not None:
+        next_cursor = encode_cursor(method, params, int(last_id), page_size, snapshot)
+    return {"result": rows, "next_cursor": next_cursor}
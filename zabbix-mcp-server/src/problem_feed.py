@@ -0,0 +1,145 @@
+"""
+Incremental problem feed with server-side snapshots
+
+A polling client passes back the cursor of its previous poll and receives only
+the problems created, resolved or updated since then. The server keeps a
+small snapshot per cursor (event ID, acknowledged flag and severity of each
+open problem), so a poll asks Zabbix for just those three fields of the open
+problems, and fetches full objects only for the new ones.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import secrets
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pagination import query_fingerprint
+
+# Snapshots kept for cursors; the least recently used ones are dropped first
+FEED_SNAPSHOTS = int(os.getenv("ZABBIX_FEED_SNAPSHOTS", "256"))
+
+# Fields compared between polls
+STATE_FIELDS = ["eventid", "acknowledged", "severity"]
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+class Snapshot:
+    """Open problems of one query as seen by one poll.
+
+    Args:
+        query: Fingerprint of the query the snapshot belongs to
+        state: (acknowledged, severity) per open problem's event ID
+    """
+
+    def __init__(self, query: str, state: Dict[str, Tuple[str, str]]):
+        self.query = query
+        self.state = state
+
+
+class ProblemFeed:
+    """Computes problem changes between polls from stored snapshots.
+
+    Args:
+        max_snapshots: Number of cursors that can be resumed
+    """
+
+    def __init__(self, max_snapshots: int = FEED_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self.polls = 0
+        self.resets = 0
+        self.created = 0
+        self.resolved = 0
+        self.updated = 0
+
+    async def changes(self, call: ApiCall, params: Dict[str, Any],
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Return the changes of a problem.get query since a cursor.
+
+        Without a cursor, or with one whose snapshot is no longer kept, all
+        open problems are returned as created and "reset" is true.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+            params: problem.get parameters; output selects the fields of
+                created problems, limit and recent are ignored
+            cursor: Cursor of the previous poll
+
+        Returns:
+            Dict[str, Any]: created (full problems), resolved (event IDs with
+                the recovery event when still known), updated (event ID,
+                acknowledged and severity of problems where these changed),
+                the cursor for the next poll and whether the feed was reset
+
+        Raises:
+            ValueError: If the cursor was issued for a different query
+        """
+        query = {key: value for key, value in params.items() if key not in ("limit", "recent")}
+        # select* options only shape the created problems, not which problems are tracked
+        tracked = {key: value for key, value in query.items() if not key.startswith("select")}
+        fingerprint = query_fingerprint("problem.get", tracked)
+        previous = self.snapshots.get(cursor) if cursor else None
+        if previous is not None and previous.query != fingerprint:
+            raise ValueError("Problem feed cursor was issued for a different query")
+
+        rows = await call("problem.get", dict(tracked, output=STATE_FIELDS), cache=False)
+        state = {row["eventid"]: (row["acknowledged"], row["severity"]) for row in rows}
+        known = previous.state if previous is not None else {}
+
+        new_ids = [eventid for eventid in state if eventid not in known]
+        gone_ids = [eventid for eventid in known if eventid not in state]
+        created: List[Dict[str, Any]] = []
+        if new_ids:
+            created = await call("problem.get", dict(query, eventids=new_ids), cache=False)
+        resolved = [{"eventid": eventid} for eventid in gone_ids]
+        if gone_ids:
+            # Recently resolved problems are still returned with recent=true
+            recovered = await call("problem.get", {
+                "eventids": gone_ids, "recent": True,
+                "output": ["eventid", "r_eventid", "r_clock"]}, cache=False)
+            recovery = {row["eventid"]: row for row in recovered if row.get("r_eventid", "0") != "0"}
+            resolved = [recovery.get(eventid, {"eventid": eventid}) for eventid in gone_ids]
+        updated = [
+            {"eventid": eventid, "acknowledged": flags[0], "severity": flags[1]}
+            for eventid, flags in state.items()
+            if eventid in known and known[eventid] != flags
+        ]
+
+        next_cursor = secrets.token_urlsafe(12)
+        self.snapshots[next_cursor] = Snapshot(fingerprint, state)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+
+        self.polls += 1
+        self.resets += previous is None
+        self.created += len(created)
+        self.resolved += len(resolved)
+        self.updated += len(updated)
+        return {
+            "created": created,
+            "resolved": resolved,
+            "updated": updated,
+            "cursor": next_cursor,
+            "reset": previous is None,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return feed counters.
+
+        Returns:
+            Dict[str, Any]: Kept snapshots and totals of polls and changes
+        """
+        return {
+            "snapshots": len(self.snapshots),
+            "max_snapshots": self.max_snapshots,
+            "open_problems_tracked": sum(len(s.state) for s in self.snapshots.values()),
+            "polls": self.polls,
+            "resets": self.resets,
+            "created": self.created,
+            "resolved": self.resolved,
+            "updated": self.updated,
+        }
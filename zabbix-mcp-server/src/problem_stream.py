@@ -0,0 +1,184 @@
+"""
+Shared problem change stream for subscribed clients
+
+One poller reads problem changes from Zabbix through the problem feed and fans
+every change out to all listeners: MCP sessions subscribed to the problems
+resource and clients of the server-sent events endpoint. The poller only runs
+while somebody listens, and the Zabbix query rate is one feed poll per
+interval however many clients are connected.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from problem_feed import ProblemFeed
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of Zabbix while there are listeners
+STREAM_POLL = float(os.getenv("ZABBIX_PROBLEM_POLL", "30"))
+
+# Changes buffered per listener queue; the oldest are dropped when a client falls behind
+STREAM_QUEUE = 100
+
+ApiCall = Callable[..., Awaitable[Any]]
+Listener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class ProblemStream:
+    """Polls problem changes once and delivers them to every listener.
+
+    Args:
+        feed: Problem feed computing the changes between polls
+        poll_interval: Seconds between polls
+    """
+
+    def __init__(self, feed: ProblemFeed, poll_interval: float = STREAM_POLL):
+        self.feed = feed
+        self.poll_interval = poll_interval
+        self.listeners: Dict[Any, Listener] = {}
+        self.problems: Dict[str, Dict[str, Any]] = {}
+        self.cursor: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.call: Optional[ApiCall] = None
+        self.polls = 0
+        self.events = 0
+        self.deliveries = 0
+        self.dropped = 0
+
+    def add_listener(self, key: Any, listener: Listener, call: ApiCall) -> None:
+        """Register a coroutine function to receive every change event.
+
+        Args:
+            key: Identifies the listener for remove_listener(), e.g. a session
+            listener: Called with each event; a listener that raises is removed
+            call: Coroutine function sending the API call, like call_api()
+        """
+        self.listeners[key] = listener
+        self.call = call
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def remove_listener(self, key: Any) -> None:
+        """Unregister a listener; the poller stops after the last one.
+
+        Args:
+            key: Key the listener was added with
+        """
+        self.listeners.pop(key, None)
+        if not self.listeners and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def close(self) -> None:
+        """Stop the poller and drop all listeners."""
+        self.listeners.clear()
+        task, self.task = self.task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def subscribe(self, call: ApiCall) -> "asyncio.Queue[Dict[str, Any]]":
+        """Return a queue receiving every change event.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+
+        Returns:
+            asyncio.Queue: Queue of events; pass it to unsubscribe() when done
+        """
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(STREAM_QUEUE)
+
+        async def deliver(event: Dict[str, Any]) -> None:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+        self.add_listener(queue, deliver, call)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+        """Stop delivering events to a queue from subscribe().
+
+        Args:
+            queue: The subscribed queue
+        """
+        self.remove_listener(queue)
+
+    def current(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the open problems as of the last poll.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Open problems, or None when the
+                poller is not running
+        """
+        if self.cursor is None or self.task is None:
+            return None
+        return list(self.problems.values())
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        self.cursor = None
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning(f"Problem stream poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self) -> None:
+        """Read the changes since the last poll and deliver them."""
+        changes = await self.feed.changes(self.call, {"output": "extend"}, self.cursor)
+        self.cursor = changes["cursor"]
+        self.polls += 1
+
+        if changes["reset"]:
+            self.problems = {problem["eventid"]: problem for problem in changes["created"]}
+            event = {"type": "snapshot", "clock": int(time.time()),
+                     "problems": list(self.problems.values())}
+        else:
+            for problem in changes["created"]:
+                self.problems[problem["eventid"]] = problem
+            for problem in changes["resolved"]:
+                self.problems.pop(problem["eventid"], None)
+            for update in changes["updated"]:
+                if update["eventid"] in self.problems:
+                    self.problems[update["eventid"]] = dict(self.problems[update["eventid"]], **update)
+            if not (changes["created"] or changes["resolved"] or changes["updated"]):
+                return
+            event = {"type": "changes", "clock": int(time.time()),
+                     "created": changes["created"], "resolved": changes["resolved"],
+                     "updated": changes["updated"]}
+
+        self.events += 1
+        for key, listener in list(self.listeners.items()):
+            try:
+                await listener(event)
+                self.deliveries += 1
+            except Exception as e:
+                logger.info(f"Removing problem stream listener after error: {e}")
+                self.remove_listener(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return stream counters.
+
+        Returns:
+            Dict[str, Any]: Listeners, polls and delivered events
+        """
+        return {
+            "listeners": len(self.listeners),
+            "running": self.task is not None and not self.task.done(),
+            "poll_interval": self.poll_interval,
+            "open_problems": len(self.problems),
+            "polls": self.polls,
+            "events": self.events,
+            "deliveries": self.deliveries,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,244 @@
+"""
+Problem counts by severity, acknowledgement, host group, host and tag
+
+Questions like "how many high problems per host group" only need a small table
+of counts, not the problems themselves. Where Zabbix can filter by the
+dimension, each row of the table is one problem.get with countOutput, and all
+rows are counted concurrently: severities, acknowledgement state and host
+groups when there are not too many of them. Hosts and tags cannot be counted
+that way without a query per host or tag, so the open problems are read once
+with only the fields needed and counted locally, with hosts taken from the
+trigger index used for enrichment.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from enrichment import TriggerIndex
+
+# Most count queries run for one dimension; larger ones are counted locally
+SUMMARY_COUNT_QUERIES = int(os.getenv("ZABBIX_SUMMARY_COUNT_QUERIES", "50"))
+
+# Dimensions problems can be counted by
+SUMMARY_DIMENSIONS = ("severity", "acknowledged", "group", "host", "tag")
+
+# Names of the problem severities
+SEVERITY_NAMES = ["not classified", "information", "warning", "average", "high", "disaster"]
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+async def count_problems(call: ApiCall, params: Dict[str, Any],
+                         filters: Dict[str, Dict[str, Any]],
+                         cache: bool = True) -> Dict[str, int]:
+    """Count problems for several filters concurrently with countOutput.
+
+    A row's filter narrows the shared filters and never replaces them: list
+    filters are intersected, and a row that contradicts a shared filter
+    (acknowledged problems when only unacknowledged ones were asked for,
+    say) is 0 without a query.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        params: problem.get filters shared by all counts
+        filters: Extra filters per row name
+        cache: Use cached results when available
+
+    Returns:
+        Dict[str, int]: Number of problems per row name
+    """
+    queries = {}
+    for name, extra in filters.items():
+        combined = narrow(params, extra)
+        if combined is not None:
+            queries[name] = combined
+    counts = await asyncio.gather(*(
+        call("problem.get", dict(query, countOutput=True), cache=cache)
+        for query in queries.values()))
+    found = {name: int(count) for name, count in zip(queries, counts)}
+    return {name: found.get(name, 0) for name in filters}
+
+
+def narrow(params: Dict[str, Any], extra: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Combine filters so that both apply.
+
+    Args:
+        params: problem.get filters
+        extra: Further filters
+
+    Returns:
+        Optional[Dict[str, Any]]: The combined filters, or None if no
+            problem can match both
+    """
+    combined = dict(params)
+    for key, value in extra.items():
+        if key not in params:
+            combined[key] = value
+        elif isinstance(value, list):
+            wanted = {str(v) for v in params[key]}
+            value = [v for v in value if str(v) in wanted]
+            if not value:
+                return None
+            combined[key] = value
+        elif value != params[key]:
+            return None
+    return combined
+
+
+async def summarize_problems(call: ApiCall, index: TriggerIndex, params: Dict[str, Any],
+                             by: List[str], tag: Optional[str] = None,
+                             cache: bool = True) -> Dict[str, Any]:
+    """Count problems by one or more dimensions.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        index: Trigger index giving the hosts of the problems' triggers
+        params: problem.get filters
+        by: Dimensions from SUMMARY_DIMENSIONS
+        tag: With "tag", count the values of this tag instead of tag names
+        cache: Use cached results when available
+
+    Returns:
+        Dict[str, Any]: Total number of problems, and per dimension the rows
+            of the table (largest count first) and whether they were counted
+            by Zabbix or locally
+
+    Raises:
+        ValueError: If a dimension is unknown
+    """
+    unknown = [dimension for dimension in by if dimension not in SUMMARY_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown summary dimension(s): {', '.join(unknown)}; "
+                         f"use {', '.join(SUMMARY_DIMENSIONS)}")
+
+    problems: Optional[asyncio.Future] = None
+
+    def local_problems() -> asyncio.Future:
+        # Read the problems at most once, however many dimensions need them
+        nonlocal problems
+        if problems is None:
+            fields = dict(params, output=["eventid", "objectid"])
+            if "tag" in by:
+                fields["selectTags"] = ["tag", "value"]
+            problems = asyncio.ensure_future(call("problem.get", fields, cache=cache))
+        return problems
+
+    async def summarize(dimension: str) -> Dict[str, Any]:
+        if dimension == "severity":
+            wanted = [int(s) for s in params.get("severities") or range(len(SEVERITY_NAMES))]
+            counts = await count_problems(call, params, {
+                SEVERITY_NAMES[s]: {"severities": [s]} for s in wanted}, cache)
+            return table("count", [{"severity": name, "count": count}
+                                   for name, count in counts.items()])
+        if dimension == "acknowledged":
+            counts = await count_problems(call, params, {
+                "acknowledged": {"acknowledged": True},
+                "unacknowledged": {"acknowledged": False}}, cache)
+            return table("count", [{"state": name, "count": count}
+                                   for name, count in counts.items()])
+        if dimension == "group":
+            return await summarize_groups(call, index, params, local_problems, cache)
+        if dimension == "host":
+            hosts = await problem_hosts(call, index, await local_problems())
+            tally: Counter = Counter()
+            names = {}
+            for ids in hosts:
+                tally.update(ids.keys())
+                names.update(ids)
+            return table("local", [{"hostid": hostid, "host": names[hostid], "count": count}
+                                   for hostid, count in tally.items()])
+        tally = Counter()
+        for problem in await local_problems():
+            if tag is None:
+                tally.update({t["tag"] for t in problem.get("tags", [])})
+            else:
+                tally.update({t["value"] for t in problem.get("tags", []) if t["tag"] == tag})
+        key = "value" if tag is not None else "tag"
+        return table("local", [{key: name, "count": count} for name, count in tally.items()])
+
+    total, *tables = await asyncio.gather(
+        call("problem.get", dict(params, countOutput=True), cache=cache),
+        *(summarize(dimension) for dimension in by))
+    return {"total": int(total), "by": dict(zip(by, tables))}
+
+
+async def summarize_groups(call: ApiCall, index: TriggerIndex, params: Dict[str, Any],
+                           local_problems: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                           cache: bool = True) -> Dict[str, Any]:
+    """Count problems per host group, with a problem counted in each of its groups.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        index: Trigger index giving the hosts of the problems' triggers
+        params: problem.get filters
+        local_problems: Returns the problems (eventid, objectid) for counting
+            locally when there are too many groups for count queries
+        cache: Use cached results when available
+
+    Returns:
+        Dict[str, Any]: Table of groupid, group and count
+    """
+    group_params: Dict[str, Any] = {"output": ["groupid", "name"]}
+    if params.get("groupids"):
+        group_params["groupids"] = params["groupids"]
+    if params.get("hostids"):
+        group_params["hostids"] = params["hostids"]
+    groups = await call("hostgroup.get", group_params, cache=cache)
+    names = {group["groupid"]: group["name"] for group in groups}
+
+    if len(groups) <= SUMMARY_COUNT_QUERIES:
+        counts = await count_problems(call, params, {
+            groupid: {"groupids": [groupid]} for groupid in names}, cache)
+        return table("count", [{"groupid": groupid, "group": names[groupid], "count": count}
+                               for groupid, count in counts.items()])
+
+    hosts = await problem_hosts(call, index, await local_problems())
+    hostids = sorted({hostid for ids in hosts for hostid in ids}, key=int)
+    members = await call("hostgroup.get", dict(group_params, hostids=hostids,
+                                               selectHosts=["hostid"]), cache=cache) if hostids else []
+    groups_of: Dict[str, Set[str]] = {}
+    for group in members:
+        for host in group.get("hosts", []):
+            groups_of.setdefault(host["hostid"], set()).add(group["groupid"])
+    tally: Counter = Counter()
+    for ids in hosts:
+        tally.update(set().union(*(groups_of.get(hostid, set()) for hostid in ids)))
+    return table("local", [{"groupid": groupid, "group": names[groupid], "count": count}
+                           for groupid, count in tally.items() if groupid in names])
+
+
+async def problem_hosts(call: ApiCall, index: TriggerIndex,
+                        problems: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Return the hosts of each problem's trigger.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        index: Trigger index to look the triggers up in
+        problems: problem.get rows with objectid
+
+    Returns:
+        List[Dict[str, str]]: Host name per host ID, for each problem
+    """
+    triggers = await index.lookup(call, [problem["objectid"] for problem in problems])
+    return [{host["hostid"]: host["name"] for host in triggers.get(problem["objectid"], {}).get("hosts", [])}
+            for problem in problems]
+
+
+def table(method: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return rows with a count, largest first, and how they were counted.
+
+    Args:
+        method: "count" for Zabbix countOutput queries, "local" for counting
+            read problems
+        rows: Rows with a "count" field
+
+    Returns:
+        Dict[str, Any]: method and the rows with a non-zero count
+    """
+    rows = sorted((row for row in rows if row["count"]), key=lambda row: -row["count"])
+    return {"method": method, "rows": rows}
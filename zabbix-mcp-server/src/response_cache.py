@@ -0,0 +1,552 @@
+"""
+Read-through TTL cache for Zabbix API read methods
+
+Results of *.get calls are cached under the method name plus normalized
+parameters, with a time-to-live chosen per method and least-recently-used
+eviction bounded by the total size of the cached results. Successful write
+calls invalidate only the cached reads they can affect, using the entity IDs
+of the write and the ID filters of each cached read.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set, Tuple
+from serialization import dumps
+
+# Time-to-live in seconds per read method. Catalog data changes rarely and is
+# kept long; problems and events change constantly and are kept for seconds.
+DEFAULT_TTLS: Dict[str, float] = {
+    "apiinfo.version": 3600,
+    "hostgroup.get": 600,
+    "template.get": 600,
+    "usermacro.get": 300,
+    "user.get": 300,
+    "graph.get": 300,
+    "discoveryrule.get": 300,
+    "itemprototype.get": 300,
+    "trend.get": 300,
+    "maintenance.get": 120,
+    "host.get": 60,
+    "item.get": 30,
+    "trigger.get": 30,
+    "history.get": 10,
+    "event.get": 10,
+    "problem.get": 5,
+}
+
+# Time-to-live for read methods without an entry above
+DEFAULT_TTL = float(os.getenv("ZABBIX_CACHE_DEFAULT_TTL", "30"))
+
+# Upper bound for the total size of cached results (0 = cache disabled)
+MAX_BYTES = int(os.getenv("ZABBIX_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Rows serialized to estimate the size of a longer result
+SIZE_SAMPLE = 32
+
+# Read methods that are never cached
+UNCACHED_METHODS = ("configuration.export",)
+
+# Read methods whose names do not end in ".get"
+OTHER_READ_METHODS = ("apiinfo.version", "configuration.export")
+
+# Read methods affected by each write method. For every affected read method,
+# the mapping pairs an ID filter parameter of the read with the kind of IDs
+# touched by the write that it is compared against: a cached read is kept
+# only if one of its ID filters proves that it cannot include a touched
+# entity. An empty mapping drops every cached result of the read method.
+HOST_SCOPE = {"hostids": "hostids", "groupids": "groupids", "templateids": "templateids"}
+INVALIDATION_MAP: Dict[str, Dict[str, Dict[str, str]]] = {
+    "host.create": {
+        "host.get": HOST_SCOPE,
+        "hostgroup.get": {"groupids": "groupids"},
+    },
+    "host.update": {
+        "host.get": HOST_SCOPE,
+        "item.get": {"hostids": "hostids"},
+        "trigger.get": {"hostids": "hostids"},
+        "problem.get": {"hostids": "hostids"},
+    },
+    "host.delete": {
+        "host.get": HOST_SCOPE,
+        "hostgroup.get": {},
+        "item.get": {"hostids": "hostids"},
+        "trigger.get": {"hostids": "hostids"},
+        "graph.get": {"hostids": "hostids"},
+        "discoveryrule.get": {"hostids": "hostids"},
+        "itemprototype.get": {"hostids": "hostids"},
+        "usermacro.get": {"hostids": "hostids"},
+        "maintenance.get": {"hostids": "hostids"},
+        "problem.get": {"hostids": "hostids"},
+        "event.get": {"hostids": "hostids"},
+    },
+    "hostgroup.create": {
+        "hostgroup.get": {"groupids": "groupids"},
+    },
+    "hostgroup.update": {
+        "hostgroup.get": {"groupids": "groupids"},
+    },
+    "hostgroup.delete": {
+        "hostgroup.get": {"groupids": "groupids"},
+        "host.get": {"groupids": "groupids"},
+        "template.get": {"groupids": "groupids"},
+        "maintenance.get": {"groupids": "groupids"},
+    },
+    "item.create": {
+        "item.get": {"itemids": "itemids", "hostids": "hostids"},
+    },
+    "item.update": {
+        "item.get": {"itemids": "itemids"},
+    },
+    "item.delete": {
+        "item.get": {"itemids": "itemids"},
+        "trigger.get": {},
+        "graph.get": {},
+        "history.get": {"itemids": "itemids"},
+        "trend.get": {"itemids": "itemids"},
+    },
+    "trigger.create": {
+        "trigger.get": {"triggerids": "triggerids"},
+    },
+    "trigger.update": {
+        "trigger.get": {"triggerids": "triggerids"},
+        "problem.get": {"objectids": "triggerids"},
+        "event.get": {"objectids": "triggerids"},
+    },
+    "trigger.delete": {
+        "trigger.get": {"triggerids": "triggerids"},
+        "problem.get": {"objectids": "triggerids"},
+        "event.get": {"objectids": "triggerids"},
+    },
+    "template.create": {
+        "template.get": {"templateids": "templateids", "groupids": "groupids"},
+    },
+    "template.update": {
+        "template.get": {"templateids": "templateids"},
+        "host.get": {"templateids": "templateids"},
+    },
+    "template.delete": {
+        "template.get": {"templateids": "templateids"},
+        "host.get": {"templateids": "templateids"},
+        "item.get": {"templateids": "templateids", "hostids": "templateids"},
+        "trigger.get": {"templateids": "templateids", "hostids": "templateids"},
+        "graph.get": {"templateids": "templateids", "hostids": "templateids"},
+        "discoveryrule.get": {"templateids": "templateids", "hostids": "templateids"},
+        "itemprototype.get": {"hostids": "templateids"},
+        "usermacro.get": {"hostids": "templateids"},
+    },
+    "maintenance.create": {
+        "maintenance.get": {"maintenanceids": "maintenanceids"},
+        "host.get": {"hostids": "hostids", "groupids": "groupids"},
+        "problem.get": {"hostids": "hostids", "groupids": "groupids"},
+    },
+    "maintenance.update": {
+        "maintenance.get": {"maintenanceids": "maintenanceids"},
+        "host.get": {},
+        "problem.get": {},
+    },
+    "maintenance.delete": {
+        "maintenance.get": {"maintenanceids": "maintenanceids"},
+        "host.get": {},
+        "problem.get": {},
+    },
+    "user.create": {
+        "user.get": {"userids": "userids"},
+    },
+    "user.update": {
+        "user.get": {"userids": "userids"},
+    },
+    "user.delete": {
+        "user.get": {"userids": "userids"},
+    },
+    "event.acknowledge": {
+        "problem.get": {"eventids": "eventids"},
+        "event.get": {"eventids": "eventids"},
+    },
+}
+
+# An import can create or change any configuration object, so it drops every
+# cached read except monitoring data
+CONFIGURATION_IMPORT_KEEPS = ("apiinfo.version", "history.get", "trend.get",
+                              "problem.get", "event.get")
+
+# Parameters of write calls that carry entity IDs, and the kind of ID they hold
+WRITE_ID_PARAMS = {
+    "hostid": "hostids",
+    "groupid": "groupids",
+    "itemid": "itemids",
+    "triggerid": "triggerids",
+    "templateid": "templateids",
+    "maintenanceid": "maintenanceids",
+    "userid": "userids",
+}
+
+# Kind of ID passed as a plain list to each object's delete method
+DELETE_ID_KINDS = {
+    "host": "hostids",
+    "hostgroup": "groupids",
+    "item": "itemids",
+    "trigger": "triggerids",
+    "template": "templateids",
+    "maintenance": "maintenanceids",
+    "user": "userids",
+}
+
+
+def is_read_method(method: str) -> bool:
+    """Check whether a Zabbix API method only reads data.
+
+    Args:
+        method: Zabbix API method name
+
+    Returns:
+        bool: True for read methods such as "host.get"
+    """
+    return method.endswith(".get") or method in OTHER_READ_METHODS
+
+
+def load_ttls() -> Dict[str, float]:
+    """Build the per-method TTL policy.
+
+    Defaults can be overridden with ZABBIX_CACHE_TTLS, a comma separated list
+    of method=seconds pairs (e.g. "host.get=120,problem.get=0"). A TTL of 0
+    disables caching for that method.
+
+    Returns:
+        Dict[str, float]: TTL in seconds per method
+    """
+    ttls = dict(DEFAULT_TTLS)
+    for pair in os.getenv("ZABBIX_CACHE_TTLS", "").split(","):
+        method, _, seconds = pair.partition("=")
+        if method.strip() and seconds.strip():
+            ttls[method.strip()] = float(seconds)
+    return ttls
+
+
+def normalize_params(params: Any) -> Any:
+    """Normalize API parameters so equivalent requests share a cache key.
+
+    Empty values are dropped and ID lists are de-duplicated and sorted, since
+    Zabbix ignores their order.
+
+    Args:
+        params: Parameters of a Zabbix API call
+
+    Returns:
+        Any: Normalized parameters
+    """
+    if isinstance(params, dict):
+        normalized = {}
+        for key, value in params.items():
+            if value is None or value == [] or value == {}:
+                continue
+            if key.endswith("ids") and isinstance(value, list):
+                value = sorted({str(item) for item in value})
+            normalized[key] = normalize_params(value)
+        return normalized
+    if isinstance(params, list):
+        return [normalize_params(item) for item in params]
+    return params
+
+
+def id_filters(params: Any) -> Dict[str, Set[str]]:
+    """Extract the ID filters of read parameters.
+
+    Args:
+        params: Parameters of a Zabbix API read call
+
+    Returns:
+        Dict[str, Set[str]]: IDs per filter parameter (e.g. "hostids")
+    """
+    if not isinstance(params, dict):
+        return {}
+    return {
+        key: {str(item) for item in value}
+        for key, value in params.items()
+        if key.endswith("ids") and isinstance(value, list) and value
+    }
+
+
+def touched_ids(method: str, params: Any, result: Any) -> Dict[str, Set[str]]:
+    """Collect the entity IDs touched by a successful write call.
+
+    IDs come from the write result (e.g. {"hostids": [...]}), from the list
+    passed to delete methods and from ID parameters such as "hostid",
+    "groups" or "templates".
+
+    Args:
+        method: Zabbix API write method name
+        params: Parameters of the write call
+        result: Result of the write call
+
+    Returns:
+        Dict[str, Set[str]]: Touched IDs per kind (e.g. "hostids")
+    """
+    touched: Dict[str, Set[str]] = {}
+
+    def add(kind: str, values: Any) -> None:
+        if not isinstance(values, list):
+            values = [values]
+        touched.setdefault(kind, set()).update(str(value) for value in values if value is not None)
+
+    if isinstance(result, dict):
+        for kind, values in result.items():
+            if kind.endswith("ids"):
+                add(kind, values)
+
+    api_object = method.partition(".")[0]
+    if isinstance(params, list):
+        if api_object in DELETE_ID_KINDS:
+            add(DELETE_ID_KINDS[api_object], params)
+        return touched
+
+    for key, value in (params or {}).items():
+        if key in WRITE_ID_PARAMS:
+            add(WRITE_ID_PARAMS[key], value)
+        elif key.endswith("ids") and isinstance(value, list):
+            add(key, value)
+        elif key in ("groups", "templates") and isinstance(value, list):
+            id_key = key[:-1] + "id"
+            add(key[:-1] + "ids", [entry.get(id_key) for entry in value if isinstance(entry, dict)])
+    return touched
+
+
+def cache_key(method: str, params: Any) -> str:
+    """Build the cache key for a Zabbix API call.
+
+    Args:
+        method: Zabbix API method name
+        params: Parameters of the call
+
+    Returns:
+        str: Cache key
+    """
+    normalized = json.dumps(normalize_params(params or {}), sort_keys=True,
+                            separators=(",", ":"), default=str)
+    return f"{method}:{normalized}"
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the serialized size of a result.
+
+    Results of get calls are lists of similar objects, so a long list is sized
+    from evenly spaced rows instead of serializing all of it a second time.
+
+    Args:
+        value: API call result
+
+    Returns:
+        int: Approximate size of the result as compact JSON
+    """
+    if isinstance(value, list) and len(value) > SIZE_SAMPLE:
+        step = len(value) / SIZE_SAMPLE
+        sample = [value[int(i * step)] for i in range(SIZE_SAMPLE)]
+        return len(value) * len(dumps(sample, pretty=False)) // SIZE_SAMPLE
+    return len(dumps(value, pretty=False))
+
+
+class CacheEntry(NamedTuple):
+    """A cached result with its expiry time, size and ID filters."""
+
+    expires_at: float
+    size: int
+    method: str
+    value: Any
+    id_filters: Dict[str, Set[str]]
+
+
+class ResponseCache:
+    """Size-bounded LRU cache with per-method TTLs.
+
+    Cached results are shared between callers and must not be modified.
+
+    Args:
+        max_bytes: Upper bound for the total size of cached results
+        ttls: TTL in seconds per method
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, ttls: Optional[Dict[str, float]] = None):
+        self.max_bytes = max_bytes
+        self.ttls = load_ttls() if ttls is None else ttls
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.keys_by_method: Dict[str, Set[str]] = {}
+        self.generations: Dict[str, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.method_hits: Dict[str, int] = {}
+        self.method_misses: Dict[str, int] = {}
+
+    def ttl(self, method: str) -> float:
+        """Return the TTL for a method, or 0 if it is not cacheable.
+
+        Args:
+            method: Zabbix API method name
+
+        Returns:
+            float: TTL in seconds
+        """
+        if self.max_bytes <= 0 or method in UNCACHED_METHODS:
+            return 0
+        if method in self.ttls:
+            return self.ttls[method]
+        return DEFAULT_TTL if method.endswith(".get") else 0
+
+    def get(self, method: str, key: str) -> Tuple[bool, Any]:
+        """Look up a cached result.
+
+        Args:
+            method: Zabbix API method name
+            key: Cache key from cache_key()
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found, and the cached result
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            self.method_misses[method] = self.method_misses.get(method, 0) + 1
+            return False, None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.method_hits[method] = self.method_hits.get(method, 0) + 1
+        return True, entry.value
+
+    def generation(self, method: str) -> int:
+        """Return the invalidation generation of a read method.
+
+        Args:
+            method: Zabbix API method name
+
+        Returns:
+            int: Counter incremented whenever a write invalidates the method
+        """
+        return self.generations.get(method, 0)
+
+    def put(self, method: str, key: str, value: Any, params: Any = None,
+            generation: Optional[int] = None) -> None:
+        """Store a result, evicting least recently used entries to make room.
+
+        Args:
+            method: Zabbix API method name
+            key: Cache key from cache_key()
+            value: Result to cache
+            params: Parameters of the read, used for targeted invalidation
+            generation: Value of generation() before the read was sent; the
+                result is discarded if a write invalidated the method since
+        """
+        if generation is not None and generation != self.generation(method):
+            return
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self._remove(key)
+        while self.entries and self.bytes + size > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+        self.entries[key] = CacheEntry(time.monotonic() + self.ttl(method), size, method,
+                                       value, id_filters(normalize_params(params)))
+        self.keys_by_method.setdefault(method, set()).add(key)
+        self.bytes += size
+
+    def invalidate(self, method: str, touched: Dict[str, Set[str]],
+                   scope: Dict[str, str]) -> int:
+        """Drop cached results of a read method that may include touched IDs.
+
+        Args:
+            method: Zabbix API read method name
+            touched: Touched IDs per kind, from touched_ids()
+            scope: Read ID filter parameter -> kind of touched IDs it is
+                compared against; empty to drop every result of the method
+
+        Returns:
+            int: Number of dropped entries
+        """
+        self.generations[method] = self.generation(method) + 1
+        dropped = 0
+        for key in list(self.keys_by_method.get(method, ())):
+            filters = self.entries[key].id_filters
+            unaffected = any(
+                param in filters and kind in touched and not filters[param] & touched[kind]
+                for param, kind in scope.items()
+            )
+            if not unaffected:
+                self._remove(key)
+                dropped += 1
+        self.invalidations += dropped
+        return dropped
+
+    def invalidate_write(self, method: str, params: Any, result: Any) -> int:
+        """Invalidate the cached reads affected by a successful write call.
+
+        Args:
+            method: Zabbix API write method name
+            params: Parameters of the write call
+            result: Result of the write call
+
+        Returns:
+            int: Number of dropped entries
+        """
+        if method == "configuration.import":
+            return sum(self.invalidate(read, {}, {}) for read in list(self.keys_by_method)
+                       if read not in CONFIGURATION_IMPORT_KEEPS)
+
+        touched = touched_ids(method, params, result)
+        return sum(self.invalidate(read, touched, scope)
+                   for read, scope in INVALIDATION_MAP.get(method, {}).items())
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self.entries.clear()
+        self.keys_by_method.clear()
+        self.bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cache usage and hit/miss/eviction counters.
+
+        Returns:
+            Dict[str, Any]: Cache statistics
+        """
+        lookups = self.hits + self.misses
+        methods = sorted(set(self.method_hits) | set(self.method_misses))
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "methods": {
+                method: {
+                    "ttl": self.ttl(method),
+                    "hits": self.method_hits.get(method, 0),
+                    "misses": self.method_misses.get(method, 0),
+                }
+                for method in methods
+            },
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.keys_by_method[entry.method].discard(key)
+        self.bytes -= entry.size
@@ -0,0 +1,122 @@
+"""
+Resolution-aware routing between history and trends
+
+Long numeric ranges are much cheaper to answer from trends, Zabbix's hourly
+min/avg/max rollups, than from raw history. When the requested resolution is
+an hour or coarser, completed hours are read from trend.get and only the
+recent, not yet rolled up tail from history.get.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Length of the period each trend row summarizes
+TREND_INTERVAL = 3600
+
+# Without max_points, ranges longer than this many seconds are read from trends
+AUTO_HISTORY_RANGE = int(os.getenv("ZABBIX_AUTO_HISTORY_RANGE", str(2 * 86400)))
+
+ApiCall = Callable[..., Awaitable[Any]]
+
+
+def choose_source(time_from: int, time_till: int, max_points: Optional[int] = None,
+                  history: int = 0) -> Tuple[str, Optional[int]]:
+    """Decide where to read a numeric range from.
+
+    Trends are used when each requested point spans at least an hour (or,
+    without max_points, when the range is longer than AUTO_HISTORY_RANGE).
+    They cover whole hours up to the last full hour of the range; the rest
+    comes from history.
+
+    Args:
+        time_from: Start of the range (Unix timestamp)
+        time_till: End of the range (Unix timestamp)
+        max_points: Desired number of points per item
+        history: History type; only 0 (float) and 3 (unsigned) have trends
+
+    Returns:
+        Tuple[str, Optional[int]]: "history", "trends" or "trends+history",
+            and the time from which history is used with trends
+    """
+    if history not in (0, 3):
+        return "history", None
+
+    span = time_till - time_from
+    coarse = span / max_points >= TREND_INTERVAL if max_points else span > AUTO_HISTORY_RANGE
+    boundary = (time_till + 1) // TREND_INTERVAL * TREND_INTERVAL
+    if not coarse or boundary <= time_from:
+        return "history", None
+    if boundary > time_till:
+        return "trends", None
+    return "trends+history", boundary
+
+
+def trend_as_history(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Present a trend row like a history row, valued at its hourly average.
+
+    Args:
+        row: trend.get row
+
+    Returns:
+        Dict[str, Any]: Row with itemid, clock and value, plus the hour's
+            value_min, value_max and num
+    """
+    return {
+        "itemid": row["itemid"],
+        "clock": row["clock"],
+        "value": row["value_avg"],
+        "value_min": row["value_min"],
+        "value_max": row["value_max"],
+        "num": row["num"],
+    }
+
+
+async def fetch_routed(call: ApiCall, itemids: List[str], time_from: int, time_till: int,
+                       max_points: Optional[int] = None, history: int = 0,
+                       cache: bool = True) -> Dict[str, Any]:
+    """Read a range from history, trends, or both, as choose_source() decides.
+
+    Args:
+        call: Coroutine function sending the API call, like call_api()
+        itemids: Items to read
+        time_from: Start of the range (Unix timestamp)
+        time_till: End of the range (Unix timestamp)
+        max_points: Desired number of points per item
+        history: History type
+        cache: Use cached results when available
+
+    Returns:
+        Dict[str, Any]: The source used, the time history starts at when
+            trends and history are combined, and the rows ordered by clock
+    """
+    source, boundary = choose_source(time_from, time_till, max_points, history)
+    history_params = {"itemids": itemids, "history": history,
+                      "sortfield": "clock", "sortorder": "ASC"}
+
+    if source == "history":
+        rows = await call("history.get", dict(history_params, time_from=time_from,
+                                              time_till=time_till), cache=cache)
+    else:
+        trends_till = boundary - 1 if boundary else time_till
+        requests = [call("trend.get", {"itemids": itemids, "time_from": time_from,
+                                       "time_till": trends_till}, cache=cache)]
+        if boundary:
+            requests.append(call("history.get", dict(history_params, time_from=boundary,
+                                                     time_till=time_till), cache=cache))
+        results = await asyncio.gather(*requests)
+        rows = [trend_as_history(row) for row in results[0]]
+        if boundary:
+            rows.extend(results[1])
+        rows.sort(key=lambda row: int(row["clock"]))
+
+    return {
+        "source": source,
+        "history_from": boundary,
+        "time_from": time_from,
+        "time_till": time_till,
+        "result": rows,
+    }
@@ -0,0 +1,112 @@
+"""
+Pluggable JSON serializers for MCP tool responses
+
+Tool results are compact JSON by default. When orjson is installed it is used
+as a faster drop-in encoder; indented output is available as an opt-in for
+humans reading raw responses.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import json
+import logging
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Serializer name: "auto" picks orjson when installed, else "json"
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto").lower()
+
+# Indent responses for readability instead of emitting compact JSON
+PRETTY_RESPONSES = os.getenv("RESPONSE_FORMAT", "compact").lower() == "pretty"
+
+Serializer = Callable[[Any, bool], str]
+
+
+def dumps_json(data: Any, pretty: bool = False) -> str:
+    """Serialize with the standard library encoder.
+
+    Args:
+        data: Data to serialize
+        pretty: Indent the output
+
+    Returns:
+        str: JSON string
+    """
+    if pretty:
+        return json.dumps(data, indent=2, default=str, ensure_ascii=False)
+    return json.dumps(data, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+def dumps_orjson(data: Any, pretty: bool = False) -> str:
+    """Serialize with orjson, falling back to the standard library.
+
+    orjson rejects a few inputs the standard encoder accepts (integers
+    beyond 64 bits, for example); those are retried with dumps_json().
+
+    Args:
+        data: Data to serialize
+        pretty: Indent the output
+
+    Returns:
+        str: JSON string
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(data, default=str, option=option).decode("utf-8")
+    except TypeError:
+        return dumps_json(data, pretty)
+
+
+SERIALIZERS: Dict[str, Serializer] = {"json": dumps_json}
+if orjson is not None:
+    SERIALIZERS["orjson"] = dumps_orjson
+
+
+def register_serializer(name: str, serializer: Serializer) -> None:
+    """Make a serializer selectable through JSON_ENCODER.
+
+    Args:
+        name: Serializer name
+        serializer: Function taking the data and a pretty flag, returning JSON
+    """
+    SERIALIZERS[name] = serializer
+
+
+def get_serializer(name: str = JSON_ENCODER) -> Serializer:
+    """Return a serializer by name.
+
+    Args:
+        name: Serializer name, or "auto" for the fastest one available
+
+    Returns:
+        Serializer: The serializer, or dumps_json() if the name is unknown
+    """
+    if name == "auto":
+        name = "orjson" if "orjson" in SERIALIZERS else "json"
+    if name not in SERIALIZERS:
+        logger.warning(f"Unknown JSON encoder '{name}', using the standard library")
+        name = "json"
+    return SERIALIZERS[name]
+
+
+def dumps(data: Any, pretty: bool = PRETTY_RESPONSES) -> str:
+    """Serialize data with the configured serializer.
+
+    Args:
+        data: Data to serialize
+        pretty: Indent the output (defaults to RESPONSE_FORMAT=pretty)
+
+    Returns:
+        str: JSON string
+    """
+    return get_serializer()(data, pretty)
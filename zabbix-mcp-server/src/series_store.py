@@ -0,0 +1,414 @@
+"""
+Local on-disk store of numeric history for delta fetching
+
+Keeps the numeric history already read from Zabbix in one memory-mapped NumPy
+file per item and value type, together with the time intervals it covers. A
+history_get for an overlapping range then only requests the missing parts
+(typically the new tail) from Zabbix and reads the rest from local disk.
+
+Only values older than SETTLE_SECONDS are considered final; more recent values
+are always read from Zabbix, since late values (buffered by a proxy or an
+active agent, say) can still arrive for them.
+
+Each Zabbix instance and user gets its own subdirectory, so history of one
+instance is never served for another, and one server process at a time owns a
+subdirectory; other processes read from Zabbix directly.
+
+Author: Zabbix MCP Server Contributors
+License: MIT
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Directory holding a subdirectory of series files per Zabbix instance
+STORE_DIR = os.getenv("ZABBIX_SERIES_CACHE_DIR",
+                      os.path.join(tempfile.gettempdir(), "zabbix-mcp-series"))
+
+# Disk budget in bytes (0 = store disabled)
+STORE_MAX_BYTES = int(os.getenv("ZABBIX_SERIES_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Series not read for this many seconds are removed
+STORE_MAX_AGE = float(os.getenv("ZABBIX_SERIES_CACHE_MAX_AGE", str(7 * 86400)))
+
+# Values younger than this many seconds are not stored, since late values can still arrive
+SETTLE_SECONDS = int(os.getenv("ZABBIX_SERIES_CACHE_SETTLE", "600"))
+
+# Record layout per value type: 0 = numeric float, 3 = numeric unsigned. Values
+# are kept as the strings Zabbix returned, so stored rows read back exactly as
+# live ones (Zabbix formats floats differently across versions)
+DTYPES = {
+    0: np.dtype([("clock", "<i8"), ("ns", "<i4"), ("value", "S32")]),
+    3: np.dtype([("clock", "<i8"), ("ns", "<i4"), ("value", "S32")]),
+}
+
+# Version of the record layout; series stored with another one are dropped
+STORE_FORMAT = 2
+
+ApiCall = Callable[..., Awaitable[Any]]
+Interval = Tuple[int, int]
+
+
+def subtract_intervals(time_from: int, time_till: int,
+                       covered: List[Interval]) -> List[Interval]:
+    """Return the parts of a range that are not covered.
+
+    Args:
+        time_from: Start of the range (inclusive)
+        time_till: End of the range (inclusive)
+        covered: Sorted, non-overlapping covered intervals (inclusive)
+
+    Returns:
+        List[Interval]: Uncovered intervals, in order
+    """
+    gaps = []
+    start = time_from
+    for low, high in covered:
+        if high < start:
+            continue
+        if low > time_till:
+            break
+        if low > start:
+            gaps.append((start, low - 1))
+        start = max(start, high + 1)
+    if start <= time_till:
+        gaps.append((start, time_till))
+    return gaps
+
+
+def merge_intervals(covered: List[Interval], interval: Interval) -> List[Interval]:
+    """Add an interval to a sorted list of intervals, joining adjacent ones.
+
+    Args:
+        covered: Sorted, non-overlapping intervals (inclusive)
+        interval: Interval to add
+
+    Returns:
+        List[Interval]: Sorted, non-overlapping intervals
+    """
+    merged: List[Interval] = []
+    for low, high in sorted(covered + [interval]):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+class SeriesStore:
+    """Per-item numeric history on local disk with covered-interval tracking.
+
+    The store is unused until bind() names the Zabbix instance it holds
+    history of.
+
+    Args:
+        directory: Directory for the per-instance series files and their index
+        max_bytes: Disk budget; least recently read series are evicted first
+        max_age: Seconds after which an unread series is evicted
+        settle: Seconds after which a value is considered final
+    """
+
+    def __init__(self, directory: str = STORE_DIR, max_bytes: int = STORE_MAX_BYTES,
+                 max_age: float = STORE_MAX_AGE, settle: int = SETTLE_SECONDS):
+        self.root = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.settle = settle
+        self.directory: Optional[str] = None
+        self.owner: Optional[bool] = None
+        self.lock_file: Optional[Any] = None
+        self.index: Optional[Dict[str, Dict[str, Any]]] = None
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.dirty = False
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.rows_fetched = 0
+        self.rows_served = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the store is in use."""
+        return self.max_bytes > 0
+
+    def bind(self, url: str, principal: str) -> None:
+        """Use the subdirectory of a Zabbix instance and the identity reading it.
+
+        Args:
+            url: Zabbix API URL
+            principal: User name, or another value identifying the credentials,
+                since users may be allowed to see different hosts
+        """
+        instance = hashlib.sha256(f"{url}\n{principal}".encode("utf-8")).hexdigest()[:16]
+        directory = os.path.join(self.root, instance)
+        if directory == self.directory:
+            return
+        self.close()
+        self.directory = directory
+
+    def close(self) -> None:
+        """Save the index and give up the subdirectory for other processes."""
+        if self.owner:
+            self._save_index()
+        if self.lock_file is not None:
+            self.lock_file.close()
+        self.lock_file = None
+        self.owner = None
+        self.index = None
+        self.locks = {}
+
+    def supports(self, itemids: List[str], history: int) -> bool:
+        """Whether history of these items can be served from the store.
+
+        Args:
+            itemids: Items to read
+            history: History type
+
+        Returns:
+            bool: True for numeric history of plain numeric item IDs, once
+                the store is bound to an instance whose subdirectory this
+                process owns
+        """
+        return (self.enabled and history in DTYPES
+                and all(str(itemid).isdigit() for itemid in itemids)
+                and self._claim())
+
+    async def fetch(self, call: ApiCall, itemids: List[str], history: int,
+                    time_from: int, time_till: int) -> List[Dict[str, Any]]:
+        """Return history for a range, fetching only what is not stored.
+
+        Args:
+            call: Coroutine function sending the API call, like call_api()
+            itemids: Items to read
+            history: History type, 0 or 3
+            time_from: Start of the range (Unix timestamp)
+            time_till: End of the range (Unix timestamp)
+
+        Returns:
+            List[Dict[str, Any]]: history.get rows ordered by clock
+        """
+        settled = int(time.time()) - self.settle
+        # Items needing the same gaps are fetched with one history.get
+        by_gaps: Dict[Tuple[Interval, ...], List[str]] = {}
+        reads = []
+        for itemid in itemids:
+            covered = self._covered(itemid, history)
+            gaps = subtract_intervals(time_from, time_till, covered)
+            by_gaps.setdefault(tuple(gaps), []).append(itemid)
+            if not gaps:
+                self.hits += 1
+            elif gaps == [(time_from, time_till)]:
+                self.misses += 1
+            else:
+                self.partial_hits += 1
+            # Read exactly the covered parts, so stored and fetched rows never overlap
+            parts = [(max(low, time_from), min(high, time_till)) for low, high in covered
+                     if low <= time_till and high >= time_from]
+            if parts:
+                entry = self._load_index()[self._key(itemid, history)]
+                entry["accessed"] = time.time()
+                reads.append((itemid, self._path(self._key(itemid, history)), parts))
+
+        result: List[Dict[str, Any]] = await asyncio.to_thread(self._read, reads) if reads else []
+
+        requests = [(ids, gap) for gaps, ids in by_gaps.items() for gap in gaps]
+        fetched = await asyncio.gather(*(call("history.get", {
+            "itemids": ids,
+            "history": history,
+            "time_from": gap[0],
+            "time_till": gap[1],
+            "sortfield": "clock",
+            "sortorder": "ASC",
+        }, cache=False) for ids, gap in requests))
+
+        for (ids, (gap_from, gap_till)), rows in zip(requests, fetched):
+            self.rows_fetched += len(rows)
+            result.extend(rows)
+            if gap_from <= settled:
+                stored_till = min(gap_till, settled)
+                await self._store(ids, history, (gap_from, stored_till),
+                                  [row for row in rows if int(row["clock"]) <= stored_till])
+
+        result.sort(key=lambda row: int(row["clock"]))
+        self.rows_served += len(result)
+        self._save_index()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return store usage and hit/miss counters.
+
+        Returns:
+            Dict[str, Any]: Store statistics
+        """
+        index = self._load_index() if self.owner else {}
+        return {
+            "directory": self.directory,
+            "owner": bool(self.owner),
+            "series": len(index),
+            "bytes": sum(entry["bytes"] for entry in index.values()),
+            "max_bytes": self.max_bytes,
+            "settle_seconds": self.settle,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "rows_fetched": self.rows_fetched,
+            "rows_served": self.rows_served,
+            "evictions": self.evictions,
+        }
+
+    def _claim(self) -> bool:
+        # Only one process may use a subdirectory: each keeps its index in
+        # memory and would overwrite the other's index.json
+        if self.owner is None and self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            lock_file = open(os.path.join(self.directory, "lock"), "a+")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                lock_file.close()
+                logger.warning(f"Series store {self.directory} is in use by another process; "
+                               f"history is read from Zabbix")
+                self.owner = False
+            else:
+                self.lock_file = lock_file
+                self.owner = True
+        return bool(self.owner)
+
+    def _key(self, itemid: str, history: int) -> str:
+        return f"{itemid}_{history}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self.index is None:
+            try:
+                with open(os.path.join(self.directory, "index.json")) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+            for key, entry in list(self.index.items()):
+                if entry.get("format") != STORE_FORMAT:
+                    del self.index[key]
+                    self.dirty = True
+                    try:
+                        os.remove(self._path(key))
+                    except OSError:
+                        pass
+            self.index = {key: entry for key, entry in self.index.items()
+                          if os.path.exists(self._path(key))}
+        return self.index
+
+    def _save_index(self) -> None:
+        if not self.dirty:
+            return
+        self.dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "index.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self._load_index(), f)
+        os.replace(path + ".tmp", path)
+
+    def _covered(self, itemid: str, history: int) -> List[Interval]:
+        entry = self._load_index().get(self._key(itemid, history))
+        return [tuple(interval) for interval in entry["covered"]] if entry else []
+
+    def _read(self, reads: List[Tuple[str, str, List[Interval]]]) -> List[Dict[str, Any]]:
+        # Runs in a worker thread: decoding a long stored range takes a while
+        rows: List[Dict[str, Any]] = []
+        for itemid, path, parts in reads:
+            data = np.load(path, mmap_mode="r")
+            for time_from, time_till in parts:
+                start = np.searchsorted(data["clock"], time_from, side="left")
+                end = np.searchsorted(data["clock"], time_till, side="right")
+                window = data[start:end]
+                rows.extend(
+                    {"itemid": itemid, "clock": str(clock), "value": value.decode(), "ns": str(ns)}
+                    for clock, ns, value in zip(window["clock"].tolist(), window["ns"].tolist(),
+                                                window["value"].tolist()))
+        return rows
+
+    async def _store(self, itemids: List[str], history: int, interval: Interval,
+                     rows: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        index = self._load_index()
+        dtype = DTYPES[history]
+
+        by_item: Dict[str, List[Dict[str, Any]]] = {itemid: [] for itemid in itemids}
+        for row in rows:
+            by_item.setdefault(row["itemid"], []).append(row)
+
+        for itemid, item_rows in by_item.items():
+            key = self._key(itemid, history)
+            # One writer per series, so concurrent gap fills don't overwrite each other
+            async with self.locks.setdefault(key, asyncio.Lock()):
+                size = await asyncio.to_thread(self._write, self._path(key), dtype,
+                                               item_rows, key in index)
+                if size is None:
+                    continue
+                entry = index.setdefault(key, {"covered": [], "accessed": time.time(),
+                                               "format": STORE_FORMAT})
+                entry["covered"] = merge_intervals([tuple(i) for i in entry["covered"]], interval)
+                entry["bytes"] = size
+        self.dirty = True
+        self._evict()
+
+    def _write(self, path: str, dtype: np.dtype, rows: List[Dict[str, Any]],
+               append: bool) -> Optional[int]:
+        # Runs in a worker thread: merging with the stored file is O(series length)
+        values = [str(row["value"]).encode() for row in rows]
+        if any(len(value) > dtype["value"].itemsize for value in values):
+            return None
+        new = np.empty(len(rows), dtype=dtype)
+        new["clock"] = [row["clock"] for row in rows]
+        new["ns"] = [row.get("ns", 0) for row in rows]
+        new["value"] = values
+        if append and os.path.exists(path):
+            new = np.concatenate([np.load(path), new])
+        # Sort by clock and ns, keeping one value per timestamp
+        order = np.lexsort((new["ns"], new["clock"]))
+        data = new[order]
+        if len(data):
+            keep = np.ones(len(data), dtype=bool)
+            keep[:-1] = (data["clock"][1:] != data["clock"][:-1]) | (data["ns"][1:] != data["ns"][:-1])
+            data = data[keep]
+
+        np.save(path + ".tmp.npy", data)
+        os.replace(path + ".tmp.npy", path)
+        return os.path.getsize(path)
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        now = time.time()
+        by_age = sorted(index, key=lambda key: index[key]["accessed"])
+        total = sum(entry["bytes"] for entry in index.values())
+        for key in by_age:
+            if total <= self.max_bytes and now - index[key]["accessed"] <= self.max_age:
+                break
+            total -= index[key]["bytes"]
+            del index[key]
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
@@ -11,12 +11,38 @@ License: MIT
 """
 
 import os
-import json
+import time
+import asyncio
+import heapq
 import logging
-from typing import Any, Dict, List, Optional
-from fastmcp import FastMCP
-from zabbix_utils import ZabbixAPI
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+import numpy as np
+from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from zabbix_utils import AsyncZabbixAPI, APIRequestError
 from dotenv import load_dotenv
+from connection_pool import PoolStats, create_session, request_timeout
+from response_cache import ResponseCache, cache_key, is_read_method
+from coalescing import RequestCoalescer
+from serialization import dumps
+from field_sets import resolve_output
+from pagination import fetch_page
+from history_stream import collect_history, split_windows, stream_history
+from downsampling import downsample_history, downsample_trends
+from aggregation import HistoryAggregator, parse_aggregates
+from routing import fetch_routed
+from series_store import SeriesStore
+from columnar import to_columns
+from anomaly import SCAN_METHODS, fetch_series, rounded, score_series, top_offenders
+from correlation import fetch_grid, grid_step, lagged_correlations
+from problem_feed import ProblemFeed
+from enrichment import HOST_FIELDS, TriggerIndex, enrich_problems
+from entity_index import EntityIndex
+from problem_stream import ProblemStream
+from event_stream import slice_range, stream_events
+from problem_summary import summarize_problems
 
 # Load environment variables from .env file
 load_dotenv()
@@ -28,53 +54,349 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Stop background work and close the Zabbix client when the server stops.
+    
+    Args:
+        server: The FastMCP server
+    """
+    try:
+        yield {}
+    finally:
+        await problem_stream.close()
+        await close_zabbix_client()
+        series_store.close()
+
+
 # Initialize FastMCP
-mcp = FastMCP("Zabbix MCP Server")
+mcp = FastMCP("Zabbix MCP Server", lifespan=server_lifespan)
+
+# Maximum number of Zabbix API calls in flight at the same time
+MAX_CONCURRENCY = int(os.getenv("ZABBIX_MAX_CONCURRENCY", "16"))
+
+# Idle seconds after which the background keepalive checks the session (0 = off)
+SESSION_KEEPALIVE = float(os.getenv("ZABBIX_SESSION_KEEPALIVE", "300"))
+
+# Fragments of Zabbix API error messages that mean the session is no longer valid
+AUTH_ERROR_MARKERS = ("re-login", "session terminated", "not authorized", "not authorised")
+
+# Global Zabbix API client and the semaphore bounding calls made through it
+zabbix_api: Optional[AsyncZabbixAPI] = None
+api_semaphore: Optional[asyncio.Semaphore] = None
+
+# Serializes client creation and re-login so a burst of calls logs in once
+client_lock: Optional[asyncio.Lock] = None
+
+# Incremented on every successful login; lets concurrent callers that failed
+# with the same stale session trigger a single re-login between them
+auth_generation = 0
+
+# Background tasks keeping the session alive and the entity index fresh,
+# and time of the last API call
+keepalive_task: Optional[asyncio.Task] = None
+index_task: Optional[asyncio.Task] = None
+last_call_at = 0.0
+
+# Connection pool counters, kept across client re-creation
+pool_stats = PoolStats()
+
+# Read-through cache for Zabbix API read methods
+response_cache = ResponseCache()
+
+# Shares one upstream request between identical concurrent reads
+request_coalescer = RequestCoalescer()
+
+# Local store of numeric history, so repeated ranges only fetch what is new
+series_store = SeriesStore()
+
+# Snapshots of open problems behind the problem_get change feed
+problem_feed = ProblemFeed()
 
-# Global Zabbix API client
-zabbix_api: Optional[ZabbixAPI] = None
+# Trigger descriptions, priorities and hosts for enriching problems
+trigger_index = TriggerIndex()
 
+# Names of hosts, groups and templates and item keys, for name-to-ID resolution
+entity_index = EntityIndex()
 
-def get_zabbix_client() -> ZabbixAPI:
+# One poller of problem changes shared by all subscribed clients; it keeps its
+# own feed so its cursors do not push out those of polling clients
+problem_stream = ProblemStream(ProblemFeed(max_snapshots=2))
+
+
+async def login(client: AsyncZabbixAPI) -> None:
+    """Authenticate a client using token or username/password.
+    
+    Args:
+        client: Zabbix API client to authenticate
+        
+    Raises:
+        ValueError: If no credentials are configured
+        Exception: If authentication fails
+    """
+    global auth_generation
+    
+    token = os.getenv("ZABBIX_TOKEN")
+    if token:
+        logger.info("Authenticating with API token")
+        await client.login(token=token)
+    else:
+        user = os.getenv("ZABBIX_USER")
+        password = os.getenv("ZABBIX_PASSWORD")
+        if not user or not password:
+            raise ValueError("Either ZABBIX_TOKEN or ZABBIX_USER/ZABBIX_PASSWORD must be set")
+        logger.info(f"Authenticating with username: {user}")
+        await client.login(user=user, password=password)
+    
+    auth_generation += 1
+
+
+async def get_zabbix_client() -> AsyncZabbixAPI:
     """Get or create Zabbix API client with proper authentication.
     
+    Concurrent first calls wait for a single client to be created and
+    logged in instead of each logging in on their own.
+    
     Returns:
-        ZabbixAPI: Authenticated Zabbix API client
+        AsyncZabbixAPI: Authenticated asynchronous Zabbix API client
         
     Raises:
         ValueError: If required environment variables are missing
         Exception: If authentication fails
     """
-    global zabbix_api
+    global zabbix_api, client_lock, keepalive_task, index_task, last_call_at
+    
+    if zabbix_api is not None:
+        return zabbix_api
+    
+    if client_lock is None:
+        client_lock = asyncio.Lock()
     
-    if zabbix_api is None:
+    async with client_lock:
+        if zabbix_api is not None:
+            return zabbix_api
+        
         url = os.getenv("ZABBIX_URL")
         if not url:
             raise ValueError("ZABBIX_URL environment variable is required")
         
         logger.info(f"Initializing Zabbix API client for {url}")
+        # Stored history is only valid for the instance and the credentials that read it
+        series_store.bind(url, os.getenv("ZABBIX_USER") or os.getenv("ZABBIX_TOKEN") or "")
+        
+        # zabbix_utils closes a session it created itself on every API error,
+        # so the server owns the pooled session and keeps it open across failed calls
+        session = create_session(pool_stats)
         
-        # Initialize client
-        zabbix_api = ZabbixAPI(url=url)
-        
-        # Authenticate using token or username/password
-        token = os.getenv("ZABBIX_TOKEN")
-        if token:
-            logger.info("Authenticating with API token")
-            zabbix_api.login(token=token)
-        else:
-            user = os.getenv("ZABBIX_USER")
-            password = os.getenv("ZABBIX_PASSWORD")
-            if not user or not password:
-                raise ValueError("Either ZABBIX_TOKEN or ZABBIX_USER/ZABBIX_PASSWORD must be set")
-            logger.info(f"Authenticating with username: {user}")
-            zabbix_api.login(user=user, password=password)
+        try:
+            # The constructor checks the API version with a blocking request
+            client = await asyncio.to_thread(AsyncZabbixAPI, url=url, client_session=session,
+                                             timeout=request_timeout())
+            await login(client)
+        except Exception:
+            await session.close()
+            raise
         
+        zabbix_api = client
+        last_call_at = time.monotonic()
         logger.info("Successfully authenticated with Zabbix API")
+        
+        if SESSION_KEEPALIVE > 0:
+            keepalive_task = asyncio.create_task(session_keepalive())
+        if entity_index.refresh_interval > 0:
+            index_task = asyncio.create_task(entity_index.run(call_api))
     
     return zabbix_api
 
 
+async def relogin(failed_generation: int) -> None:
+    """Log in again after the session used by a call was rejected.
+    
+    Only the first caller reporting a given login generation logs in; callers
+    that arrive after the session was already renewed return immediately.
+    
+    Args:
+        failed_generation: Login generation the rejected call was made with
+    """
+    if client_lock is None:
+        return
+    
+    async with client_lock:
+        if zabbix_api is None or auth_generation != failed_generation:
+            return
+        logger.warning("Zabbix API session is no longer valid, logging in again")
+        await login(zabbix_api)
+
+
+def is_auth_error(error: Exception) -> bool:
+    """Check whether a Zabbix API error means the session has expired.
+    
+    Args:
+        error: Exception raised by a Zabbix API call
+        
+    Returns:
+        bool: True if logging in again may fix the call
+    """
+    if not isinstance(error, APIRequestError):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+async def session_keepalive() -> None:
+    """Keep the Zabbix session valid while the server is idle.
+    
+    After ZABBIX_SESSION_KEEPALIVE idle seconds the session is checked (which
+    also extends it); an expired session is renewed here, so the next burst
+    of calls finds a valid session instead of all of them logging in again.
+    """
+    while True:
+        idle = time.monotonic() - last_call_at
+        if idle < SESSION_KEEPALIVE:
+            await asyncio.sleep(SESSION_KEEPALIVE - idle)
+            continue
+        
+        client, generation = zabbix_api, auth_generation
+        if client is None:
+            return
+        
+        try:
+            valid = await client.check_auth()
+        except Exception as e:
+            valid = not is_auth_error(e)
+            if valid:
+                logger.warning(f"Zabbix session keepalive failed: {e}")
+        
+        try:
+            if not valid:
+                await relogin(generation)
+        except Exception as e:
+            logger.warning(f"Zabbix re-login from keepalive failed: {e}")
+        
+        await asyncio.sleep(SESSION_KEEPALIVE)
+
+
+async def close_zabbix_client() -> None:
+    """Log out and release the Zabbix API client and its HTTP session.
+    
+    The client is bound to the event loop it was created in, so this must run
+    before that loop is closed. The next call creates a fresh client.
+    """
+    global zabbix_api, api_semaphore, client_lock, keepalive_task, index_task
+    
+    client, zabbix_api, api_semaphore, client_lock = zabbix_api, None, None, None
+    
+    if keepalive_task is not None:
+        keepalive_task.cancel()
+        keepalive_task = None
+    if index_task is not None:
+        index_task.cancel()
+        index_task = None
+    
+    if client is None:
+        return
+    
+    try:
+        await client.logout()
+    except Exception as e:
+        logger.warning(f"Zabbix API logout failed: {e}")
+    finally:
+        await client.client_session.close()
+
+
+async def call_api(method: str,
+                   params: Optional[Union[Dict[str, Any], List[str]]] = None,
+                   cache: bool = True) -> Any:
+    """Execute a Zabbix API method, serving read methods from the cache.
+    
+    Read methods with a TTL in the cache policy are answered from the
+    response cache when a fresh result for the same normalized parameters
+    exists. Otherwise Zabbix is queried, with identical reads already in
+    flight sharing one request, and the result is cached. Successful write
+    methods invalidate the cached reads they can affect.
+    
+    Args:
+        method: Zabbix API method name (e.g. "host.get")
+        params: Method parameters, or a list of IDs for delete methods
+        cache: Whether a cached result may be returned; the fresh result of
+            a cacheable method is stored either way
+        
+    Returns:
+        Any: Result of the Zabbix API call. Results of read methods may be
+            shared with other callers and must not be modified.
+    """
+    if isinstance(params, list) or not is_read_method(method):
+        result = await send_api_request(method, params)
+        response_cache.invalidate_write(method, params, result)
+        trigger_index.invalidate_write(method)
+        return result
+    
+    key = cache_key(method, params)
+    cacheable = response_cache.ttl(method) > 0
+    if cache and cacheable:
+        found, result = response_cache.get(method, key)
+        if found:
+            return result
+    
+    # A write invalidating this method starts a new generation, so reads sent
+    # before it are neither joined nor cached by calls made after it
+    generation = response_cache.generation(method)
+    
+    async def fetch() -> Any:
+        result = await send_api_request(method, params)
+        if cacheable:
+            response_cache.put(method, key, result, params, generation)
+        return result
+    
+    return await request_coalescer.run(method, f"{generation}:{key}", fetch)
+
+
+async def send_api_request(method: str,
+                           params: Optional[Union[Dict[str, Any], List[str]]] = None) -> Any:
+    """Send a Zabbix API request with the shared asynchronous client.
+    
+    At most ZABBIX_MAX_CONCURRENCY calls are sent at the same time; further
+    calls wait for a free slot instead of piling up on the Zabbix frontend.
+    All calls share one pooled keep-alive HTTP session. A call rejected
+    because the session expired is replayed once after logging in again.
+    
+    Args:
+        method: Zabbix API method name (e.g. "host.get")
+        params: Method parameters, or a list of IDs for delete methods
+        
+    Returns:
+        Any: Result of the Zabbix API call
+    """
+    global api_semaphore, last_call_at
+    
+    client = await get_zabbix_client()
+    if api_semaphore is None:
+        api_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    
+    api_object, _, api_method = method.partition(".")
+    func = getattr(getattr(client, api_object), api_method)
+    
+    for attempt in range(2):
+        generation = auth_generation
+        last_call_at = time.monotonic()
+        
+        queued_at = time.perf_counter() if api_semaphore.locked() else None
+        async with api_semaphore:
+            if queued_at is not None:
+                pool_stats.record_slot_wait(time.perf_counter() - queued_at)
+            try:
+                if isinstance(params, list):
+                    return await func(params)
+                return await func(**(params or {}))
+            except APIRequestError as e:
+                if attempt or not is_auth_error(e):
+                    raise
+        
+        await relogin(generation)
+
+
 def is_read_only() -> bool:
     """Check if server is in read-only mode.
     
@@ -87,13 +409,35 @@ def is_read_only() -> bool:
 def format_response(data: Any) -> str:
     """Format response data as JSON string.
     
+    Output is compact unless RESPONSE_FORMAT=pretty is set, and uses orjson
+    when it is installed (see JSON_ENCODER).
+    
     Args:
         data: Data to format
         
     Returns:
         str: JSON formatted string
     """
-    return json.dumps(data, indent=2, default=str)
+    return dumps(data)
+
+
+def progress_token(ctx: Optional[Context]) -> Any:
+    """Return the progress token the client sent with the current request.
+    
+    Progress notifications only reach clients that asked for them with a
+    progress token; without one, results must be returned in the tool result.
+    
+    Args:
+        ctx: MCP request context, or None outside a request
+        
+    Returns:
+        Any: The progress token, or None if there is none
+    """
+    request = ctx.request_context if ctx is not None else None
+    meta = getattr(request, "meta", None)
+    if isinstance(meta, dict):
+        return meta.get("progressToken")
+    return getattr(meta, "progressToken", None)
 
 
 def validate_read_only() -> None:
@@ -106,31 +450,62 @@ def validate_read_only() -> None:
         raise ValueError("Server is in read-only mode - write operations are not allowed")
 
 
+async def resolve_ids(kind: str, values: Optional[List[str]]) -> Optional[List[str]]:
+    """Resolve names given in place of IDs through the entity index.
+    
+    Args:
+        kind: "host", "group", "template" or "item" (items as "host:key")
+        values: IDs and/or names, or None
+        
+    Returns:
+        Optional[List[str]]: The values with names replaced by IDs
+        
+    Raises:
+        ValueError: If a name matches nothing in Zabbix
+    """
+    if not values or all(str(value).isdigit() for value in values):
+        return values
+    return await entity_index.resolve(call_api, kind, values)
+
+
 # HOST MANAGEMENT
 @mcp.tool()
-def host_get(hostids: Optional[List[str]] = None, 
-             groupids: Optional[List[str]] = None,
-             templateids: Optional[List[str]] = None,
-             output: str = "extend",
-             search: Optional[Dict[str, str]] = None,
-             filter: Optional[Dict[str, Any]] = None,
-             limit: Optional[int] = None) -> str:
+async def host_get(hostids: Optional[List[str]] = None, 
+                   groupids: Optional[List[str]] = None,
+                   templateids: Optional[List[str]] = None,
+                   output: Optional[str] = None,
+                   search: Optional[Dict[str, str]] = None,
+                   filter: Optional[Dict[str, Any]] = None,
+                   limit: Optional[int] = None,
+                   cache: bool = True,
+                   fields: Optional[List[str]] = None,
+                   page_size: Optional[int] = None,
+                   cursor: Optional[str] = None) -> str:
     """Get hosts from Zabbix with optional filtering.
     
     Args:
-        hostids: List of host IDs to retrieve
-        groupids: List of host group IDs to filter by
-        templateids: List of template IDs to filter by
-        output: Output format (extend, shorten, or specific fields)
+        hostids: List of host IDs or names to retrieve
+        groupids: List of host group IDs or names to filter by
+        templateids: List of template IDs or names to filter by
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
+        page_size: Return results in pages of this size, ordered by ID (limit is ignored)
+        cursor: next_cursor of the previous page, to get the page after it
         
     Returns:
-        str: JSON formatted list of hosts
+        str: JSON formatted list of hosts, or a page of them with
+            next_cursor when paging
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    templateids = await resolve_ids("template", templateids)
+    
+    params = {"output": resolve_output("host.get", output, fields)}
     
     if hostids:
         params["hostids"] = hostids
@@ -145,16 +520,20 @@ def host_get(hostids: Optional[List[str]] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.host.get(**params)
+    if page_size or cursor:
+        page = await fetch_page(call_api, "host.get", params, page_size, cursor, cache)
+        return format_response(page)
+    
+    result = await call_api("host.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def host_create(host: str, groups: List[Dict[str, str]], 
-                interfaces: List[Dict[str, Any]],
-                templates: Optional[List[Dict[str, str]]] = None,
-                inventory_mode: int = -1,
-                status: int = 0) -> str:
+async def host_create(host: str, groups: List[Dict[str, str]], 
+                      interfaces: List[Dict[str, Any]],
+                      templates: Optional[List[Dict[str, str]]] = None,
+                      inventory_mode: int = -1,
+                      status: int = 0) -> str:
     """Create a new host in Zabbix.
     
     Args:
@@ -170,7 +549,6 @@ def host_create(host: str, groups: List[Dict[str, str]],
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "host": host,
         "groups": groups,
@@ -182,13 +560,13 @@ def host_create(host: str, groups: List[Dict[str, str]],
     if templates:
         params["templates"] = templates
     
-    result = client.host.create(**params)
+    result = await call_api("host.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def host_update(hostid: str, host: Optional[str] = None, 
-                name: Optional[str] = None, status: Optional[int] = None) -> str:
+async def host_update(hostid: str, host: Optional[str] = None, 
+                      name: Optional[str] = None, status: Optional[int] = None) -> str:
     """Update an existing host in Zabbix.
     
     Args:
@@ -202,7 +580,6 @@ def host_update(hostid: str, host: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"hostid": hostid}
     
     if host:
@@ -212,12 +589,12 @@ def host_update(hostid: str, host: Optional[str] = None,
     if status is not None:
         params["status"] = status
     
-    result = client.host.update(**params)
+    result = await call_api("host.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def host_delete(hostids: List[str]) -> str:
+async def host_delete(hostids: List[str]) -> str:
     """Delete hosts from Zabbix.
     
     Args:
@@ -228,30 +605,35 @@ def host_delete(hostids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.host.delete(*hostids)
+    result = await call_api("host.delete", hostids)
     return format_response(result)
 
 
 # HOST GROUP MANAGEMENT
 @mcp.tool()
-def hostgroup_get(groupids: Optional[List[str]] = None,
-                  output: str = "extend",
-                  search: Optional[Dict[str, str]] = None,
-                  filter: Optional[Dict[str, Any]] = None) -> str:
+async def hostgroup_get(groupids: Optional[List[str]] = None,
+                        output: Optional[str] = None,
+                        search: Optional[Dict[str, str]] = None,
+                        filter: Optional[Dict[str, Any]] = None,
+                        cache: bool = True,
+                        fields: Optional[List[str]] = None) -> str:
     """Get host groups from Zabbix.
     
     Args:
-        groupids: List of group IDs to retrieve
-        output: Output format
+        groupids: List of group IDs or names to retrieve
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of host groups
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    groupids = await resolve_ids("group", groupids)
+    
+    params = {"output": resolve_output("hostgroup.get", output, fields)}
     
     if groupids:
         params["groupids"] = groupids
@@ -260,12 +642,12 @@ def hostgroup_get(groupids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.hostgroup.get(**params)
+    result = await call_api("hostgroup.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def hostgroup_create(name: str) -> str:
+async def hostgroup_create(name: str) -> str:
     """Create a new host group in Zabbix.
     
     Args:
@@ -276,13 +658,12 @@ def hostgroup_create(name: str) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.hostgroup.create(name=name)
+    result = await call_api("hostgroup.create", {"name": name})
     return format_response(result)
 
 
 @mcp.tool()
-def hostgroup_update(groupid: str, name: str) -> str:
+async def hostgroup_update(groupid: str, name: str) -> str:
     """Update an existing host group in Zabbix.
     
     Args:
@@ -294,13 +675,12 @@ def hostgroup_update(groupid: str, name: str) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.hostgroup.update(groupid=groupid, name=name)
+    result = await call_api("hostgroup.update", {"groupid": groupid, "name": name})
     return format_response(result)
 
 
 @mcp.tool()
-def hostgroup_delete(groupids: List[str]) -> str:
+async def hostgroup_delete(groupids: List[str]) -> str:
     """Delete host groups from Zabbix.
     
     Args:
@@ -311,38 +691,51 @@ def hostgroup_delete(groupids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.hostgroup.delete(*groupids)
+    result = await call_api("hostgroup.delete", groupids)
     return format_response(result)
 
 
 # ITEM MANAGEMENT
 @mcp.tool()
-def item_get(itemids: Optional[List[str]] = None,
-             hostids: Optional[List[str]] = None,
-             groupids: Optional[List[str]] = None,
-             templateids: Optional[List[str]] = None,
-             output: str = "extend",
-             search: Optional[Dict[str, str]] = None,
-             filter: Optional[Dict[str, Any]] = None,
-             limit: Optional[int] = None) -> str:
+async def item_get(itemids: Optional[List[str]] = None,
+                   hostids: Optional[List[str]] = None,
+                   groupids: Optional[List[str]] = None,
+                   templateids: Optional[List[str]] = None,
+                   output: Optional[str] = None,
+                   search: Optional[Dict[str, str]] = None,
+                   filter: Optional[Dict[str, Any]] = None,
+                   limit: Optional[int] = None,
+                   cache: bool = True,
+                   fields: Optional[List[str]] = None,
+                   page_size: Optional[int] = None,
+                   cursor: Optional[str] = None) -> str:
     """Get items from Zabbix with optional filtering.
     
     Args:
-        itemids: List of item IDs to retrieve
-        hostids: List of host IDs to filter by
-        groupids: List of host group IDs to filter by
-        templateids: List of template IDs to filter by
-        output: Output format
+        itemids: List of item IDs or "host:key" references to retrieve
+        hostids: List of host IDs or names to filter by
+        groupids: List of host group IDs or names to filter by
+        templateids: List of template IDs or names to filter by
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
+        page_size: Return results in pages of this size, ordered by ID (limit is ignored)
+        cursor: next_cursor of the previous page, to get the page after it
         
     Returns:
-        str: JSON formatted list of items
+        str: JSON formatted list of items, or a page of them with
+            next_cursor when paging
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    itemids = await resolve_ids("item", itemids)
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    templateids = await resolve_ids("template", templateids)
+    
+    params = {"output": resolve_output("item.get", output, fields)}
     
     if itemids:
         params["itemids"] = itemids
@@ -359,15 +752,19 @@ def item_get(itemids: Optional[List[str]] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.item.get(**params)
+    if page_size or cursor:
+        page = await fetch_page(call_api, "item.get", params, page_size, cursor, cache)
+        return format_response(page)
+    
+    result = await call_api("item.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def item_create(name: str, key_: str, hostid: str, type: int,
-                value_type: int, delay: str = "1m",
-                units: Optional[str] = None,
-                description: Optional[str] = None) -> str:
+async def item_create(name: str, key_: str, hostid: str, type: int,
+                      value_type: int, delay: str = "1m",
+                      units: Optional[str] = None,
+                      description: Optional[str] = None) -> str:
     """Create a new item in Zabbix.
     
     Args:
@@ -385,7 +782,6 @@ def item_create(name: str, key_: str, hostid: str, type: int,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "name": name,
         "key_": key_,
@@ -400,14 +796,14 @@ def item_create(name: str, key_: str, hostid: str, type: int,
     if description:
         params["description"] = description
     
-    result = client.item.create(**params)
+    result = await call_api("item.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def item_update(itemid: str, name: Optional[str] = None,
-                key_: Optional[str] = None, delay: Optional[str] = None,
-                status: Optional[int] = None) -> str:
+async def item_update(itemid: str, name: Optional[str] = None,
+                      key_: Optional[str] = None, delay: Optional[str] = None,
+                      status: Optional[int] = None) -> str:
     """Update an existing item in Zabbix.
     
     Args:
@@ -422,7 +818,6 @@ def item_update(itemid: str, name: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"itemid": itemid}
     
     if name:
@@ -434,12 +829,12 @@ def item_update(itemid: str, name: Optional[str] = None,
     if status is not None:
         params["status"] = status
     
-    result = client.item.update(**params)
+    result = await call_api("item.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def item_delete(itemids: List[str]) -> str:
+async def item_delete(itemids: List[str]) -> str:
     """Delete items from Zabbix.
     
     Args:
@@ -450,38 +845,50 @@ def item_delete(itemids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.item.delete(*itemids)
+    result = await call_api("item.delete", itemids)
     return format_response(result)
 
 
 # TRIGGER MANAGEMENT
 @mcp.tool()
-def trigger_get(triggerids: Optional[List[str]] = None,
-                hostids: Optional[List[str]] = None,
-                groupids: Optional[List[str]] = None,
-                templateids: Optional[List[str]] = None,
-                output: str = "extend",
-                search: Optional[Dict[str, str]] = None,
-                filter: Optional[Dict[str, Any]] = None,
-                limit: Optional[int] = None) -> str:
+async def trigger_get(triggerids: Optional[List[str]] = None,
+                      hostids: Optional[List[str]] = None,
+                      groupids: Optional[List[str]] = None,
+                      templateids: Optional[List[str]] = None,
+                      output: Optional[str] = None,
+                      search: Optional[Dict[str, str]] = None,
+                      filter: Optional[Dict[str, Any]] = None,
+                      limit: Optional[int] = None,
+                      cache: bool = True,
+                      fields: Optional[List[str]] = None,
+                      page_size: Optional[int] = None,
+                      cursor: Optional[str] = None) -> str:
     """Get triggers from Zabbix with optional filtering.
     
     Args:
         triggerids: List of trigger IDs to retrieve
-        hostids: List of host IDs to filter by
-        groupids: List of host group IDs to filter by
-        templateids: List of template IDs to filter by
-        output: Output format
+        hostids: List of host IDs or names to filter by
+        groupids: List of host group IDs or names to filter by
+        templateids: List of template IDs or names to filter by
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
+        page_size: Return results in pages of this size, ordered by ID (limit is ignored)
+        cursor: next_cursor of the previous page, to get the page after it
         
     Returns:
-        str: JSON formatted list of triggers
+        str: JSON formatted list of triggers, or a page of them with
+            next_cursor when paging
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    templateids = await resolve_ids("template", templateids)
+    
+    params = {"output": resolve_output("trigger.get", output, fields)}
     
     if triggerids:
         params["triggerids"] = triggerids
@@ -498,14 +905,18 @@ def trigger_get(triggerids: Optional[List[str]] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.trigger.get(**params)
+    if page_size or cursor:
+        page = await fetch_page(call_api, "trigger.get", params, page_size, cursor, cache)
+        return format_response(page)
+    
+    result = await call_api("trigger.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def trigger_create(description: str, expression: str,
-                   priority: int = 0, status: int = 0,
-                   comments: Optional[str] = None) -> str:
+async def trigger_create(description: str, expression: str,
+                         priority: int = 0, status: int = 0,
+                         comments: Optional[str] = None) -> str:
     """Create a new trigger in Zabbix.
     
     Args:
@@ -520,7 +931,6 @@ def trigger_create(description: str, expression: str,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "description": description,
         "expression": expression,
@@ -531,14 +941,14 @@ def trigger_create(description: str, expression: str,
     if comments:
         params["comments"] = comments
     
-    result = client.trigger.create(**params)
+    result = await call_api("trigger.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def trigger_update(triggerid: str, description: Optional[str] = None,
-                   expression: Optional[str] = None, priority: Optional[int] = None,
-                   status: Optional[int] = None) -> str:
+async def trigger_update(triggerid: str, description: Optional[str] = None,
+                         expression: Optional[str] = None, priority: Optional[int] = None,
+                         status: Optional[int] = None) -> str:
     """Update an existing trigger in Zabbix.
     
     Args:
@@ -553,7 +963,6 @@ def trigger_update(triggerid: str, description: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"triggerid": triggerid}
     
     if description:
@@ -565,12 +974,12 @@ def trigger_update(triggerid: str, description: Optional[str] = None,
     if status is not None:
         params["status"] = status
     
-    result = client.trigger.update(**params)
+    result = await call_api("trigger.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def trigger_delete(triggerids: List[str]) -> str:
+async def trigger_delete(triggerids: List[str]) -> str:
     """Delete triggers from Zabbix.
     
     Args:
@@ -581,34 +990,41 @@ def trigger_delete(triggerids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.trigger.delete(*triggerids)
+    result = await call_api("trigger.delete", triggerids)
     return format_response(result)
 
 
 # TEMPLATE MANAGEMENT
 @mcp.tool()
-def template_get(templateids: Optional[List[str]] = None,
-                 groupids: Optional[List[str]] = None,
-                 hostids: Optional[List[str]] = None,
-                 output: str = "extend",
-                 search: Optional[Dict[str, str]] = None,
-                 filter: Optional[Dict[str, Any]] = None) -> str:
+async def template_get(templateids: Optional[List[str]] = None,
+                       groupids: Optional[List[str]] = None,
+                       hostids: Optional[List[str]] = None,
+                       output: Optional[str] = None,
+                       search: Optional[Dict[str, str]] = None,
+                       filter: Optional[Dict[str, Any]] = None,
+                       cache: bool = True,
+                       fields: Optional[List[str]] = None) -> str:
     """Get templates from Zabbix with optional filtering.
     
     Args:
-        templateids: List of template IDs to retrieve
-        groupids: List of host group IDs to filter by
-        hostids: List of host IDs to filter by
-        output: Output format
+        templateids: List of template IDs or names to retrieve
+        groupids: List of host group IDs or names to filter by
+        hostids: List of host IDs or names to filter by
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of templates
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    templateids = await resolve_ids("template", templateids)
+    groupids = await resolve_ids("group", groupids)
+    hostids = await resolve_ids("host", hostids)
+    
+    params = {"output": resolve_output("template.get", output, fields)}
     
     if templateids:
         params["templateids"] = templateids
@@ -621,13 +1037,13 @@ def template_get(templateids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.template.get(**params)
+    result = await call_api("template.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def template_create(host: str, groups: List[Dict[str, str]],
-                    name: Optional[str] = None, description: Optional[str] = None) -> str:
+async def template_create(host: str, groups: List[Dict[str, str]],
+                          name: Optional[str] = None, description: Optional[str] = None) -> str:
     """Create a new template in Zabbix.
     
     Args:
@@ -641,7 +1057,6 @@ def template_create(host: str, groups: List[Dict[str, str]],
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "host": host,
         "groups": groups
@@ -652,13 +1067,13 @@ def template_create(host: str, groups: List[Dict[str, str]],
     if description:
         params["description"] = description
     
-    result = client.template.create(**params)
+    result = await call_api("template.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def template_update(templateid: str, host: Optional[str] = None,
-                    name: Optional[str] = None, description: Optional[str] = None) -> str:
+async def template_update(templateid: str, host: Optional[str] = None,
+                          name: Optional[str] = None, description: Optional[str] = None) -> str:
     """Update an existing template in Zabbix.
     
     Args:
@@ -672,7 +1087,6 @@ def template_update(templateid: str, host: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"templateid": templateid}
     
     if host:
@@ -682,12 +1096,12 @@ def template_update(templateid: str, host: Optional[str] = None,
     if description:
         params["description"] = description
     
-    result = client.template.update(**params)
+    result = await call_api("template.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def template_delete(templateids: List[str]) -> str:
+async def template_delete(templateids: List[str]) -> str:
     """Delete templates from Zabbix.
     
     Args:
@@ -698,42 +1112,59 @@ def template_delete(templateids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.template.delete(*templateids)
+    result = await call_api("template.delete", templateids)
     return format_response(result)
 
 
 # PROBLEM MANAGEMENT
 @mcp.tool()
-def problem_get(eventids: Optional[List[str]] = None,
-                groupids: Optional[List[str]] = None,
-                hostids: Optional[List[str]] = None,
-                objectids: Optional[List[str]] = None,
-                output: str = "extend",
-                time_from: Optional[int] = None,
-                time_till: Optional[int] = None,
-                recent: bool = False,
-                severities: Optional[List[int]] = None,
-                limit: Optional[int] = None) -> str:
+async def problem_get(eventids: Optional[List[str]] = None,
+                      groupids: Optional[List[str]] = None,
+                      hostids: Optional[List[str]] = None,
+                      objectids: Optional[List[str]] = None,
+                      output: Optional[str] = None,
+                      time_from: Optional[int] = None,
+                      time_till: Optional[int] = None,
+                      recent: bool = False,
+                      severities: Optional[List[int]] = None,
+                      limit: Optional[int] = None,
+                      cache: bool = True,
+                      fields: Optional[List[str]] = None,
+                      changes: bool = False,
+                      cursor: Optional[str] = None,
+                      enrich: bool = False) -> str:
     """Get problems from Zabbix with optional filtering.
     
     Args:
         eventids: List of event IDs to retrieve
-        groupids: List of host group IDs to filter by
-        hostids: List of host IDs to filter by
+        groupids: List of host group IDs or names to filter by
+        hostids: List of host IDs or names to filter by
         objectids: List of object IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         time_from: Start time (Unix timestamp)
         time_till: End time (Unix timestamp)
         recent: Only recent problems
         severities: List of severity levels to filter by
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
+        changes: Return only the open problems created, resolved or updated
+            (acknowledged or severity changed) since the poll that returned
+            cursor, and a cursor for the next poll. The first poll returns
+            all open problems as created. limit and recent are ignored.
+        cursor: cursor returned by the previous poll; implies changes
+        enrich: Add the hosts (hostid, name), the trigger (description,
+            priority) and the tags of each problem
         
     Returns:
-        str: JSON formatted list of problems
+        str: JSON formatted list of problems, or with changes, an object with
+            created, resolved and updated problems and the next cursor
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    groupids = await resolve_ids("group", groupids)
+    hostids = await resolve_ids("host", hostids)
+    
+    params = {"output": resolve_output("problem.get", output, fields)}
     
     if eventids:
         params["eventids"] = eventids
@@ -754,37 +1185,236 @@ def problem_get(eventids: Optional[List[str]] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.problem.get(**params)
+    if enrich:
+        params["selectTags"] = ["tag", "value"]
+        if isinstance(params["output"], list) and "objectid" not in params["output"]:
+            params["output"].append("objectid")
+    
+    if changes or cursor:
+        feed = await problem_feed.changes(call_api, params, cursor)
+        if enrich:
+            feed["created"] = await enrich_problems(call_api, trigger_index, feed["created"])
+        return format_response(feed)
+    
+    result = await call_api("problem.get", params, cache=cache)
+    if enrich:
+        result = await enrich_problems(call_api, trigger_index, result)
     return format_response(result)
 
 
+@mcp.tool()
+async def problem_summary(by: List[str],
+                          groupids: Optional[List[str]] = None,
+                          hostids: Optional[List[str]] = None,
+                          severities: Optional[List[int]] = None,
+                          acknowledged: Optional[bool] = None,
+                          tag: Optional[str] = None,
+                          limit: Optional[int] = None,
+                          cache: bool = True) -> str:
+    """Count open problems by severity, acknowledgement, host group, host or tag.
+    
+    Returns small tables of counts instead of the problems themselves.
+    Severity, acknowledgement and host group counts are asked from Zabbix
+    with concurrent countOutput queries; host and tag counts, and group
+    counts when there are many groups, are computed from one read of the
+    problems.
+    
+    Args:
+        by: Dimensions to count by: severity, acknowledged, group, host, tag;
+            a problem is counted once in each of its groups, hosts and tags
+        groupids: List of host group IDs or names to filter by
+        hostids: List of host IDs or names to filter by
+        severities: List of severity levels to filter by
+        acknowledged: Only acknowledged (True) or unacknowledged (False) problems
+        tag: With by=tag, count the values of this tag instead of tag names
+        limit: Maximum number of rows per table, largest counts first
+        cache: Use cached results when available (False always queries Zabbix)
+        
+    Returns:
+        str: JSON formatted object with the total number of problems and,
+            per dimension, the rows of counts and whether they were counted
+            by Zabbix ("count") or locally ("local")
+    """
+    groupids = await resolve_ids("group", groupids)
+    hostids = await resolve_ids("host", hostids)
+    
+    params: Dict[str, Any] = {}
+    if groupids:
+        params["groupids"] = groupids
+    if hostids:
+        params["hostids"] = hostids
+    if severities:
+        params["severities"] = severities
+    if acknowledged is not None:
+        params["acknowledged"] = acknowledged
+    
+    summary = await summarize_problems(call_api, trigger_index, params, by, tag, cache)
+    if limit:
+        for table in summary["by"].values():
+            table["rows"] = table["rows"][:limit]
+    return format_response(summary)
+
+
+# PROBLEM SUBSCRIPTIONS
+PROBLEMS_URI = "zabbix://problems"
+
+# Seconds between comment lines that keep idle event streams open
+SSE_KEEPALIVE = 15
+
+
+@mcp.resource(PROBLEMS_URI, name="problems", mime_type="application/json")
+async def problems_resource() -> str:
+    """Open problems. Subscribe to get notified when they change.
+    
+    Returns:
+        str: JSON formatted list of open problems
+    """
+    problems = problem_stream.current()
+    if problems is None:
+        problems = await call_api("problem.get", {"output": "extend"})
+    return format_response(problems)
+
+
+def register_problem_subscriptions() -> None:
+    """Serve subscriptions/listen streams for the problems resource.
+    
+    FastMCP does not handle resource subscriptions itself, so the handler is
+    added to the underlying MCP server where it supports that. Streams that
+    ask for the problems resource are listeners of the shared problem stream
+    and are notified that the resource was updated on every change; other
+    streams are served without starting the poller.
+    """
+    server = getattr(mcp, "_mcp_server", None)
+    try:
+        from mcp import types
+        from mcp.server.subscriptions import InMemorySubscriptionBus, ListenHandler, ResourceUpdated
+    except ImportError:
+        server = None
+    if not hasattr(server, "add_request_handler"):
+        logger.warning("MCP server does not accept custom handlers; resource subscriptions are off")
+        return
+    
+    class ProblemBus(InMemorySubscriptionBus):
+        """Bus whose listen streams are listeners of the problem stream."""
+        
+        def subscribe(self, listener):
+            unsubscribe = super().subscribe(listener)
+            key = object()
+            
+            async def notify(event: Dict[str, Any]) -> None:
+                listener(ResourceUpdated(uri=PROBLEMS_URI))
+            
+            problem_stream.add_listener(key, notify, call_api)
+            
+            def stop() -> None:
+                unsubscribe()
+                problem_stream.remove_listener(key)
+            
+            return stop
+    
+    problem_streams = ListenHandler(ProblemBus())
+    other_streams = ListenHandler(InMemorySubscriptionBus())
+    
+    async def listen(ctx: Any, params: types.SubscriptionsListenRequestParams) -> Any:
+        uris = [str(uri) for uri in params.notifications.resource_subscriptions or []]
+        handler = problem_streams if PROBLEMS_URI in uris else other_streams
+        return await handler(ctx, params)
+    
+    server.add_request_handler("subscriptions/listen", types.SubscriptionsListenRequestParams, listen)
+
+
+register_problem_subscriptions()
+
+
+@mcp.custom_route("/events/problems", methods=["GET"])
+async def problem_events(request: Request) -> StreamingResponse:
+    """Stream problem changes as server-sent events.
+    
+    A client first receives a "snapshot" event with the open problems, then
+    a "changes" event with the created, resolved and updated problems after
+    every poll that found changes.
+    
+    Args:
+        request: HTTP request
+        
+    Returns:
+        StreamingResponse: text/event-stream of single-line JSON events
+    """
+    queue = problem_stream.subscribe(call_api)
+    
+    async def events():
+        try:
+            problems = problem_stream.current()
+            if problems is not None:
+                snapshot = {"type": "snapshot", "clock": int(time.time()), "problems": problems}
+                yield f"event: snapshot\ndata: {dumps(snapshot, pretty=False)}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {dumps(event, pretty=False)}\n\n"
+        finally:
+            problem_stream.unsubscribe(queue)
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
 # EVENT MANAGEMENT
 @mcp.tool()
-def event_get(eventids: Optional[List[str]] = None,
-              groupids: Optional[List[str]] = None,
-              hostids: Optional[List[str]] = None,
-              objectids: Optional[List[str]] = None,
-              output: str = "extend",
-              time_from: Optional[int] = None,
-              time_till: Optional[int] = None,
-              limit: Optional[int] = None) -> str:
+async def event_get(eventids: Optional[List[str]] = None,
+                    groupids: Optional[List[str]] = None,
+                    hostids: Optional[List[str]] = None,
+                    objectids: Optional[List[str]] = None,
+                    output: Optional[str] = None,
+                    time_from: Optional[int] = None,
+                    time_till: Optional[int] = None,
+                    limit: Optional[int] = None,
+                    cache: bool = True,
+                    fields: Optional[List[str]] = None,
+                    page_size: Optional[int] = None,
+                    cursor: Optional[str] = None,
+                    enrich: bool = False,
+                    stream: bool = False,
+                    ctx: Optional[Context] = None) -> str:
     """Get events from Zabbix with optional filtering.
     
     Args:
         eventids: List of event IDs to retrieve
-        groupids: List of host group IDs to filter by
-        hostids: List of host IDs to filter by
+        groupids: List of host group IDs or names to filter by
+        hostids: List of host IDs or names to filter by
         objectids: List of object IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         time_from: Start time (Unix timestamp)
         time_till: End time (Unix timestamp)
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
+        page_size: Return results in pages of this size, ordered by ID (limit is ignored)
+        cursor: next_cursor of the previous page, to get the page after it
+        enrich: Add the hosts (hostid, name) and tags of each event; the
+            event's name and severity are the trigger description and priority
+        stream: Fetch the range in concurrent time slices, oldest first. If
+            the client sent a progress token, the events are sent slice by
+            slice as progress notifications and the result only summarizes
+            the stream; otherwise they are returned. Slices that fail are
+            retried in halves and listed under "failed" if they still fail.
+            Requires time_from; not used with paging.
+        ctx: MCP request context, supplied by FastMCP
         
     Returns:
-        str: JSON formatted list of events
+        str: JSON formatted list of events, or a page of them with
+            next_cursor when paging; when streaming, an object with the
+            slices that failed under "failed" and, unless they were sent as
+            progress notifications, the events under "result"
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    groupids = await resolve_ids("group", groupids)
+    hostids = await resolve_ids("host", hostids)
+    
+    params = {"output": resolve_output("event.get", output, fields)}
     
     if eventids:
         params["eventids"] = eventids
@@ -801,13 +1431,89 @@ def event_get(eventids: Optional[List[str]] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.event.get(**params)
+    if enrich:
+        params["selectHosts"] = HOST_FIELDS
+        params["selectTags"] = ["tag", "value"]
+        if isinstance(params["output"], list):
+            params["output"] += [field for field in ("name", "severity")
+                                 if field not in params["output"]]
+    
+    if stream:
+        if not time_from:
+            raise ValueError("time_from is required when streaming events")
+        if page_size or cursor:
+            raise ValueError("stream cannot be combined with page_size or cursor")
+        return format_response(await stream_event_slices(params, ctx, cache))
+    
+    if page_size or cursor:
+        page = await fetch_page(call_api, "event.get", params, page_size, cursor, cache)
+        return format_response(page)
+    
+    result = await call_api("event.get", params, cache=cache)
     return format_response(result)
 
 
+async def stream_event_slices(params: Dict[str, Any], ctx: Optional[Context],
+                              cache: bool = True) -> Dict[str, Any]:
+    """Fetch an event range in time slices, sending each slice as it completes.
+    
+    Args:
+        params: event.get parameters with time_from and an optional
+            time_till and limit
+        ctx: MCP request context to send the slices to as progress
+            notifications; without it, or when the client sent no progress
+            token, the events are collected and returned
+        cache: Use cached results when available
+        
+    Returns:
+        Dict[str, Any]: Summary of the streamed slices, or the collected
+            events under "result"; slices that failed under "failed"
+    """
+    time_from = params["time_from"]
+    time_till = params.get("time_till") or int(time.time())
+    limit = params.get("limit")
+    windows = slice_range(time_from, time_till)
+    # Each slice returns at most limit events, oldest first, so the merged
+    # stream still holds the oldest limit events of the range
+    base_params = {key: value for key, value in params.items()
+                   if key not in ("time_from", "time_till")}
+    base_params.update(sortfield=["clock", "eventid"], sortorder="ASC")
+    
+    streaming = progress_token(ctx) is not None
+    events: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+    sent = rows = retries = 0
+    async with aclosing(stream_events(call_api, base_params, windows, cache=cache)) as slices:
+        async for part in slices:
+            chunk = part.events[:limit - rows] if limit else part.events
+            failed += part.failed
+            retries += part.retries
+            sent += 1
+            rows += len(chunk)
+            if streaming:
+                await ctx.report_progress(sent, len(windows), format_response(chunk))
+            else:
+                events.extend(chunk)
+            if limit and rows >= limit:
+                break
+    
+    summary = {
+        "streamed": streaming,
+        "time_from": time_from,
+        "time_till": time_till,
+        "slices": sent,
+        "rows": rows,
+        "retries": retries,
+        "failed": failed,
+    }
+    if not streaming:
+        summary["result"] = events
+    return summary
+
+
 @mcp.tool()
-def event_acknowledge(eventids: List[str], action: int = 1,
-                      message: Optional[str] = None) -> str:
+async def event_acknowledge(eventids: List[str], action: int = 1,
+                            message: Optional[str] = None) -> str:
     """Acknowledge events in Zabbix.
     
     Args:
@@ -820,7 +1526,6 @@ def event_acknowledge(eventids: List[str], action: int = 1,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "eventids": eventids,
         "action": action
@@ -829,33 +1534,169 @@ def event_acknowledge(eventids: List[str], action: int = 1,
     if message:
         params["message"] = message
     
-    result = client.event.acknowledge(**params)
+    result = await call_api("event.acknowledge", params)
     return format_response(result)
 
 
 # HISTORY MANAGEMENT
+async def fetch_history(params: Dict[str, Any], cache: bool = True) -> List[Dict[str, Any]]:
+    """Run history.get, reading numeric history from the local store when possible.
+    
+    Calls with a limit go straight to Zabbix: the store would fetch and keep
+    the whole range to return only the first rows of it.
+    
+    Args:
+        params: history.get parameters
+        cache: Use cached results and the local store
+        
+    Returns:
+        List[Dict[str, Any]]: History rows. They may be shared with the cache
+            and must not be modified.
+    """
+    itemids, history = params["itemids"], params.get("history", 3)
+    time_from = params.get("time_from")
+    use_store = (cache and time_from and not params.get("limit")
+                 and params.get("sortfield") == "clock")
+    if use_store:
+        # Creating the client binds the store to the configured Zabbix instance
+        await get_zabbix_client()
+    if not (use_store and series_store.supports(itemids, history)):
+        return await call_api("history.get", params, cache=cache)
+    
+    result = await series_store.fetch(call_api, itemids, history, time_from,
+                                      params.get("time_till") or int(time.time()))
+    if params.get("sortorder", "ASC").upper() == "DESC":
+        result.reverse()
+    return result
+
+
+async def item_value_types(itemids: List[str]) -> Dict[int, List[str]]:
+    """Group items by value type, which selects the history table to read.
+    
+    Args:
+        itemids: Item IDs
+        
+    Returns:
+        Dict[int, List[str]]: Item IDs per value type; unknown items are left out
+    """
+    items = await call_api("item.get", {"itemids": itemids, "output": ["itemid", "value_type"]})
+    types: Dict[int, List[str]] = {}
+    for item in items:
+        types.setdefault(int(item["value_type"]), []).append(item["itemid"])
+    return types
+
+
+async def fetch_mixed_history(types: Dict[int, List[str]], time_from: Optional[int],
+                              time_till: Optional[int], limit: Optional[int],
+                              sortfield: str, sortorder: str, cache: bool,
+                              max_points: Optional[int] = None,
+                              downsample: str = "lttb") -> List[Dict[str, Any]]:
+    """Read history of items with different value types concurrently.
+    
+    Args:
+        types: Item IDs per value type, from item_value_types()
+        time_from: Start time (Unix timestamp)
+        time_till: End time (Unix timestamp)
+        limit: Maximum number of results
+        sortfield: Field to sort by
+        sortorder: Sort order (ASC or DESC)
+        cache: Use cached results when available
+        max_points: Downsample numeric items to at most this many points each
+        downsample: Downsampling method
+        
+    Returns:
+        List[Dict[str, Any]]: History rows of all items, sorted by clock
+    """
+    requests = []
+    for value_type, ids in types.items():
+        params = {"itemids": ids, "history": value_type,
+                  "sortfield": sortfield, "sortorder": sortorder}
+        if time_from:
+            params["time_from"] = time_from
+        if time_till:
+            params["time_till"] = time_till
+        if limit:
+            params["limit"] = limit
+        requests.append(fetch_history(params, cache))
+    results = await asyncio.gather(*requests)
+    
+    rows: List[Dict[str, Any]] = []
+    for value_type, result in zip(types, results):
+        if max_points and value_type in (0, 3):
+            result = downsample_history(result, max_points, downsample)
+        rows.extend(result)
+    rows.sort(key=lambda row: int(row["clock"]), reverse=sortorder.upper() == "DESC")
+    return rows[:limit] if limit else rows
+
+
 @mcp.tool()
-def history_get(itemids: List[str], history: int = 0,
-                time_from: Optional[int] = None,
-                time_till: Optional[int] = None,
-                limit: Optional[int] = None,
-                sortfield: str = "clock",
-                sortorder: str = "DESC") -> str:
+async def history_get(itemids: List[str], history: Union[int, str] = 0,
+                      time_from: Optional[int] = None,
+                      time_till: Optional[int] = None,
+                      limit: Optional[int] = None,
+                      sortfield: str = "clock",
+                      sortorder: str = "DESC",
+                      cache: bool = True,
+                      stream: bool = False,
+                      max_points: Optional[int] = None,
+                      downsample: str = "lttb",
+                      source: str = "history",
+                      columnar: bool = False,
+                      ctx: Optional[Context] = None) -> str:
     """Get history data from Zabbix.
     
     Args:
-        itemids: List of item IDs to get history for
-        history: History type (0=float, 1=character, 2=log, 3=unsigned, 4=text)
+        itemids: List of item IDs or "host:key" references to get history for
+        history: History type (0=float, 1=character, 2=log, 3=unsigned, 4=text),
+            or "auto" to read each item's history by its own value type
         time_from: Start time (Unix timestamp)
         time_till: End time (Unix timestamp)
         limit: Maximum number of results
         sortfield: Field to sort by
         sortorder: Sort order (ASC or DESC)
+        cache: Use a cached result when available (False always queries Zabbix)
+        stream: Fetch the range in concurrent time windows, ordered by clock
+            and de-duplicated. If the client sent a progress token, the rows
+            are sent window by window as progress notifications and the
+            result only summarizes the stream; otherwise they are returned.
+            Requires time_from; not used with max_points.
+        max_points: Downsample numeric history to at most this many points per item
+        downsample: Downsampling method: lttb (keeps a shape-preserving subset of
+            the samples) or minmax (min/avg/max per equal time interval)
+        source: history, or auto to read hourly trends for the completed hours
+            of the range (with history for the recent tail) when each point of
+            max_points spans an hour or more, or, without max_points, when the
+            range is longer than two days. Requires time_from.
+        columnar: Return per-item arrays of clock, ns and value, with the values
+            of float and unsigned items as numbers, instead of one object per value
+        ctx: MCP request context, supplied by FastMCP
         
     Returns:
-        str: JSON formatted history data
+        str: JSON formatted history data; with source=auto, an object with the
+            rows under "result" and the source used under "source"
     """
-    client = get_zabbix_client()
+    itemids = await resolve_ids("item", itemids)
+    
+    def encode(rows: List[Dict[str, Any]], value_types: Optional[Dict[str, int]] = None) -> Any:
+        if not columnar:
+            return rows
+        return to_columns(rows, value_types or dict.fromkeys(itemids, int(history)))
+    
+    if source not in ("history", "auto"):
+        raise ValueError("source must be history or auto")
+    
+    if history == "auto":
+        types = await item_value_types(itemids)
+        if len(types) > 1:
+            if stream or source == "auto":
+                raise ValueError("stream and source=auto need items of a single value type")
+            rows = await fetch_mixed_history(types, time_from, time_till, limit, sortfield,
+                                             sortorder, cache, max_points, downsample)
+            return format_response(encode(rows, {itemid: value_type for value_type, ids in types.items()
+                                                 for itemid in ids}))
+        history, itemids = next(iter(types.items()), (0, itemids))
+    history = int(history)
+    
     params = {
         "itemids": itemids,
         "history": history,
@@ -870,27 +1711,134 @@ def history_get(itemids: List[str], history: int = 0,
     if limit:
         params["limit"] = limit
     
-    result = client.history.get(**params)
-    return format_response(result)
+    if source == "auto":
+        if not time_from:
+            raise ValueError("time_from is required when source is auto")
+        routed = await fetch_routed(call_api, itemids, time_from, time_till or int(time.time()),
+                                    max_points, history, cache)
+        rows = routed["result"]
+        if max_points:
+            rows = downsample_history(rows, max_points, downsample)
+        rows = sorted(rows, key=lambda row: int(row["clock"]), reverse=sortorder.upper() == "DESC")
+        routed["result"] = encode(rows[:limit] if limit else rows)
+        return format_response(routed)
+    
+    if stream:
+        if not time_from:
+            raise ValueError("time_from is required when streaming history")
+        time_till = time_till or int(time.time())
+        descending = sortorder.upper() == "DESC"
+        windows = split_windows(time_from, time_till, descending=descending)
+        base_params = {key: value for key, value in params.items()
+                       if key not in ("time_from", "time_till", "limit")}
+        if max_points or progress_token(ctx) is None:
+            result = await collect_history(call_api, base_params, windows, limit,
+                                           descending, cache)
+            if max_points:
+                result = downsample_history(result, max_points, downsample)
+                result.sort(key=lambda row: int(row["clock"]), reverse=descending)
+            return format_response(encode(result))
+        
+        sent = 0
+        rows = 0
+        async with aclosing(stream_history(call_api, base_params, windows,
+                                           descending=descending, cache=cache)) as chunks:
+            async for chunk in chunks:
+                if limit:
+                    chunk = chunk[:limit - rows]
+                sent += 1
+                rows += len(chunk)
+                await ctx.report_progress(sent, len(windows), format_response(encode(chunk)))
+                if limit and rows >= limit:
+                    break
+        return format_response({
+            "streamed": True,
+            "time_from": time_from,
+            "time_till": time_till,
+            "windows": sent,
+            "rows": rows,
+        })
+    
+    result = await fetch_history(params, cache)
+    if max_points:
+        result = downsample_history(result, max_points, downsample)
+        result.sort(key=lambda row: int(row["clock"]), reverse=sortorder.upper() == "DESC")
+    return format_response(encode(result))
+
+
+@mcp.tool()
+async def history_aggregate(itemids: List[str], time_from: int,
+                            time_till: Optional[int] = None,
+                            aggregates: Optional[List[str]] = None,
+                            history: int = 0,
+                            cache: bool = True) -> str:
+    """Compute statistics of numeric history per item.
+    
+    History is fetched in time windows and aggregated as it arrives, so only
+    the running statistics (and, for percentiles, the values themselves) are
+    kept in memory.
+    
+    Args:
+        itemids: List of item IDs or "host:key" references to aggregate
+        time_from: Start time (Unix timestamp)
+        time_till: End time (Unix timestamp), defaults to now
+        aggregates: Statistics to compute: count, min, max, avg, sum, stddev,
+            rate (average change per second), first, last, and percentiles such
+            as p50 or p95 (default: count, min, avg, max)
+        history: History type (0=float, 3=unsigned)
+        cache: Use cached results when available (False always queries Zabbix)
+        
+    Returns:
+        str: JSON formatted list with one row of aggregates per item
+    """
+    itemids = await resolve_ids("item", itemids)
+    
+    if history not in (0, 3):
+        raise ValueError("history_aggregate only applies to numeric history (0 or 3)")
+    
+    aggregator = HistoryAggregator(parse_aggregates(aggregates))
+    params = {
+        "itemids": itemids,
+        "history": history,
+        "sortfield": "clock",
+        "sortorder": "ASC"
+    }
+    windows = split_windows(time_from, time_till or int(time.time()))
+    
+    async with aclosing(stream_history(call_api, params, windows, cache=cache)) as chunks:
+        async for chunk in chunks:
+            aggregator.add(chunk)
+    return format_response(aggregator.result(itemids))
 
 
 # TREND MANAGEMENT
 @mcp.tool()
-def trend_get(itemids: List[str], time_from: Optional[int] = None,
-              time_till: Optional[int] = None,
-              limit: Optional[int] = None) -> str:
+async def trend_get(itemids: List[str], time_from: Optional[int] = None,
+                    time_till: Optional[int] = None,
+                    limit: Optional[int] = None,
+                    cache: bool = True,
+                    max_points: Optional[int] = None,
+                    downsample: str = "lttb",
+                    columnar: bool = False) -> str:
     """Get trend data from Zabbix.
     
     Args:
-        itemids: List of item IDs to get trends for
+        itemids: List of item IDs or "host:key" references to get trends for
         time_from: Start time (Unix timestamp)
         time_till: End time (Unix timestamp)
         limit: Maximum number of results
+        cache: Use a cached result when available (False always queries Zabbix)
+        max_points: Downsample to at most this many points per item
+        downsample: Downsampling method: lttb (keeps a shape-preserving subset of
+            the hours) or minmax (merges hours, keeping min, weighted avg and max)
+        columnar: Return per-item arrays of clock, num, min, avg and max, with
+            numbers as numbers, instead of one object per hour
         
     Returns:
         str: JSON formatted trend data
     """
-    client = get_zabbix_client()
+    itemids = await resolve_ids("item", itemids)
+    
     params = {"itemids": itemids}
     
     if time_from:
@@ -900,29 +1848,316 @@ def trend_get(itemids: List[str], time_from: Optional[int] = None,
     if limit:
         params["limit"] = limit
     
-    result = client.trend.get(**params)
+    result = await call_api("trend.get", params, cache=cache)
+    if max_points:
+        result = downsample_trends(result, max_points, downsample)
+    if columnar:
+        result = to_columns(result)
     return format_response(result)
 
 
+# ANALYSIS
+@mcp.tool()
+async def anomaly_scan(hostids: Optional[List[str]] = None,
+                       groupids: Optional[List[str]] = None,
+                       key: Optional[str] = None,
+                       itemids: Optional[List[str]] = None,
+                       recent: int = 3600,
+                       baseline: int = 86400,
+                       method: str = "zscore",
+                       limit: int = 10,
+                       min_score: float = 0.0,
+                       time_till: Optional[int] = None,
+                       cache: bool = True) -> str:
+    """Find the numeric items whose recent values deviate most from their baseline.
+    
+    The baseline is read from hourly trends and the recent window from
+    history, for all selected items in bulk; every item is scored at once and
+    only the top offenders are returned. Since the baseline spread is that of
+    hourly averages, a recent window of about an hour compares like with like.
+    
+    Args:
+        hostids: Scan items of these hosts (IDs or names)
+        groupids: Scan items of hosts in these host groups (IDs or names)
+        key: Item key pattern, "*" matching any text (e.g. "net.if.in[*]")
+        itemids: Scan these items (IDs or "host:key" references)
+        recent: Length of the recent window in seconds
+        baseline: Length of the baseline window before it, in seconds
+        method: zscore (recent mean vs. baseline mean and standard deviation)
+            or mad (recent median vs. baseline median and median absolute
+            deviation, robust to spikes in the baseline)
+        limit: Maximum number of items to return
+        min_score: Only return items whose absolute score is at least this
+        time_till: End of the recent window (Unix timestamp), defaults to now
+        cache: Use cached results when available (False always queries Zabbix)
+        
+    Returns:
+        str: JSON formatted scan summary with the top items under "result",
+            largest absolute score first; the score is null when a flat
+            baseline has changed at all
+    """
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    itemids = await resolve_ids("item", itemids)
+    
+    if not (hostids or groupids or key or itemids):
+        raise ValueError("Select items to scan with hostids, groupids, key or itemids")
+    if method not in SCAN_METHODS:
+        raise ValueError(f"method must be one of {', '.join(SCAN_METHODS)}")
+    
+    params: Dict[str, Any] = {
+        "output": ["itemid", "hostid", "name", "key_", "value_type", "units"],
+        "selectHosts": ["name"],
+        "filter": {"value_type": [0, 3]},
+        "monitored": True
+    }
+    if hostids:
+        params["hostids"] = hostids
+    if groupids:
+        params["groupids"] = groupids
+    if itemids:
+        params["itemids"] = itemids
+    if key:
+        params["search"] = {"key_": key}
+        params["searchWildcardsEnabled"] = True
+    items = await call_api("item.get", params, cache=cache)
+    
+    time_till = time_till or int(time.time())
+    recent_from = time_till - recent + 1
+    baseline_from = recent_from - baseline
+    (base_series, base_values), (recent_series, recent_values) = await asyncio.gather(
+        fetch_series(call_api, items, "trend.get",
+                     {"time_from": baseline_from, "time_till": recent_from - 1},
+                     "value_avg", cache),
+        fetch_series(call_api, items, "history.get",
+                     {"time_from": recent_from, "time_till": time_till},
+                     "value", cache))
+    
+    scores = score_series(base_series, base_values, recent_series, recent_values,
+                          len(items), method)
+    result = []
+    for position in top_offenders(scores["score"], limit, min_score):
+        item = items[position]
+        hosts = item.get("hosts") or [{}]
+        result.append({
+            "itemid": item["itemid"],
+            "hostid": item["hostid"],
+            "host": hosts[0].get("name"),
+            "name": item["name"],
+            "key_": item["key_"],
+            "units": item.get("units", ""),
+            "score": rounded(scores["score"][position], 3),
+            "recent": rounded(scores["recent"][position], 4),
+            "baseline": rounded(scores["baseline"][position], 4),
+            "spread": rounded(scores["spread"][position], 4),
+        })
+    
+    return format_response({
+        "method": method,
+        "items": len(items),
+        "scored": int(np.count_nonzero(~np.isnan(scores["score"]))),
+        "baseline": {"time_from": baseline_from, "time_till": recent_from - 1},
+        "recent": {"time_from": recent_from, "time_till": time_till},
+        "result": result,
+    })
+
+
+@mcp.tool()
+async def top_items(key: str,
+                    hostids: Optional[List[str]] = None,
+                    groupids: Optional[List[str]] = None,
+                    limit: int = 10,
+                    order: str = "desc",
+                    cache: bool = True) -> str:
+    """Rank numeric items by their last value, e.g. the 10 hosts with the highest CPU load.
+    
+    Only the item ID, host ID, last value and time of the matching items are
+    fetched; they are ranked in the server and host names are looked up for
+    the returned rows only.
+    
+    Args:
+        key: Item key pattern, "*" matching any text (e.g. "system.cpu.load[*avg1]")
+        hostids: Rank items of these hosts (IDs or names)
+        groupids: Rank items of hosts in these host groups (IDs or names)
+        limit: Number of rows to return
+        order: desc for the highest values first, asc for the lowest
+        cache: Use cached results when available (False always queries Zabbix)
+        
+    Returns:
+        str: JSON formatted list of up to limit rows with host, item and value
+    """
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    
+    if order not in ("desc", "asc"):
+        raise ValueError("order must be desc or asc")
+    
+    params: Dict[str, Any] = {
+        "output": ["itemid", "hostid", "lastvalue", "lastclock"],
+        "search": {"key_": key},
+        "searchWildcardsEnabled": True,
+        "filter": {"value_type": [0, 3]},
+        "monitored": True
+    }
+    if hostids:
+        params["hostids"] = hostids
+    if groupids:
+        params["groupids"] = groupids
+    items = await call_api("item.get", params, cache=cache)
+    
+    ranked = []
+    for item in items:
+        if item.get("lastclock", "0") == "0":
+            continue  # no value received yet
+        try:
+            ranked.append((float(item["lastvalue"]), item))
+        except (TypeError, ValueError):
+            continue
+    pick = heapq.nlargest if order == "desc" else heapq.nsmallest
+    top = pick(limit, ranked, key=lambda entry: entry[0])
+    
+    hostids = list(dict.fromkeys(item["hostid"] for _, item in top))
+    hosts = await call_api("host.get", {"hostids": hostids, "output": ["hostid", "name"]},
+                           cache=cache) if hostids else []
+    names = {host["hostid"]: host["name"] for host in hosts}
+    
+    return format_response([{
+        "hostid": item["hostid"],
+        "host": names.get(item["hostid"]),
+        "itemid": item["itemid"],
+        "lastvalue": value,
+        "lastclock": int(item["lastclock"]),
+    } for value, item in top])
+
+
+@mcp.tool()
+async def correlate_items(itemid: str, time_from: int,
+                          time_till: Optional[int] = None,
+                          itemids: Optional[List[str]] = None,
+                          hostids: Optional[List[str]] = None,
+                          groupids: Optional[List[str]] = None,
+                          key: Optional[str] = None,
+                          step: Optional[int] = None,
+                          max_lag: int = 0,
+                          limit: int = 10,
+                          cache: bool = True) -> str:
+    """Find the numeric items whose values moved together with a reference item.
+    
+    The reference and candidate series are averaged into a common time grid
+    and correlated in the server; only the ranked coefficients are returned,
+    not the series.
+    
+    Args:
+        itemid: Reference item ID or "host:key" reference
+        time_from: Start time (Unix timestamp)
+        time_till: End time (Unix timestamp), defaults to now
+        itemids: Candidate item IDs or "host:key" references
+        hostids: Use numeric items of these hosts (IDs or names) as candidates
+        groupids: Use numeric items of hosts in these host groups (IDs or names)
+            as candidates
+        key: Candidate item key pattern, "*" matching any text
+        step: Grid interval in seconds (default: the range in up to 1000
+            intervals of at least a minute); intervals of an hour or more
+            are read from trends
+        max_lag: Also try shifting candidates by up to this many seconds in
+            either direction and keep the strongest correlation
+        limit: Maximum number of candidates to return
+        cache: Use cached results when available (False always queries Zabbix)
+        
+    Returns:
+        str: JSON formatted summary with candidates under "result", ordered by
+            absolute Pearson correlation. A positive lag means the candidate
+            moved that many seconds after the reference.
+    """
+    itemid = (await resolve_ids("item", [itemid]))[0]
+    itemids = await resolve_ids("item", itemids)
+    hostids = await resolve_ids("host", hostids)
+    groupids = await resolve_ids("group", groupids)
+    
+    if not (itemids or hostids or groupids or key):
+        raise ValueError("Select candidate items with itemids, hostids, groupids or key")
+    
+    output = ["itemid", "hostid", "name", "key_", "value_type", "units"]
+    params: Dict[str, Any] = {
+        "output": output,
+        "selectHosts": ["name"],
+        "filter": {"value_type": [0, 3]}
+    }
+    if itemids:
+        params["itemids"] = itemids
+    if hostids:
+        params["hostids"] = hostids
+    if groupids:
+        params["groupids"] = groupids
+    if key:
+        params["search"] = {"key_": key}
+        params["searchWildcardsEnabled"] = True
+    reference, candidates = await asyncio.gather(
+        call_api("item.get", {"itemids": [itemid], "output": output,
+                              "selectHosts": ["name"]}, cache=cache),
+        call_api("item.get", params, cache=cache))
+    if not reference or int(reference[0]["value_type"]) not in (0, 3):
+        raise ValueError(f"Item {itemid} not found or not numeric")
+    candidates = [item for item in candidates if item["itemid"] != itemid]
+    
+    time_till = time_till or int(time.time())
+    step, bins = grid_step(time_from, time_till, step)
+    grid = await fetch_grid(call_api, reference + candidates, time_from,
+                            time_till, step, bins, cache)
+    best = lagged_correlations(grid[0], grid[1:], max_lag // step)
+    
+    order = np.argsort(-np.nan_to_num(np.abs(best["correlation"]), nan=-1.0), kind="stable")
+    result = []
+    for position in order[:limit]:
+        if np.isnan(best["correlation"][position]):
+            break
+        item = candidates[position]
+        hosts = item.get("hosts") or [{}]
+        result.append({
+            "itemid": item["itemid"],
+            "hostid": item["hostid"],
+            "host": hosts[0].get("name"),
+            "name": item["name"],
+            "key_": item["key_"],
+            "correlation": rounded(best["correlation"][position], 4),
+            "lag": int(best["lag"][position]) * step,
+            "overlap": int(best["overlap"][position]),
+        })
+    
+    return format_response({
+        "itemid": itemid,
+        "name": reference[0]["name"],
+        "candidates": len(candidates),
+        "time_from": time_from,
+        "time_till": time_till,
+        "step": step,
+        "result": result,
+    })
+
+
 # USER MANAGEMENT
 @mcp.tool()
-def user_get(userids: Optional[List[str]] = None,
-             output: str = "extend",
-             search: Optional[Dict[str, str]] = None,
-             filter: Optional[Dict[str, Any]] = None) -> str:
+async def user_get(userids: Optional[List[str]] = None,
+                   output: Optional[str] = None,
+                   search: Optional[Dict[str, str]] = None,
+                   filter: Optional[Dict[str, Any]] = None,
+                   cache: bool = True,
+                   fields: Optional[List[str]] = None) -> str:
     """Get users from Zabbix with optional filtering.
     
     Args:
         userids: List of user IDs to retrieve
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to all fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of users
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("user.get", output, fields)}
     
     if userids:
         params["userids"] = userids
@@ -931,14 +2166,14 @@ def user_get(userids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.user.get(**params)
+    result = await call_api("user.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def user_create(username: str, passwd: str, usrgrps: List[Dict[str, str]],
-                name: Optional[str] = None, surname: Optional[str] = None,
-                email: Optional[str] = None) -> str:
+async def user_create(username: str, passwd: str, usrgrps: List[Dict[str, str]],
+                      name: Optional[str] = None, surname: Optional[str] = None,
+                      email: Optional[str] = None) -> str:
     """Create a new user in Zabbix.
     
     Args:
@@ -954,7 +2189,6 @@ def user_create(username: str, passwd: str, usrgrps: List[Dict[str, str]],
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "username": username,
         "passwd": passwd,
@@ -968,14 +2202,14 @@ def user_create(username: str, passwd: str, usrgrps: List[Dict[str, str]],
     if email:
         params["email"] = email
     
-    result = client.user.create(**params)
+    result = await call_api("user.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def user_update(userid: str, username: Optional[str] = None,
-                name: Optional[str] = None, surname: Optional[str] = None,
-                email: Optional[str] = None) -> str:
+async def user_update(userid: str, username: Optional[str] = None,
+                      name: Optional[str] = None, surname: Optional[str] = None,
+                      email: Optional[str] = None) -> str:
     """Update an existing user in Zabbix.
     
     Args:
@@ -990,7 +2224,6 @@ def user_update(userid: str, username: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"userid": userid}
     
     if username:
@@ -1002,12 +2235,12 @@ def user_update(userid: str, username: Optional[str] = None,
     if email:
         params["email"] = email
     
-    result = client.user.update(**params)
+    result = await call_api("user.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def user_delete(userids: List[str]) -> str:
+async def user_delete(userids: List[str]) -> str:
     """Delete users from Zabbix.
     
     Args:
@@ -1018,30 +2251,33 @@ def user_delete(userids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.user.delete(*userids)
+    result = await call_api("user.delete", userids)
     return format_response(result)
 
 
 # MAINTENANCE MANAGEMENT
 @mcp.tool()
-def maintenance_get(maintenanceids: Optional[List[str]] = None,
-                    groupids: Optional[List[str]] = None,
-                    hostids: Optional[List[str]] = None,
-                    output: str = "extend") -> str:
+async def maintenance_get(maintenanceids: Optional[List[str]] = None,
+                          groupids: Optional[List[str]] = None,
+                          hostids: Optional[List[str]] = None,
+                          output: Optional[str] = None,
+                          cache: bool = True,
+                          fields: Optional[List[str]] = None) -> str:
     """Get maintenance periods from Zabbix.
     
     Args:
         maintenanceids: List of maintenance IDs to retrieve
         groupids: List of host group IDs to filter by
         hostids: List of host IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of maintenance periods
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("maintenance.get", output, fields)}
     
     if maintenanceids:
         params["maintenanceids"] = maintenanceids
@@ -1050,16 +2286,16 @@ def maintenance_get(maintenanceids: Optional[List[str]] = None,
     if hostids:
         params["hostids"] = hostids
     
-    result = client.maintenance.get(**params)
+    result = await call_api("maintenance.get", params, cache=cache)
     return format_response(result)
 
 
 @mcp.tool()
-def maintenance_create(name: str, active_since: int, active_till: int,
-                       groupids: Optional[List[str]] = None,
-                       hostids: Optional[List[str]] = None,
-                       timeperiods: Optional[List[Dict[str, Any]]] = None,
-                       description: Optional[str] = None) -> str:
+async def maintenance_create(name: str, active_since: int, active_till: int,
+                             groupids: Optional[List[str]] = None,
+                             hostids: Optional[List[str]] = None,
+                             timeperiods: Optional[List[Dict[str, Any]]] = None,
+                             description: Optional[str] = None) -> str:
     """Create a new maintenance period in Zabbix.
     
     Args:
@@ -1076,7 +2312,6 @@ def maintenance_create(name: str, active_since: int, active_till: int,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "name": name,
         "active_since": active_since,
@@ -1092,14 +2327,14 @@ def maintenance_create(name: str, active_since: int, active_till: int,
     if description:
         params["description"] = description
     
-    result = client.maintenance.create(**params)
+    result = await call_api("maintenance.create", params)
     return format_response(result)
 
 
 @mcp.tool()
-def maintenance_update(maintenanceid: str, name: Optional[str] = None,
-                       active_since: Optional[int] = None, active_till: Optional[int] = None,
-                       description: Optional[str] = None) -> str:
+async def maintenance_update(maintenanceid: str, name: Optional[str] = None,
+                             active_since: Optional[int] = None, active_till: Optional[int] = None,
+                             description: Optional[str] = None) -> str:
     """Update an existing maintenance period in Zabbix.
     
     Args:
@@ -1114,7 +2349,6 @@ def maintenance_update(maintenanceid: str, name: Optional[str] = None,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {"maintenanceid": maintenanceid}
     
     if name:
@@ -1126,12 +2360,12 @@ def maintenance_update(maintenanceid: str, name: Optional[str] = None,
     if description:
         params["description"] = description
     
-    result = client.maintenance.update(**params)
+    result = await call_api("maintenance.update", params)
     return format_response(result)
 
 
 @mcp.tool()
-def maintenance_delete(maintenanceids: List[str]) -> str:
+async def maintenance_delete(maintenanceids: List[str]) -> str:
     """Delete maintenance periods from Zabbix.
     
     Args:
@@ -1142,34 +2376,37 @@ def maintenance_delete(maintenanceids: List[str]) -> str:
     """
     validate_read_only()
     
-    client = get_zabbix_client()
-    result = client.maintenance.delete(*maintenanceids)
+    result = await call_api("maintenance.delete", maintenanceids)
     return format_response(result)
 
 
 # GRAPH MANAGEMENT
 @mcp.tool()
-def graph_get(graphids: Optional[List[str]] = None,
-              hostids: Optional[List[str]] = None,
-              templateids: Optional[List[str]] = None,
-              output: str = "extend",
-              search: Optional[Dict[str, str]] = None,
-              filter: Optional[Dict[str, Any]] = None) -> str:
+async def graph_get(graphids: Optional[List[str]] = None,
+                    hostids: Optional[List[str]] = None,
+                    templateids: Optional[List[str]] = None,
+                    output: Optional[str] = None,
+                    search: Optional[Dict[str, str]] = None,
+                    filter: Optional[Dict[str, Any]] = None,
+                    cache: bool = True,
+                    fields: Optional[List[str]] = None) -> str:
     """Get graphs from Zabbix with optional filtering.
     
     Args:
         graphids: List of graph IDs to retrieve
         hostids: List of host IDs to filter by
         templateids: List of template IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of graphs
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("graph.get", output, fields)}
     
     if graphids:
         params["graphids"] = graphids
@@ -1182,33 +2419,37 @@ def graph_get(graphids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.graph.get(**params)
+    result = await call_api("graph.get", params, cache=cache)
     return format_response(result)
 
 
 # DISCOVERY RULE MANAGEMENT
 @mcp.tool()
-def discoveryrule_get(itemids: Optional[List[str]] = None,
-                      hostids: Optional[List[str]] = None,
-                      templateids: Optional[List[str]] = None,
-                      output: str = "extend",
-                      search: Optional[Dict[str, str]] = None,
-                      filter: Optional[Dict[str, Any]] = None) -> str:
+async def discoveryrule_get(itemids: Optional[List[str]] = None,
+                            hostids: Optional[List[str]] = None,
+                            templateids: Optional[List[str]] = None,
+                            output: Optional[str] = None,
+                            search: Optional[Dict[str, str]] = None,
+                            filter: Optional[Dict[str, Any]] = None,
+                            cache: bool = True,
+                            fields: Optional[List[str]] = None) -> str:
     """Get discovery rules from Zabbix with optional filtering.
     
     Args:
         itemids: List of discovery rule IDs to retrieve
         hostids: List of host IDs to filter by
         templateids: List of template IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of discovery rules
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("discoveryrule.get", output, fields)}
     
     if itemids:
         params["itemids"] = itemids
@@ -1221,33 +2462,37 @@ def discoveryrule_get(itemids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.discoveryrule.get(**params)
+    result = await call_api("discoveryrule.get", params, cache=cache)
     return format_response(result)
 
 
 # ITEM PROTOTYPE MANAGEMENT
 @mcp.tool()
-def itemprototype_get(itemids: Optional[List[str]] = None,
-                      discoveryids: Optional[List[str]] = None,
-                      hostids: Optional[List[str]] = None,
-                      output: str = "extend",
-                      search: Optional[Dict[str, str]] = None,
-                      filter: Optional[Dict[str, Any]] = None) -> str:
+async def itemprototype_get(itemids: Optional[List[str]] = None,
+                            discoveryids: Optional[List[str]] = None,
+                            hostids: Optional[List[str]] = None,
+                            output: Optional[str] = None,
+                            search: Optional[Dict[str, str]] = None,
+                            filter: Optional[Dict[str, Any]] = None,
+                            cache: bool = True,
+                            fields: Optional[List[str]] = None) -> str:
     """Get item prototypes from Zabbix with optional filtering.
     
     Args:
         itemids: List of item prototype IDs to retrieve
         discoveryids: List of discovery rule IDs to filter by
         hostids: List of host IDs to filter by
-        output: Output format
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to a curated set of fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of item prototypes
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("itemprototype.get", output, fields)}
     
     if itemids:
         params["itemids"] = itemids
@@ -1260,14 +2505,14 @@ def itemprototype_get(itemids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.itemprototype.get(**params)
+    result = await call_api("itemprototype.get", params, cache=cache)
     return format_response(result)
 
 
 # CONFIGURATION EXPORT/IMPORT
 @mcp.tool()
-def configuration_export(format: str = "json",
-                         options: Optional[Dict[str, Any]] = None) -> str:
+async def configuration_export(format: str = "json",
+                               options: Optional[Dict[str, Any]] = None) -> str:
     """Export configuration from Zabbix.
     
     Args:
@@ -1277,19 +2522,18 @@ def configuration_export(format: str = "json",
     Returns:
         str: JSON formatted export result
     """
-    client = get_zabbix_client()
     params = {"format": format}
     
     if options:
         params["options"] = options
     
-    result = client.configuration.export(**params)
+    result = await call_api("configuration.export", params)
     return format_response(result)
 
 
 @mcp.tool()
-def configuration_import(format: str, source: str,
-                         rules: Dict[str, Any]) -> str:
+async def configuration_import(format: str, source: str,
+                               rules: Dict[str, Any]) -> str:
     """Import configuration to Zabbix.
     
     Args:
@@ -1302,38 +2546,41 @@ def configuration_import(format: str, source: str,
     """
     validate_read_only()
     
-    client = get_zabbix_client()
     params = {
         "format": format,
         "source": source,
         "rules": rules
     }
     
-    result = client.configuration.import_(**params)
+    result = await call_api("configuration.import", params)
     return format_response(result)
 
 
 # MACRO MANAGEMENT
 @mcp.tool()
-def usermacro_get(globalmacroids: Optional[List[str]] = None,
-                  hostids: Optional[List[str]] = None,
-                  output: str = "extend",
-                  search: Optional[Dict[str, str]] = None,
-                  filter: Optional[Dict[str, Any]] = None) -> str:
+async def usermacro_get(globalmacroids: Optional[List[str]] = None,
+                        hostids: Optional[List[str]] = None,
+                        output: Optional[str] = None,
+                        search: Optional[Dict[str, str]] = None,
+                        filter: Optional[Dict[str, Any]] = None,
+                        cache: bool = True,
+                        fields: Optional[List[str]] = None) -> str:
     """Get global macros from Zabbix with optional filtering.
     
     Args:
         globalmacroids: List of global macro IDs to retrieve
         hostids: List of host IDs to filter by (for host macros)
-        output: Output format (extend, shorten, or specific fields)
+        output: Output format (extend for all fields, shorten, or comma-separated
+            fields); defaults to all fields
         search: Search criteria
         filter: Filter criteria
+        cache: Use a cached result when available (False always queries Zabbix)
+        fields: Fields to return instead of the defaults; ["full"] returns all fields
         
     Returns:
         str: JSON formatted list of global macros
     """
-    client = get_zabbix_client()
-    params = {"output": output}
+    params = {"output": resolve_output("usermacro.get", output, fields)}
     
     if globalmacroids:
         params["globalmacroids"] = globalmacroids
@@ -1344,23 +2591,60 @@ def usermacro_get(globalmacroids: Optional[List[str]] = None,
     if filter:
         params["filter"] = filter
     
-    result = client.usermacro.get(**params)
+    result = await call_api("usermacro.get", params, cache=cache)
     return format_response(result)
 
 
 # SYSTEM INFO
 @mcp.tool()
-def apiinfo_version() -> str:
+async def apiinfo_version() -> str:
     """Get Zabbix API version information.
     
     Returns:
         str: JSON formatted API version info
     """
-    client = get_zabbix_client()
-    result = client.apiinfo.version()
+    result = await call_api("apiinfo.version")
     return format_response(result)
 
 
+@mcp.tool()
+async def server_stats() -> str:
+    """Get performance statistics of this MCP server.
+    
+    Returns:
+        str: JSON formatted statistics: connection pool utilization and
+            wait times, response cache usage and hit/miss counters, and
+            per-method counts of coalesced calls, local history store usage,
+            problem feed counters, trigger index usage, entity index size
+            and refresh cost, and problem stream listeners and deliveries
+    """
+    return format_response({
+        "connection_pool": pool_stats.snapshot(),
+        "cache": response_cache.snapshot(),
+        "coalescing": request_coalescer.snapshot(),
+        "series_store": series_store.snapshot(),
+        "problem_feed": problem_feed.snapshot(),
+        "trigger_index": trigger_index.snapshot(),
+        "entity_index": entity_index.snapshot(),
+        "problem_stream": problem_stream.snapshot()
+    })
+
+
+async def check_connection() -> str:
+    """Check that Zabbix is reachable and return its API version.
+    
+    The client is closed afterwards because it is bound to the event loop of
+    the check; the server creates its own client on the first tool call.
+    
+    Returns:
+        str: Zabbix API version
+    """
+    try:
+        return await call_api("apiinfo.version", cache=False)
+    finally:
+        await close_zabbix_client()
+
+
 def main():
     """Main entry point for uv execution."""
     logger.info("Starting Zabbix MCP Server")
@@ -1372,8 +2656,7 @@ def main():
     # Test connection before starting server
     try:
         logger.info("Testing Zabbix connection...")
-        client = get_zabbix_client()
-        version = client.apiinfo.version()
+        version = asyncio.run(check_connection())
         logger.info(f"Successfully connected to Zabbix API version: {version}")
     except Exception as e:
         logger.error(f"Failed to connect to Zabbix: {e}")